@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""
+题库文本（resources/*.txt）的解析与生成工具
+
+各脚本共用这里的记录类型和解析器，不再各自维护一套正则。
+"""
+
+from banktools.records import CoreWord, ParseIssue, Question
+from banktools.parser import iter_banks, iter_inline, iter_numbered, parse_bank
+from banktools.render import render_numbered
+
+__all__ = [
+    'CoreWord',
+    'ParseIssue',
+    'Question',
+    'iter_banks',
+    'iter_inline',
+    'iter_numbered',
+    'parse_bank',
+    'render_numbered',
+]
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+原始试卷与生成题库的按内容对齐
+
+按位置逐题比较时，题库中多一道或少一道题，后面的每一题都会报答案、对话不匹配。
+这里先按规范化后的题目内容（对话 + 选项，不含题号和答案）做哈希连接，O(n) 配上绝大多数题；
+剩下的先按对话再连接一次（只改了选项的题），最后才对对话也改了的少数题按先后顺序做 diff
+（difflib 的最长匹配），分出：
+- 内容相同的对应题（答案仍可能不同）
+- 有改动的对应题（对话或选项改了）
+- 题库中多出的题、题库中缺少的原题
+题目整体换了顺序也能配上，另外给出顺序与原始试卷不同的题。
+"""
+
+import difflib
+import hashlib
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, NamedTuple, Sequence, Set, Tuple
+
+from banktools.records import Question
+
+_BLANKS = re.compile(r'_{2,}')
+_QUOTES = (('‘', "'"), ('’', "'"), ('“', '"'), ('”', '"'))
+SIMILAR = 0.6  # 改动前后对话文本的最低相似度，低于此值视为删掉一题、另加一题
+WINDOW = 8     # 替换段中为一道题找改动前原题时最多比较的原题数
+
+
+class Alignment(NamedTuple):
+    pairs: List[Tuple[int, int]]   # (题库序号, 原题序号)：内容相同
+    edits: List[Tuple[int, int]]   # (题库序号, 原题序号)：对话或选项有改动
+    inserts: List[int]             # 题库中多出的题（题库序号）
+    deletes: List[int]             # 题库中缺少的原题（原题序号）
+    moved: List[int]               # 顺序与原始试卷不同的题（题库序号）
+
+    def matched(self) -> List[Tuple[int, int]]:
+        """全部对应题，按题库顺序"""
+        return sorted(self.pairs + self.edits)
+
+
+def normalize(text: str) -> str:
+    """比较用的文本：全角转半角、弯引号转直引号、空白（含换行）合并、填空线统一、小写"""
+    text = ' '.join(unicodedata.normalize('NFKC', text).split()).lower()
+    for curly, straight in _QUOTES:
+        text = text.replace(curly, straight)
+    return _BLANKS.sub('__', text) if '___' in text else text
+
+
+def keys(question: Question) -> Tuple[str, str]:
+    """(对话文本, 内容哈希)；内容为对话 + 选项，不含题号和答案（答案另行比较）"""
+    dialogue = normalize('\n'.join(question.dialogue))
+    options = normalize('\n'.join(f'{letter}) {text}' for letter, text in question.options))
+    return dialogue, hashlib.sha1(f'{dialogue}\0{options}'.encode('utf-8')).hexdigest()
+
+
+def _join(rest_q: List[int], q_keys: Sequence[str], rest_o: List[int], o_keys: Sequence[str],
+          pairs: List[Tuple[int, int]]) -> Tuple[List[int], List[int]]:
+    """按键值哈希连接，同样的键出现多次时按先后顺序配对；返回两边剩下的序号"""
+    buckets: Dict[str, Deque[int]] = defaultdict(deque)
+    for j in rest_o:
+        buckets[o_keys[j]].append(j)
+    left_q: List[int] = []
+    for i in rest_q:
+        bucket = buckets.get(q_keys[i])
+        if bucket:
+            pairs.append((i, bucket.popleft()))
+        else:
+            left_q.append(i)
+    used = {j for _, j in pairs}
+    return left_q, [j for j in rest_o if j not in used]
+
+
+def _similarity(a: str, b: str) -> float:
+    """对话文本的相似度；quick_ratio 已低于 SIMILAR 的直接记 0，不再算精确值"""
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    if matcher.quick_ratio() < SIMILAR:
+        return 0.0
+    return matcher.ratio()
+
+
+def _out_of_order(matched: Sequence[Tuple[int, int]]) -> List[int]:
+    """按题库顺序排好的对应题中，不在原题序号最长递增子序列上的那些（O(n log n)）"""
+    tails: List[int] = []       # tails[k]：长度为 k+1 的递增子序列的最小结尾
+    tail_at: List[int] = []     # 对应的 matched 下标
+    parent = [-1] * len(matched)
+    for pos, (_, original) in enumerate(matched):
+        k = bisect_left(tails, original)
+        if k == len(tails):
+            tails.append(original)
+            tail_at.append(pos)
+        else:
+            tails[k] = original
+            tail_at[k] = pos
+        parent[pos] = tail_at[k - 1] if k else -1
+    keep: Set[int] = set()
+    pos = tail_at[-1] if tail_at else -1
+    while pos >= 0:
+        keep.add(pos)
+        pos = parent[pos]
+    return [matched[pos][0] for pos in range(len(matched)) if pos not in keep]
+
+
+def align(questions: Sequence[Question], originals: Sequence[Question]) -> Alignment:
+    q_text, q_hash = zip(*map(keys, questions)) if questions else ((), ())
+    o_text, o_hash = zip(*map(keys, originals)) if originals else ((), ())
+
+    # 1. 按内容哈希连接，O(n) 配上绝大多数题，题目换了顺序也不影响
+    pairs: List[Tuple[int, int]] = []
+    rest_q, rest_o = _join(list(range(len(questions))), q_hash, list(range(len(originals))), o_hash, pairs)
+    # 2. 剩下的按对话再连接一次：对话相同、选项有改动
+    edits: List[Tuple[int, int]] = []
+    rest_q, rest_o = _join(rest_q, q_text, rest_o, o_text, edits)
+
+    # 3. 对话也改了的，按先后顺序做 diff：同一处被替换的，足够相似的算改动，其余是多出和缺少的题
+    inserts: List[int] = []
+    deletes: List[int] = []
+    a = [o_text[j] for j in rest_o]
+    b = [q_text[i] for i in rest_q]
+    for _, a0, a1, b0, b1 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        # 对话文本两两不同（相同的第 2 步已配上），diff 里不会有 equal 段
+        # 保持先后顺序，每道题只往后看 WINDOW 道原题，取其中最相似的（Part I 的短对话与无关的题也常有
+        # 0.6 以上的相似度，取第一个够格的会把改动配到被删掉的题上）；替换段再长也不会退化成两两比较
+        for k in range(b0, b1):
+            best, best_m = 0.0, -1
+            for m in range(a0, min(a1, a0 + WINDOW)):
+                score = _similarity(a[m], b[k])
+                if score >= SIMILAR and score > best:
+                    best, best_m = score, m
+            if best_m < 0:
+                inserts.append(rest_q[k])
+                continue
+            deletes.extend(rest_o[a0:best_m])
+            edits.append((rest_q[k], rest_o[best_m]))
+            a0 = best_m + 1
+        deletes.extend(rest_o[a0:a1])
+
+    moved = _out_of_order(sorted(pairs + edits))
+    return Alignment(pairs, sorted(edits), sorted(inserts), sorted(deletes), sorted(moved))
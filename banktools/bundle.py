@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+"""
+分片压缩的题库包（.ehxb）
+
+一个题库按题目顺序每 N 题切成一片，每片是与 App 端 Question 字段一致的 JSON 数组（见 store.question_payload），
+单独压缩。包头是一张很小的偏移表，读者只解压所需题目所在的那一片：
+
+    magic 'EHXB' | 版本 u8 | 压缩方式 u8 | 保留 u16 | 元数据长度 u32 | 字典长度 u32 | 分片数 u32
+    分片表：每片 (偏移 u64, 压缩后长度 u32, 原始长度 u32, 原始内容 sha1 20 字节)
+    元数据 JSON：题库名、源文件哈希、每片题数、试卷段落、每题的 (段落序号, 题号)
+    内嵌的预置字典（可为空）
+    各分片数据
+
+zlib 分片共用一份预置字典（zdict），从出现在多个分片中的片段挑出，
+短片单独压缩时也能引用题目之间重复的字段名、考点套话。一次打包的所有题库共用一份字典，
+按哈希存为 dictionary-<sha1>.zdict，包里只记哈希，读者按哈希找字典；只重新打包部分题库时，
+其他包用的旧字典仍在，不会被覆盖。标准库的 lzma 不支持预置字典，选 lzma 时各片独立压缩。
+"""
+
+import hashlib
+import json
+import lzma
+import os
+import re
+import struct
+import zlib
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from banktools.cache import file_hash
+from banktools.parser import parse_bank
+from banktools.records import ParseIssue, Question
+from banktools.store import bank_name, question_payload
+
+MAGIC = b'EHXB'
+VERSION = 1
+CODECS = {'none': 0, 'zlib': 1, 'lzma': 2}
+SUFFIX = '.ehxb'
+DICTIONARY = 'dictionary-{}.zdict'  # 按字典的 sha1 命名
+_DICT_NAME = re.compile(r'dictionary-([0-9a-f]{40})\.zdict')
+
+_HEADER = struct.Struct('<4sBBHIII')
+_ENTRY = struct.Struct('<QII20s')
+_DICT_MAX = 32 * 1024  # zlib 窗口大小，字典再长也用不上
+# 字典候选片段：JSON 字段名（连同其后的括号、引号），以及按中文标点切开的文字
+_PIECE = re.compile(r'"[A-Za-z]+":(?:\{|\[\{|")?|[^"{}\[\]\\，。；：→（）]{2,}[，。；：→（）]?|\\n')
+
+
+class ShardEntry(NamedTuple):
+    offset: int
+    length: int
+    raw_length: int
+    sha1: bytes
+
+
+class BundleInfo(NamedTuple):
+    path: str
+    questions: int
+    shards: int
+    header_size: int   # 固定头 + 分片表 + 元数据 + 内嵌字典
+    raw_size: int      # 各分片 JSON 的总长度
+    size: int          # 整个文件
+
+
+class BundleError(Exception):
+    pass
+
+
+class _Prepared(NamedTuple):
+    """一个题库切好的分片（尚未压缩）"""
+    name: str
+    source_hash: str
+    shard_size: int
+    sections: List[str]
+    numbers: List[List[int]]
+    raws: List[bytes]
+
+
+def _prepare(questions: Iterable[Question], shard_size: int, name: str = '', source_hash: str = '') -> _Prepared:
+    if shard_size < 1:
+        raise ValueError('每片题数至少为 1')
+    questions = list(questions)
+    sections: Dict[str, int] = {}
+    numbers = [[sections.setdefault(q.section, len(sections)), q.number] for q in questions]
+    raws = [
+        json.dumps([question_payload(q, k) for k, q in enumerate(questions[i:i + shard_size], i + 1)],
+                   ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        for i in range(0, len(questions), shard_size)
+    ]
+    return _Prepared(name, source_hash, shard_size, list(sections), numbers, raws)
+
+
+def build_dictionary(shards: Sequence[bytes], size: int = 16 * 1024) -> bytes:
+    """从分片里挑出在多个分片中都出现的片段（字段名、考点套话、重复的句子）拼成预置字典
+
+    每个片段按“(出现的分片数 - 1) × 长度”估计能省下的字节，分高的优先；
+    zlib 对字典末尾的内容引用距离最短，最有用的片段放在最后。
+    """
+    size = min(size, _DICT_MAX)
+    spread: Counter = Counter()
+    for shard in shards:
+        spread.update(set(_PIECE.findall(shard.decode('utf-8'))))
+    ranked = sorted((((count - 1) * len(piece.encode('utf-8')), piece)
+                     for piece, count in spread.items() if count > 1), reverse=True)
+    picked: List[bytes] = []
+    total = 0
+    for _, piece in ranked:
+        data = piece.encode('utf-8')
+        if total + len(data) > size:
+            continue
+        picked.append(data)
+        total += len(data)
+    return b''.join(reversed(picked))
+
+
+def choose_dictionary(shards: Sequence[bytes], size: int = 16 * 1024) -> bytes:
+    """在 size、size/2、size/4、size/8 和不用字典之间，取“压缩后总大小 + 字典大小”最小的"""
+    best, best_total = b'', sum(len(_compress(raw, 'zlib', b'')) for raw in shards)
+    for candidate in {build_dictionary(shards, size >> k) for k in range(4) if size >> k >= 256}:
+        total = len(candidate) + sum(len(_compress(raw, 'zlib', candidate)) for raw in shards)
+        if total < best_total:
+            best, best_total = candidate, total
+    return best
+
+
+def _compress(data: bytes, codec: str, zdict: bytes) -> bytes:
+    if codec == 'zlib':
+        if zdict:
+            packer = zlib.compressobj(9, zlib.DEFLATED, zlib.MAX_WBITS, 9, zlib.Z_DEFAULT_STRATEGY, zdict)
+        else:
+            packer = zlib.compressobj(9)
+        return packer.compress(data) + packer.flush()
+    if codec == 'lzma':
+        return lzma.compress(data, format=lzma.FORMAT_XZ, check=lzma.CHECK_NONE, preset=9 | lzma.PRESET_EXTREME)
+    return data
+
+
+def _decompress(data: bytes, codec: str, zdict: bytes) -> bytes:
+    if codec == 'zlib':
+        unpacker = zlib.decompressobj(zlib.MAX_WBITS, zdict) if zdict else zlib.decompressobj()
+        return unpacker.decompress(data) + unpacker.flush()
+    if codec == 'lzma':
+        return lzma.decompress(data, format=lzma.FORMAT_XZ)
+    return data
+
+
+def _write(prepared: _Prepared, out_path: str, codec: str, zdict: bytes, embed: bool) -> BundleInfo:
+    if codec not in CODECS:
+        raise ValueError(f'未知的压缩方式: {codec}')
+    zdict = zdict if codec == 'zlib' else b''
+    packed = [_compress(raw, codec, zdict) for raw in prepared.raws]
+    meta = json.dumps({
+        'bank': prepared.name,
+        'source_hash': prepared.source_hash,
+        'shard_size': prepared.shard_size,
+        'questions': len(prepared.numbers),
+        'dictionary': hashlib.sha1(zdict).hexdigest() if zdict else '',
+        'sections': prepared.sections,
+        'numbers': prepared.numbers,
+    }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    embedded = zdict if embed else b''
+    header_size = _HEADER.size + _ENTRY.size * len(packed) + len(meta) + len(embedded)
+
+    entries = []
+    offset = header_size
+    for raw, data in zip(prepared.raws, packed):
+        entries.append(_ENTRY.pack(offset, len(data), len(raw), hashlib.sha1(raw).digest()))
+        offset += len(data)
+
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, CODECS[codec], 0, len(meta), len(embedded), len(packed)))
+        f.writelines(entries)
+        f.write(meta)
+        f.write(embedded)
+        f.writelines(packed)
+    os.replace(tmp_path, out_path)
+    return BundleInfo(out_path, len(prepared.numbers), len(packed), header_size,
+                      sum(len(raw) for raw in prepared.raws), offset)
+
+
+def write_bundle(questions: Iterable[Question], out_path: str, shard_size: int = 20, codec: str = 'zlib',
+                 dict_size: int = 16 * 1024, name: str = '', source_hash: str = '') -> BundleInfo:
+    """把题目写成一个自带字典的分片压缩包；先写临时文件再改名"""
+    prepared = _prepare(questions, shard_size, name, source_hash)
+    zdict = choose_dictionary(prepared.raws, dict_size) if codec == 'zlib' and dict_size > 0 else b''
+    return _write(prepared, out_path, codec, zdict, embed=True)
+
+
+def bundle_banks(paths: Iterable[str], out_dir: str, shard_size: int = 20, codec: str = 'zlib',
+                 dict_size: int = 16 * 1024,
+                 issues: Optional[List[ParseIssue]] = None) -> Tuple[List[BundleInfo], int]:
+    """把多个题库打包成 out_dir/<题库名>.ehxb，返回 (各包信息, 共用字典的大小)
+
+    zlib 时所有包共用一份字典，按哈希单独存为 out_dir/dictionary-<sha1>.zdict，App 只需下载一次；
+    字典省下的字节不如它自身大时不用字典。写完后删除 out_dir 中已没有包引用的字典。
+    """
+    prepared = [_prepare(parse_bank(path, issues), shard_size, bank_name(path), file_hash(path)) for path in paths]
+    zdict = b''
+    if codec == 'zlib' and dict_size > 0:
+        zdict = choose_dictionary([raw for p in prepared for raw in p.raws], dict_size)
+    if zdict:
+        dict_path = dictionary_path(out_dir, hashlib.sha1(zdict).hexdigest())
+        tmp_path = dict_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(zdict)
+        os.replace(tmp_path, dict_path)
+    infos = [_write(p, os.path.join(out_dir, p.name + SUFFIX), codec, zdict, embed=False) for p in prepared]
+    prune_dictionaries(out_dir)
+    return infos, len(zdict)
+
+
+def dictionary_path(directory: str, digest: str) -> str:
+    return os.path.join(directory, DICTIONARY.format(digest))
+
+
+def _bundle_dictionary(path: str) -> str:
+    """包记录的字典哈希（只读包头和元数据）"""
+    with open(path, 'rb') as f:
+        head = f.read(_HEADER.size)
+        magic, version, _, _, meta_len, _, count = _HEADER.unpack(head)
+        if magic != MAGIC or version != VERSION:
+            raise BundleError(f'{path}: 不是题库包或版本不支持')
+        f.seek(_ENTRY.size * count, os.SEEK_CUR)
+        return json.loads(f.read(meta_len).decode('utf-8'))['dictionary']
+
+
+def prune_dictionaries(directory: str) -> List[str]:
+    """删除目录中没有任何包引用的字典文件，返回删掉的路径"""
+    used = set()
+    for name in os.listdir(directory):
+        if name.endswith(SUFFIX):
+            used.add(_bundle_dictionary(os.path.join(directory, name)))
+    removed = []
+    for name in os.listdir(directory):
+        match = _DICT_NAME.fullmatch(name)
+        if match and match.group(1) not in used:
+            os.remove(os.path.join(directory, name))
+            removed.append(os.path.join(directory, name))
+    return removed
+
+
+class BundleReader:
+    """按需解压的只读访问：打开时只读包头，取题时只解压所在的分片
+
+    包没有内嵌字典时使用 zdict，未给出则按包记录的哈希读同一目录下的 dictionary-<sha1>.zdict，并核对哈希。
+    最近用过的 cache 个分片解压后留在内存里，顺序翻题时不重复解压（0 为不缓存）。
+    """
+
+    def __init__(self, path: str, zdict: Optional[bytes] = None, cache: int = 2, verify: bool = True):
+        self.path = path
+        self.verify = verify
+        self._file = open(path, 'rb')
+        try:
+            self._read_header(zdict)
+        except Exception:
+            self._file.close()
+            raise
+        self._cache: 'OrderedDict[int, List[Dict[str, Any]]]' = OrderedDict()
+        self._cache_size = cache
+        self.decompressed = 0  # 解压过的分片数
+
+    def _read_header(self, zdict: Optional[bytes]) -> None:
+        head = self._file.read(_HEADER.size)
+        if len(head) < _HEADER.size:
+            raise BundleError(f'{self.path}: 文件不完整')
+        magic, version, codec, _, meta_len, dict_len, count = _HEADER.unpack(head)
+        if magic != MAGIC or version != VERSION:
+            raise BundleError(f'{self.path}: 不是题库包或版本不支持')
+        self.codec = {v: k for k, v in CODECS.items()}.get(codec)
+        if self.codec is None:
+            raise BundleError(f'{self.path}: 未知的压缩方式 {codec}')
+        table = self._file.read(_ENTRY.size * count)
+        self.shards = [ShardEntry(*_ENTRY.unpack_from(table, i * _ENTRY.size)) for i in range(count)]
+        self.meta: Dict[str, Any] = json.loads(self._file.read(meta_len).decode('utf-8'))
+        self.shard_size: int = self.meta['shard_size']
+        self.sections: List[str] = self.meta['sections']
+        self._positions: Optional[Dict[Tuple[int, int], int]] = None
+
+        self._zdict = self._file.read(dict_len)
+        if self.meta['dictionary'] and not self._zdict:
+            if zdict is None:
+                dict_path = dictionary_path(os.path.dirname(self.path), self.meta['dictionary'])
+                try:
+                    with open(dict_path, 'rb') as f:
+                        zdict = f.read()
+                except FileNotFoundError:
+                    raise BundleError(f'{self.path}: 找不到预置字典 {dict_path}') from None
+            self._zdict = zdict
+        if self.meta['dictionary'] and hashlib.sha1(self._zdict).hexdigest() != self.meta['dictionary']:
+            raise BundleError(f'{self.path}: 预置字典与打包时不一致')
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> 'BundleReader':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.meta['questions']
+
+    def shard(self, index: int) -> List[Dict[str, Any]]:
+        """第 index 片的全部题目"""
+        cached = self._cache.get(index)
+        if cached is not None:
+            self._cache.move_to_end(index)
+            return cached
+        entry = self.shards[index]
+        self._file.seek(entry.offset)
+        data = _decompress(self._file.read(entry.length), self.codec, self._zdict)
+        if self.verify and (len(data) != entry.raw_length or hashlib.sha1(data).digest() != entry.sha1):
+            raise BundleError(f'{self.path}: 第{index}片校验失败')
+        payloads = json.loads(data.decode('utf-8'))
+        self.decompressed += 1
+        if self._cache_size > 0:
+            self._cache[index] = payloads
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return payloads
+
+    def get(self, position: int) -> Dict[str, Any]:
+        """按在题库中的顺序（从 0 开始）取一题"""
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return self.shard(position // self.shard_size)[position % self.shard_size]
+
+    def find(self, number: int, section: str = '') -> Optional[Dict[str, Any]]:
+        """按试卷段落和题号取一题（题号在段落内重复时取第一道）"""
+        try:
+            key = (self.sections.index(section), number)
+        except ValueError:
+            return None
+        if self._positions is None:
+            self._positions = {}
+            for i, (s, n) in enumerate(self.meta['numbers']):
+                self._positions.setdefault((s, n), i)
+        position = self._positions.get(key)
+        return None if position is None else self.get(position)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self.shards)):
+            yield from self.shard(index)
+
+    def shard_hashes(self) -> List[str]:
+        return [entry.sha1.hex() for entry in self.shards]
+
+
+def read_bundle(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """读出整个包：(元数据, 全部题目)"""
+    with BundleReader(path) as reader:
+        return reader.meta, list(reader)
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+增量构建缓存
+
+按源文件哈希缓存抽取结果，按题目内容哈希缓存生成好的文本块及各阶段的中间结果。
+指纹（通常是生成脚本自身的哈希）变化时整个缓存作废，保证改了翻译词典或解析规则后结果不陈旧。
+每次保存只保留本次用到的条目，缓存不会无限增长。
+"""
+
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+# 按键缓存的条目种类：blocks 生成好的题目块，stages 每题各阶段（翻译、分类等）的结果
+BLOCK_KINDS = ('blocks', 'stages')
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def record_hash(record: Any) -> str:
+    """可 JSON 序列化对象的稳定哈希"""
+    data = json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+def module_hash(package: str = 'banktools') -> str:
+    """已导入的 package 下全部模块源文件的哈希；生成脚本用到的任一模块改了，指纹随之改变"""
+    prefix = package + '.'
+    paths = sorted(
+        os.path.abspath(module.__file__) for name, module in list(sys.modules.items())
+        if (name == package or name.startswith(prefix)) and getattr(module, '__file__', None)
+    )
+    return record_hash([[os.path.basename(path), file_hash(path)] for path in paths])
+
+
+class BuildCache:
+    def __init__(self, path: str, fingerprint: str = ''):
+        self.path = path
+        self.fingerprint = fingerprint
+        self._sources: Dict[str, Dict[str, Any]] = {}
+        self._blocks: Dict[str, Dict[str, Any]] = {kind: {} for kind in BLOCK_KINDS}
+        self._used_sources: Dict[str, Dict[str, Any]] = {}
+        self._used_blocks: Dict[str, Dict[str, Any]] = {kind: {} for kind in BLOCK_KINDS}
+        self.hits = dict.fromkeys(('sources',) + BLOCK_KINDS, 0)
+        self.misses = dict.fromkeys(('sources',) + BLOCK_KINDS, 0)
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('fingerprint') != self.fingerprint:
+            return
+        self._sources = data.get('sources', {})
+        for kind in BLOCK_KINDS:
+            self._blocks[kind] = data.get(kind, {})
+
+    def get_source(self, path: str, digest: str) -> Optional[List[Any]]:
+        """源文件哈希未变时返回上次抽取的记录"""
+        entry = self._sources.get(path)
+        if entry is None or entry.get('hash') != digest:
+            self.misses['sources'] += 1
+            return None
+        self.hits['sources'] += 1
+        self._used_sources[path] = entry
+        return entry['records']
+
+    def put_source(self, path: str, digest: str, records: List[Any]) -> None:
+        self._used_sources[path] = {'hash': digest, 'records': records}
+
+    def get_block(self, key: str, kind: str = 'blocks') -> Optional[Any]:
+        """题目块：生成的文本行，或调用方需要一并缓存的其他可 JSON 序列化数据；kind 见 BLOCK_KINDS"""
+        block = self._blocks[kind].get(key)
+        if block is None:
+            self.misses[kind] += 1
+            return None
+        self.hits[kind] += 1
+        self._used_blocks[kind][key] = block
+        return block
+
+    def put_block(self, key: str, block: Any, kind: str = 'blocks') -> None:
+        self._used_blocks[kind][key] = block
+
+    def save(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        data = {
+            'fingerprint': self.fingerprint,
+            'sources': self._used_sources,
+            **self._used_blocks,
+        }
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+路径配置
+
+各脚本不再写死 /Users/... 绝对路径，默认值如下，都可以用环境变量覆盖：
+- EHEXAM_RESOURCES  题库目录，默认为仓库下的 resources/
+- EHEXAM_SOURCES    原始试卷（deepseek 分析稿）所在目录，默认为 iCloud 下载目录
+- EHEXAM_BUILD      生成物目录（缓存、词表、索引等），默认为仓库下的 build/
+
+本模块只依赖 os，导入开销可以忽略。
+"""
+
+import os
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RESOURCES_ENV = 'EHEXAM_RESOURCES'
+SOURCES_ENV = 'EHEXAM_SOURCES'
+BUILD_ENV = 'EHEXAM_BUILD'
+
+RESOURCES_DIR = os.environ.get(RESOURCES_ENV) or os.path.join(ROOT, 'resources')
+SOURCES_DIR = os.environ.get(SOURCES_ENV) or os.path.expanduser(
+    '~/Library/Mobile Documents/com~apple~CloudDocs/Downloads/deepseek_分析')
+BUILD_DIR = os.environ.get(BUILD_ENV) or os.path.join(ROOT, 'build')
+
+PART1_BANK = os.path.join(RESOURCES_DIR, 'part-I.txt')
+
+# Part I 对话题的六份原始试卷，顺序即题库中的题目顺序
+SOURCE_PAPERS = (
+    'ds_2021继教与网络学院学位考试模拟试题一及答案.txt',
+    'ds_2021继教与网络学院学位考试模拟试题二及答案.txt',
+    'ds_2021继教与网络学院学位考试模拟试题三及答案.txt',
+    'ds_2024继教与网络学院学位考试模拟试题一及答案.txt',
+    'ds_2024继教与网络学院学位考试模拟试题二及答案.txt',
+    'ds_2024继教与网络学院学位考试模拟试题三及答案.txt',
+)
+
+
+def source_papers(directory: str = SOURCES_DIR) -> List[str]:
+    return [os.path.join(directory, name) for name in SOURCE_PAPERS]
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+跨试卷的近似重复题检测（MinHash + LSH）
+
+同一道题常在不同年份的试卷里稍作改动后再次出现（is/was、人名、标点）。
+每道题取 原题 + 选项 归一化后的字符 5-gram 作为 shingle，计算 MinHash 签名，
+按 band 分桶，只有落进同一个桶的题才逐对比较，整体接近线性而不是两两比较。
+候选对用 shingle 集合的真实 Jaccard 相似度确认，再用并查集合并成簇。
+
+每个簇取最先出现的题作为代表（canonical），输出 {题目 id: 代表 id} 的映射，
+翻译、解析等只需对代表题计算一次。
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Set, Tuple
+
+from banktools.records import Question, question_key
+from banktools.store import bank_name
+
+_NON_WORD = re.compile(r'[\W_]+')
+_MASK = (1 << 64) - 1
+
+
+class DuplicateCluster(NamedTuple):
+    canonical: str
+    members: Tuple[str, ...]      # 含 canonical，按出现顺序
+    similarity: float             # 簇内与代表题的最低 Jaccard 相似度
+    text: str                     # 代表题原题第一行
+
+
+def question_id(question: Question) -> str:
+    """题库名#题号；分段的题库（part3 各段题号重复）为 题库名#段落:题号，与行号无关，改动其他题也不变"""
+    return f'{bank_name(question.source)}#{question_key(question)}'
+
+
+def question_text(question: Question) -> str:
+    """参与比较的文本：原题 + 选项，小写，标点和空白归一成一个空格"""
+    parts = list(question.dialogue) + [text for _, text in question.options]
+    return _NON_WORD.sub(' ', ' '.join(parts).lower()).strip()
+
+
+def shingles(text: str, k: int = 5) -> Set[int]:
+    """字符 k-gram 的 64 位哈希集合"""
+    if len(text) <= k:
+        grams = {text}
+    else:
+        grams = {text[i:i + k] for i in range(len(text) - k + 1)}
+    return {int.from_bytes(hashlib.blake2b(g.encode('utf-8'), digest_size=8).digest(), 'little') for g in grams}
+
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """单次哈希的 MinHash（one permutation hashing）
+
+    每个 shingle 的哈希只算一次，按哈希值分到 num_perm 个桶里，每个桶取最小值作为签名的一维，
+    计算量与 shingle 数成正比，而不是 shingle 数 × num_perm。
+    短文本会有空桶，用右侧最近的非空桶的值加上距离偏移补齐（rotation densification）。
+    """
+
+    def __init__(self, num_perm: int = 128):
+        self.num_perm = num_perm
+
+    def signature(self, shingle_set: Set[int]) -> Tuple[int, ...]:
+        n = self.num_perm
+        if not shingle_set:
+            return (_MASK,) * n
+        bins: List[int] = [-1] * n
+        for x in shingle_set:
+            b = x % n
+            v = x // n
+            if bins[b] < 0 or v < bins[b]:
+                bins[b] = v
+        if min(bins) < 0:
+            offset = (_MASK // n) + 1
+            dense = list(bins)
+            nearest = -1
+            # 从右往左绕两圈，nearest 是右侧（循环）最近的非空桶
+            for step in range(2 * n - 1, -1, -1):
+                i = step % n
+                if bins[i] >= 0:
+                    nearest = step
+                elif step < n:
+                    dense[i] = bins[nearest % n] + (nearest - step) * offset
+            bins = dense
+        return tuple(bins)
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            # 保留更早出现的作为根，簇的代表就是最先出现的题
+            if rj < ri:
+                ri, rj = rj, ri
+            self.parent[rj] = ri
+
+
+class DuplicateFinder:
+    """bands × rows = num_perm；默认 32 × 4，相似度约 0.4 以上的题大概率成为候选"""
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = 128, bands: int = 32, k: int = 5):
+        if num_perm % bands:
+            raise ValueError('num_perm 必须是 bands 的整数倍')
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.k = k
+        self.hasher = MinHasher(num_perm)
+        self.stats = {'questions': 0, 'candidates': 0, 'pairs': 0}
+
+    def find(self, questions: Sequence[Question]) -> Tuple[List[DuplicateCluster], Dict[str, str]]:
+        """返回（大小 ≥ 2 的簇，全部题目 id → 代表 id）"""
+        ids = [question_id(q) for q in questions]
+
+        sets = [shingles(question_text(q), self.k) for q in questions]
+        buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+        for i, shingle_set in enumerate(sets):
+            signature = self.hasher.signature(shingle_set)
+            for band in range(self.bands):
+                start = band * self.rows
+                buckets[band, signature[start:start + self.rows]].append(i)
+
+        candidates: Set[Tuple[int, int]] = set()
+        for members in buckets.values():
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    candidates.add((members[x], members[y]))
+
+        uf = _UnionFind(len(questions))
+        similar: Dict[Tuple[int, int], float] = {}
+        for i, j in candidates:
+            score = jaccard(sets[i], sets[j])
+            if score >= self.threshold:
+                uf.union(i, j)
+                similar[i, j] = score
+
+        groups: Dict[int, List[int]] = defaultdict(list)
+        for i in range(len(questions)):
+            groups[uf.find(i)].append(i)
+
+        mapping = {ids[i]: ids[root] for root, members in groups.items() for i in members}
+        clusters = []
+        for root, members in groups.items():
+            if len(members) < 2:
+                continue
+            lowest = min(jaccard(sets[root], sets[i]) for i in members[1:])
+            clusters.append(DuplicateCluster(ids[root], tuple(ids[i] for i in members), lowest,
+                                             questions[root].dialogue[0] if questions[root].stem else ''))
+        clusters.sort(key=lambda c: (-len(c.members), c.canonical))
+
+        self.stats = {'questions': len(questions), 'candidates': len(candidates), 'pairs': len(similar)}
+        return clusters, mapping
+
+
+def find_duplicates(questions: Iterable[Question], threshold: float = 0.7) -> Tuple[List[DuplicateCluster], Dict[str, str]]:
+    return DuplicateFinder(threshold).find(list(questions))
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+模糊匹配索引（字符 n-gram 倒排表）
+
+文本先归一化（小写、非字母数字折叠为空格，填空横线随之消失），再切成字符 n-gram。
+查询时只访问与输入共享 n-gram 的词条，按 Dice 系数
+2·|共有| / (|输入| + |词条|) 打分，返回得分最高的词条。
+短词条（如 'Hello,'）即使是输入的子串，得分也会被长度差拉低，不会抢走整句匹配。
+"""
+
+import re
+from bisect import insort
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+class FuzzyMatch(NamedTuple):
+    key: str
+    value: Any
+    score: float  # 0~1，1 表示 n-gram 完全相同
+
+
+def normalize(text: str) -> str:
+    return _NON_WORD.sub(' ', text.lower()).strip()
+
+
+def ngrams(text: str, n: int = 3) -> FrozenSet[str]:
+    text = normalize(text)
+    if not text:
+        return frozenset()
+    if len(text) <= n:
+        return frozenset((text,))
+    padded = f' {text} '
+    return frozenset(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+
+class FuzzyIndex:
+    """n-gram 倒排索引
+
+    max_postings：出现在过多词条里的 n-gram（如 ' th'）查询时不遍历其倒排表，
+    让单次查询的开销不随词典规模线性增长。候选词条是与输入共享至少一个其余 n-gram 的那些，
+    它们的得分用完整的 n-gram 集合重新计算（按上界从高到低，够数后提前结束），
+    跳过的常见 n-gram 不会拉低得分。
+    """
+
+    def __init__(self, n: int = 3, max_postings: int = 2000):
+        self.n = n
+        self.max_postings = max_postings
+        self._keys: List[str] = []
+        self._values: List[Any] = []
+        self._grams: List[FrozenSet[str]] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: str, value: Any) -> None:
+        grams = ngrams(key, self.n)
+        entry = len(self._keys)
+        self._keys.append(key)
+        self._values.append(value)
+        self._grams.append(grams)
+        for gram in grams:
+            self._postings[gram].append(entry)
+
+    def search(self, text: str, limit: int = 5, min_score: float = 0.0) -> List[FuzzyMatch]:
+        """返回得分最高的若干词条，得分相同时先加入的在前"""
+        grams = ngrams(text, self.n)
+        if not grams:
+            return []
+        postings = [self._postings[g] for g in grams if g in self._postings]
+        selective = [p for p in postings if len(p) <= self.max_postings]
+        skipped = len(postings) - len(selective) if selective else 0
+        shared: Dict[int, int] = defaultdict(int)
+        for posting in selective or postings:
+            for entry in posting:
+                shared[entry] += 1
+        size = len(grams)
+        entry_grams = self._grams
+        if not skipped:
+            scored = []
+            for entry, count in shared.items():
+                score = 2.0 * count / (size + len(entry_grams[entry]))
+                if score >= min_score:
+                    scored.append((-score, entry))
+            scored.sort()
+            return [FuzzyMatch(self._keys[e], self._values[e], -s) for s, e in scored[:limit]]
+
+        # 有跳过的 n-gram：共有数至多为 count + skipped，按这个上界从高到低重新精确打分
+        bounds = []
+        for entry, count in shared.items():
+            other = len(entry_grams[entry])
+            bounds.append((-2.0 * min(count + skipped, other, size) / (size + other), entry))
+        bounds.sort()
+        scored = []
+        for bound, entry in bounds:
+            if -bound < min_score or (len(scored) >= limit and -bound < -scored[limit - 1][0]):
+                break
+            other = entry_grams[entry]
+            score = 2.0 * len(grams & other) / (size + len(other))
+            if score >= min_score:
+                insort(scored, (-score, entry))
+        return [FuzzyMatch(self._keys[e], self._values[e], -s) for s, e in scored[:limit]]
+
+    def best(self, text: str, min_score: float = 0.6) -> Optional[FuzzyMatch]:
+        """得分最高且不低于 min_score 的词条，没有则返回 None"""
+        found = self.search(text, limit=1, min_score=min_score)
+        return found[0] if found else None
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+核心词总索引：各题库“核心词”下的全部词条汇成一张可查的表
+
+part-110 的 “• word /音标/：拆解”、part3-* 的 “核心词：” 行里有几百条人工整理的解释，
+加入单词本时可以直接查到已有的解释，以及这个词在哪些题里出现过。
+
+与 lexicon.bin（供抽取核心词用，只收单个单词、每词一条）不同，这里：
+- 收全部词条，短语（because of、put off）按原文的整个短语作词头
+- 同一个词的多条记录合并：最好的一条（有音标 > 有词根拆解 > 解释更长）作主条目，其余不同的解释保留为补充
+- 每个词条带回指：出现在哪些题库的哪些题
+
+文件格式（build/glossary.bin，u32 都是本机字节序，直接 cast 成 memoryview 使用）：
+    b'EHGL' | 版本 u32 | 条数 n u32 | 回指数 r u32 | 元数据长度 u32 | 指纹 40 字节（来源文件的 sha1）
+    记录偏移表 (n + 1) × u32，回指偏移表 (n + 1) × u32（以回指为单位）
+    回指区 r × 4 × u32：(题库序号, 段落序号, 题号, 行号)
+    记录区：小写词头 \\0 词头 \\0 音标 \\0 解释 [\\0 补充解释 ...]，按词头的字节序排序
+    元数据 JSON：题库名、段落名
+查找、前缀查找都是对记录偏移表二分，O(log n)。
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+from array import array
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from banktools.cache import file_hash, record_hash
+from banktools.lexicon import lemma_candidates
+from banktools.parser import bank_paths, parse_bank
+from banktools.records import CoreWord
+from banktools.store import bank_name
+
+_MAGIC = b'EHGL'
+_VERSION = 1
+_HEADER = struct.Struct('<4sIIII40s')
+# 词头（可以是短语）+ 音标 + 解释；parse_core_word 只取第一个词，这里从原文重新切
+_ENTRY = re.compile(r'([A-Za-z][A-Za-z\'’\-. ]*?)\s*(/[^/]+/)\s*[：:]?\s*(.*)$')
+_HEAD_ONLY = re.compile(r'([A-Za-z][A-Za-z\'’\-. ]*?)\s*[：:]\s*(.+)$')
+# part3 “核心词：” 行的短语条目没有音标和冒号，英文词头后直接接中文解释，如 “regardless of 不顾；不管”
+_HEAD_CJK = re.compile(r'([A-Za-z][A-Za-z\'’\-./?+ ]*[A-Za-z.?])\s+([\u4e00-\u9fff…].*)$')
+
+
+class Reference(NamedTuple):
+    bank: str
+    section: str
+    number: int
+    line: int
+
+
+class GlossaryEntry(NamedTuple):
+    word: str
+    phonetic: str
+    explanation: str
+    variants: Tuple[str, ...]          # 其他题中不同的解释
+    references: Tuple[Reference, ...]
+
+
+def headword(word: CoreWord) -> Optional[Tuple[str, str, str]]:
+    """从原文切出 (词头, 音标, 解释)；不是英文词条（如“所有格规则”）时返回 None"""
+    text = word.raw.strip()
+    match = _ENTRY.match(text) or _HEAD_ONLY.match(text) or _HEAD_CJK.match(text)
+    if match is None:
+        return None
+    head = ' '.join(match.group(1).replace('’', "'").split()).strip('.')
+    if not head:
+        return None
+    if match.re is _ENTRY:
+        return head, match.group(2), match.group(3).strip()
+    return head, '', match.group(2).strip()
+
+
+def _rank(item: Tuple[str, str, str]) -> Tuple[bool, bool, int]:
+    _, phonetic, explanation = item
+    return bool(phonetic), '+' in explanation, len(explanation)
+
+
+def collect(paths: Iterable[str]) -> Tuple[Dict[str, GlossaryEntry], List[str], List[str]]:
+    """读出全部题库的核心词并按小写词头合并，返回 (词条, 题库名, 段落名)"""
+    found: Dict[str, List[Tuple[Tuple[str, str, str], Tuple[int, int, int, int]]]] = {}
+    banks: List[str] = []
+    sections: Dict[str, int] = {}
+    for path in paths:
+        bank_id = len(banks)
+        banks.append(bank_name(path))
+        for question in parse_bank(path):
+            section_id = sections.setdefault(question.section, len(sections))
+            for word in question.core_words:
+                item = headword(word)
+                if item is None:
+                    continue
+                ref = (bank_id, section_id, question.number, question.line)
+                found.setdefault(item[0].lower(), []).append((item, ref))
+
+    section_names = list(sections)
+    entries: Dict[str, GlossaryEntry] = {}
+    for key, items in found.items():
+        best = max((item for item, _ in items), key=_rank)
+        variants = tuple(dict.fromkeys(
+            item[2] for item, _ in items if item[2] and item[2] != best[2]))
+        refs = tuple(dict.fromkeys(
+            Reference(banks[b], section_names[s], n, line) for _, (b, s, n, line) in items))
+        entries[key] = GlossaryEntry(best[0], best[1], best[2], variants, refs)
+    return entries, banks, section_names
+
+
+def compile_glossary(paths: Iterable[str], out_path: str, fingerprint: str = '') -> int:
+    """编译核心词总索引（先写临时文件再改名），返回条数"""
+    entries, banks, sections = collect(paths)
+    bank_ids = {name: i for i, name in enumerate(banks)}
+    section_ids = {name: i for i, name in enumerate(sections)}
+
+    keyed = sorted((key.encode('utf-8'), entry) for key, entry in entries.items())
+    offsets = array('I', [0])
+    ref_offsets = array('I', [0])
+    refs = array('I')
+    records = []
+    for key, entry in keyed:
+        record = b'\0'.join([key] + [text.encode('utf-8') for text in
+                                     (entry.word, entry.phonetic, entry.explanation) + entry.variants])
+        records.append(record)
+        offsets.append(offsets[-1] + len(record))
+        for ref in entry.references:
+            refs.extend((bank_ids[ref.bank], section_ids[ref.section], ref.number, ref.line))
+        ref_offsets.append(len(refs) // 4)
+    if refs.itemsize != 4:
+        raise RuntimeError('array("I") 不是 4 字节')
+    meta = json.dumps({'banks': banks, 'sections': sections},
+                      ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(records), len(refs) // 4, len(meta),
+                             fingerprint.encode('ascii').ljust(40)[:40]))
+        f.write(offsets.tobytes())
+        f.write(ref_offsets.tobytes())
+        f.write(refs.tobytes())
+        f.writelines(records)
+        f.write(meta)
+    os.replace(tmp_path, out_path)
+    return len(records)
+
+
+class Glossary:
+    """编译好的核心词总索引（只读，mmap）"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, ref_count, meta_len, fingerprint = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self._mm.close()
+            raise ValueError(f'{path} 不是核心词索引')
+        self.count = count
+        self.fingerprint = fingerprint.decode('ascii').strip()
+        view = memoryview(self._mm)
+        pos = _HEADER.size
+        self._offsets = view[pos:pos + 4 * (count + 1)].cast('I')
+        pos += 4 * (count + 1)
+        self._ref_offsets = view[pos:pos + 4 * (count + 1)].cast('I')
+        pos += 4 * (count + 1)
+        self._refs = view[pos:pos + 16 * ref_count].cast('I')
+        self._data = pos + 16 * ref_count
+        end = self._data + self._offsets[count]
+        meta = json.loads(self._mm[end:end + meta_len].decode('utf-8'))
+        self.banks: List[str] = meta['banks']
+        self.sections: List[str] = meta['sections']
+        view.release()
+
+    def close(self) -> None:
+        for view in (self._offsets, self._ref_offsets, self._refs):
+            view.release()
+        self._mm.close()
+
+    def __enter__(self) -> 'Glossary':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _key(self, i: int) -> bytes:
+        start = self._data + self._offsets[i]
+        return self._mm[start:self._mm.find(b'\0', start)]
+
+    def _entry(self, i: int) -> GlossaryEntry:
+        start = self._data + self._offsets[i]
+        _, word, phonetic, explanation, *variants = \
+            self._mm[start:self._data + self._offsets[i + 1]].decode('utf-8').split('\0')
+        refs = tuple(
+            Reference(self.banks[b], self.sections[s], n, line)
+            for b, s, n, line in (self._refs[4 * r:4 * r + 4]
+                                  for r in range(self._ref_offsets[i], self._ref_offsets[i + 1]))
+        )
+        return GlossaryEntry(word, phonetic, explanation, tuple(variants), refs)
+
+    def _bisect(self, key: bytes) -> int:
+        """第一个不小于 key 的位置"""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def get(self, word: str) -> Optional[GlossaryEntry]:
+        """按词头精确查找（不区分大小写，短语中的多个空格视为一个）"""
+        key = ' '.join(word.lower().split()).encode('utf-8')
+        i = self._bisect(key)
+        if i < self.count and self._key(i) == key:
+            return self._entry(i)
+        return None
+
+    def __contains__(self, word: str) -> bool:
+        return self.get(word) is not None
+
+    def lookup(self, word: str) -> Optional[GlossaryEntry]:
+        """先查原词，再按词形还原的候选查（单词本里存的可能是 debates、stopped）"""
+        for candidate in lemma_candidates(word.strip()):
+            entry = self.get(candidate)
+            if entry is not None:
+                return entry
+        return None
+
+    def prefix(self, prefix: str, limit: Optional[int] = None) -> Iterator[GlossaryEntry]:
+        """按字典序列出以 prefix 开头的词条"""
+        key = ' '.join(prefix.lower().split()).encode('utf-8')
+        i = self._bisect(key)
+        shown = 0
+        while i < self.count and self._key(i).startswith(key) and (limit is None or shown < limit):
+            yield self._entry(i)
+            i += 1
+            shown += 1
+
+    def __iter__(self) -> Iterator[GlossaryEntry]:
+        for i in range(self.count):
+            yield self._entry(i)
+
+
+def glossary_fingerprint(resources_dir: str) -> str:
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = [file_hash(os.path.join(here, name)) for name in ('glossary.py', 'parser.py')]
+    return record_hash([file_hash(p) for p in bank_paths(resources_dir)] + code)
+
+
+def open_glossary(resources_dir: str, path: str) -> Glossary:
+    """打开核心词索引，题库有改动或索引不存在时先重新编译"""
+    fingerprint = glossary_fingerprint(resources_dir)
+    if os.path.exists(path):
+        try:
+            glossary = Glossary(path)
+        except ValueError:
+            glossary = None
+        if glossary is not None:
+            if glossary.fingerprint == fingerprint:
+                return glossary
+            glossary.close()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    compile_glossary(bank_paths(resources_dir), path, fingerprint)
+    return Glossary(path)
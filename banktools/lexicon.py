@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+核心词词表与抽取
+
+词表来源：各题库里已有的核心词条目 + banktools/data/core_words.tsv（同一个词以 tsv 为准），
+编译成一个排好序的二进制表（build/lexicon.bin），用 mmap 打开，按偏移表二分查找，
+启动时不解析整张表，查一个词只读几个记录，整套题库抽取核心词只需毫秒级，不联网。
+
+文件格式：
+    b'EHLX' | 版本 u32 | 条数 n u32 | 指纹 40 字节（来源文件的 sha1）
+    偏移表 (n + 1) × u32（本机字节序，直接 cast 成 memoryview 使用）
+    记录区：小写键 \\0 单词 \\0 音标 \\0 拆解，按键的字节序排序
+"""
+
+import hashlib
+import mmap
+import os
+import re
+import struct
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from banktools.cache import file_hash, record_hash
+from banktools.parser import bank_paths, parse_bank
+from banktools.records import CoreWord, Question
+from banktools.translation import DATA_DIR
+
+CORE_WORDS_TSV = os.path.join(DATA_DIR, 'core_words.tsv')
+BASIC_WORDS = os.path.join(DATA_DIR, 'basic_words.txt')
+# 英文单词（含连字符词）；单词位置表按同一规则切词
+WORD = re.compile(r"[A-Za-z]+(?:-[A-Za-z]+)*")
+
+_MAGIC = b'EHLX'
+_VERSION = 1
+_HEADER = struct.Struct('<4sII40s')
+
+# 词形还原：(后缀, 还原后的词尾)，按顺序尝试
+_SUFFIXES = (
+    ('ies', 'y'), ('ied', 'y'), ('ing', ''), ('ing', 'e'), ('ed', ''), ('ed', 'e'),
+    ('es', ''), ('s', ''), ('ly', ''), ('er', ''), ('est', ''),
+)
+
+
+def lemma_candidates(word: str) -> List[str]:
+    """word 本身及可能的原形（不查表，只按后缀规则生成）"""
+    word = word.lower()
+    candidates = [word]
+    for suffix, ending in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            stem = word[:-len(suffix)] + ending
+            candidates.append(stem)
+            # running → run, stopped → stop
+            if not ending and len(stem) >= 3 and stem[-1] == stem[-2]:
+                candidates.append(stem[:-1])
+    return candidates
+
+
+def load_word_list(path: str = BASIC_WORDS) -> Set[str]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return {line.strip().lower() for line in f if line.strip() and not line.startswith('#')}
+
+
+def load_tsv(path: str = CORE_WORDS_TSV) -> Iterator[CoreWord]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line or line.startswith('#'):
+                continue
+            word, phonetic, explanation = line.split('\t')
+            yield CoreWord(word, phonetic, explanation, f'{word} {phonetic}：{explanation}')
+
+
+def _better(new: CoreWord, old: CoreWord) -> bool:
+    """同一个词多条记录时保留哪条：有音标 > 有词根拆解 > 解释更长"""
+    def rank(w: CoreWord) -> Tuple[bool, bool, int]:
+        return bool(w.phonetic), '+' in w.explanation, len(w.explanation)
+    return rank(new) > rank(old)
+
+
+def harvest(questions: Iterable[Question], entries: Optional[Dict[str, CoreWord]] = None) -> Dict[str, CoreWord]:
+    """从题目的核心词中收集词条，键为小写单词；只收有音标的条目"""
+    entries = {} if entries is None else entries
+    for question in questions:
+        for word in question.core_words:
+            if not word.phonetic or not WORD.fullmatch(word.word):
+                continue
+            key = word.word.lower()
+            old = entries.get(key)
+            if old is None or _better(word, old):
+                entries[key] = word
+    return entries
+
+
+def compile_lexicon(entries: Dict[str, CoreWord], path: str, fingerprint: str = '') -> int:
+    """把词条写成二进制表（先写临时文件再改名），返回条数"""
+    records = sorted(
+        ('\0'.join((key, w.word, w.phonetic, w.explanation)).encode('utf-8') for key, w in entries.items()),
+    )
+    offsets = array('I', [0])
+    for record in records:
+        offsets.append(offsets[-1] + len(record))
+    if offsets.itemsize != 4:
+        raise RuntimeError('array("I") 不是 4 字节')
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(records), fingerprint.encode('ascii').ljust(40)[:40]))
+        f.write(offsets.tobytes())
+        for record in records:
+            f.write(record)
+    os.replace(tmp_path, path)
+    return len(records)
+
+
+class Lexicon:
+    """编译好的词表（只读，mmap）"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, fingerprint = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self._mm.close()
+            raise ValueError(f'{path} 不是词表文件')
+        self.count = count
+        self.fingerprint = fingerprint.decode('ascii').strip()
+        table = _HEADER.size
+        self._data = table + 4 * (count + 1)
+        self._offsets = memoryview(self._mm)[table:self._data].cast('I')
+
+    def close(self) -> None:
+        self._offsets.release()
+        self._mm.close()
+
+    def __enter__(self) -> 'Lexicon':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def digest(self) -> str:
+        """词条内容的哈希（不含文件头，来源文件变了但词条没变时不变）"""
+        return hashlib.sha1(self._mm[_HEADER.size:]).hexdigest()
+
+    def _key(self, i: int) -> bytes:
+        start = self._data + self._offsets[i]
+        return self._mm[start:self._mm.find(b'\0', start)]
+
+    def _entry(self, i: int) -> CoreWord:
+        start = self._data + self._offsets[i]
+        _, word, phonetic, explanation = self._mm[start:self._data + self._offsets[i + 1]].decode('utf-8').split('\0')
+        return CoreWord(word, phonetic, explanation, f'{word} {phonetic}：{explanation}')
+
+    def _bisect(self, key: bytes) -> int:
+        """第一个不小于 key 的位置"""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def get(self, word: str) -> Optional[CoreWord]:
+        """按原形精确查找（不区分大小写）"""
+        key = word.lower().encode('utf-8')
+        i = self._bisect(key)
+        if i < self.count and self._key(i) == key:
+            return self._entry(i)
+        return None
+
+    def __contains__(self, word: str) -> bool:
+        return self.get(word) is not None
+
+    def lookup(self, word: str) -> Optional[CoreWord]:
+        """先查原词，再按词形还原的候选查"""
+        for candidate in lemma_candidates(word):
+            entry = self.get(candidate)
+            if entry is not None:
+                return entry
+        return None
+
+    def prefix(self, prefix: str) -> Iterator[CoreWord]:
+        """按字典序列出以 prefix 开头的词条"""
+        key = prefix.lower().encode('utf-8')
+        i = self._bisect(key)
+        while i < self.count and self._key(i).startswith(key):
+            yield self._entry(i)
+            i += 1
+
+    def __iter__(self) -> Iterator[CoreWord]:
+        for i in range(self.count):
+            yield self._entry(i)
+
+
+def lexicon_sources(resources_dir: str) -> List[str]:
+    return bank_paths(resources_dir) + [CORE_WORDS_TSV]
+
+
+def lexicon_fingerprint(resources_dir: str) -> str:
+    return record_hash([file_hash(p) for p in lexicon_sources(resources_dir)])
+
+
+def build_lexicon(resources_dir: str, path: str) -> int:
+    """从题库和词表文件编译词表；core_words.tsv 中的条目覆盖题库中的同名条目"""
+    entries = harvest(q for p in bank_paths(resources_dir) for q in parse_bank(p))
+    entries.update((w.word.lower(), w) for w in load_tsv())
+    return compile_lexicon(entries, path, lexicon_fingerprint(resources_dir))
+
+
+def open_lexicon(resources_dir: str, path: str) -> Lexicon:
+    """打开词表，来源文件有改动或词表不存在时先重新编译"""
+    fingerprint = lexicon_fingerprint(resources_dir)
+    if os.path.exists(path):
+        try:
+            lexicon = Lexicon(path)
+        except ValueError:
+            lexicon = None
+        if lexicon is not None:
+            if lexicon.fingerprint == fingerprint:
+                return lexicon
+            lexicon.close()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    build_lexicon(resources_dir, path)
+    return Lexicon(path)
+
+
+class CoreWordExtractor:
+    """从题目文本中挑出超出初中水平、且词表中有音标和拆解的词"""
+
+    def __init__(self, lexicon: Lexicon, basic_words: Optional[Set[str]] = None, limit: int = 3):
+        self.lexicon = lexicon
+        self.basic_words = load_word_list() if basic_words is None else basic_words
+        self.limit = limit
+
+    def is_basic(self, word: str) -> bool:
+        return any(c in self.basic_words for c in lemma_candidates(word))
+
+    def extract(self, texts: Sequence[str]) -> Tuple[CoreWord, ...]:
+        found: Dict[str, Tuple[int, CoreWord]] = {}
+        for text in texts:
+            for match in WORD.finditer(text):
+                token = match.group()
+                if len(token) < 3 or token.lower() in found or self.is_basic(token):
+                    continue
+                entry = self.lexicon.lookup(token)
+                if entry is not None and entry.word.lower() not in found:
+                    found[entry.word.lower()] = (len(found), entry)
+        # 有词根拆解、词更长的优先；输出时保持在题目中出现的顺序
+        ranked = sorted(found.values(), key=lambda item: ('+' not in item[1].explanation, -len(item[1].word)))
+        return tuple(entry for _, entry in sorted(ranked[:self.limit], key=lambda item: item[0]))
+
+    def for_question(self, question: Question) -> Tuple[CoreWord, ...]:
+        return self.extract(list(question.dialogue) + [question.answer_text])
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+题库结构检查（lint）
+
+对 resources/ 下的每个题库跑一组固定的结构规则，找出 App 的 QuestionParser 会悄悄丢掉或读错的题：
+缺少答案、答案不在选项中、题号重复、缺少译文等。每条结果带行号，可以输出 JSON。
+
+- 每个文件交给进程池中的一个进程检查，文件之间互不依赖
+- 结果按文件哈希缓存（build/cache/lint.json），文件没变就直接用上次的结果；
+  本模块或解析器的代码改了，缓存整体作废
+"""
+
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from banktools.cache import BuildCache, file_hash, record_hash
+from banktools.parser import LAYOUT_NUMBERED, detect_layout, iter_inline, iter_numbered
+from banktools.records import ParseIssue, Question
+
+ERROR = 'error'
+WARNING = 'warning'
+
+# 规则：类别 → (级别, 说明)。前六条来自解析器，其余是对解析结果的检查
+RULES: Dict[str, Tuple[str, str]] = {
+    'missing_stem': (ERROR, '缺少原题'),
+    'bad_options': (ERROR, '选项不是 A-D'),
+    'missing_answer': (ERROR, '缺少答案'),
+    'answer_not_in_options': (ERROR, '答案不在选项中'),
+    'unrecognized_line': (WARNING, '无法识别的行'),
+    'stray_text': (WARNING, '题号之前有多余内容'),
+    'duplicate_number': (ERROR, '题号重复'),
+    'missing_translation': (ERROR, '缺少译文'),
+    'missing_analysis': (WARNING, '缺少考点或解析'),
+    'header_like_line': (ERROR, '正文行同时含“第”和“题”，App 会当成新的题号'),
+}
+
+_NUMBERED_HEADER = re.compile(r'第\d+题$')
+
+
+class LintFinding(NamedTuple):
+    rule: str
+    severity: str
+    line: int
+    number: int  # 所在题号，题号之前的内容为 0
+    message: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._asdict()
+
+
+class LintResult(NamedTuple):
+    path: str
+    hash: str
+    layout: str
+    questions: int
+    findings: Tuple[LintFinding, ...]
+    cached: bool = False
+
+    def count(self, severity: str) -> int:
+        return sum(1 for f in self.findings if f.severity == severity)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'hash': self.hash,
+            'layout': self.layout,
+            'questions': self.questions,
+            'errors': self.count(ERROR),
+            'warnings': self.count(WARNING),
+            'cached': self.cached,
+            'findings': [f.to_dict() for f in self.findings],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], cached: bool = False) -> 'LintResult':
+        findings = tuple(LintFinding(**f) for f in data['findings'])
+        return cls(data['path'], data['hash'], data['layout'], data['questions'], findings, cached)
+
+
+def make_finding(rule: str, line: int, number: int, message: str) -> LintFinding:
+    """按规则名补上严重程度"""
+    return LintFinding(rule, RULES[rule][0], line, number, message)
+
+
+def check_issue(issue: ParseIssue) -> LintFinding:
+    return make_finding(issue.code if issue.code in RULES else 'unrecognized_line',
+                        issue.line, issue.number, issue.message)
+
+
+def check_numbers(questions: List[Question]) -> Iterable[LintFinding]:
+    """同一试卷段落内题号不能重复（题目：格式每个段落从头编号）"""
+    seen: Dict[Tuple[str, int], List[int]] = defaultdict(list)
+    for question in questions:
+        seen[question.section, question.number].append(question.line)
+    for (_, number), lines in seen.items():
+        for line in lines[1:]:
+            yield make_finding('duplicate_number', line, number, f'题号与第{lines[0]}行重复')
+
+
+def check_question(question: Question) -> Iterable[LintFinding]:
+    if not any(line.strip('- ') for line in question.translation):
+        yield make_finding('missing_translation', question.line, question.number, '没有译文')
+    if not question.key_point or not question.analysis:
+        missing = '考点' if not question.key_point else '解析'
+        yield make_finding('missing_analysis', question.line, question.number, f'没有{missing}')
+
+
+def check_header_like(lines: List[str], layout: str) -> Iterable[LintFinding]:
+    """App 把任何同时含“第”和“题”的行当成题号行（只影响第N题格式）"""
+    if layout != LAYOUT_NUMBERED:
+        return
+    number = 0
+    for line_no, raw in enumerate(lines, 1):
+        text = raw.strip()
+        if _NUMBERED_HEADER.match(text):
+            number = int(text[1:-1])
+        elif '第' in text and '题' in text:
+            yield make_finding('header_like_line', line_no, number, text[:30])
+
+
+def lint_file(path: str, digest: str = '') -> LintResult:
+    """检查一个题库（在工作进程中运行）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    layout, stream = detect_layout(lines)
+    parse = iter_numbered if layout == LAYOUT_NUMBERED else iter_inline
+    issues: List[ParseIssue] = []
+    questions = list(parse(stream, source=path, issues=issues))
+
+    findings = [check_issue(issue) for issue in issues]
+    findings.extend(check_numbers(questions))
+    for question in questions:
+        findings.extend(check_question(question))
+    findings.extend(check_header_like(lines, layout))
+    findings.sort(key=lambda f: (f.line, f.rule))
+    return LintResult(path, digest or file_hash(path), layout, len(questions), tuple(findings))
+
+
+def _lint_worker(job: Tuple[str, str]) -> Dict[str, Any]:
+    return lint_file(*job).to_dict()
+
+
+def lint_fingerprint() -> str:
+    """规则代码的指纹：本模块、解析器和记录定义"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    return record_hash([file_hash(os.path.join(here, name)) for name in ('lint.py', 'parser.py', 'records.py')])
+
+
+def lint_banks(paths: Iterable[str], cache_path: Optional[str] = None,
+               jobs: Optional[int] = None) -> List[LintResult]:
+    """检查多个题库，按 paths 的顺序返回结果；cache_path 为 None 时不用缓存"""
+    paths = list(paths)
+    cache = BuildCache(cache_path, lint_fingerprint()) if cache_path else None
+    results: Dict[str, LintResult] = {}
+    todo: List[Tuple[str, str]] = []
+    for path in paths:
+        digest = file_hash(path)
+        cached = cache.get_source(path, digest) if cache else None
+        if cached is not None:
+            results[path] = LintResult.from_dict(cached, cached=True)
+        else:
+            todo.append((path, digest))
+
+    if len(todo) > 1 and jobs != 1:
+        with ProcessPoolExecutor(max_workers=min(jobs or os.cpu_count() or 1, len(todo))) as pool:
+            done = list(pool.map(_lint_worker, todo))
+    else:
+        done = [_lint_worker(job) for job in todo]
+    for data in done:
+        results[data['path']] = LintResult.from_dict(data)
+        if cache:
+            cache.put_source(data['path'], data['hash'], data)
+
+    if cache:
+        cache.save()
+    return [results[path] for path in paths]
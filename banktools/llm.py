@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+DeepSeek 解析批量生成（asyncio）
+
+与 App 端 Services/DeepSeekParseService.swift 使用同样的接口、系统提示和题目提示，
+区别是一次提交整批题目：
+- 并发上限：同时在途的请求数不超过 concurrency
+- 重试：429 / 5xx / 网络错误按指数退避重试，服务端给了 Retry-After 时按它等待
+- 去重：请求体（模型 + 提示 + 参数）相同的题只请求一次，并发中的相同请求共享同一个结果
+- 结果缓存：按（接口 + 请求体）哈希保存在 SQLite 中，重复运行不再请求；换了接口（如替身服务）不会互相命中
+
+只依赖标准库：HTTP 请求用 urllib 在线程池中执行。测试和基准用 banktools.mockserver 代替真实接口。
+"""
+
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from banktools.cache import record_hash
+from banktools.records import Question
+
+API_URL = 'https://api.deepseek.com/v1/chat/completions'
+MODEL = 'deepseek-chat'
+
+SYSTEM_PROMPT = '''你是英语考试解题专家。请针对题目给出「一看就会选」的解析，包含：
+1. 题目翻译、选项翻译
+2. 核心词：词根词缀拆解（如 pre- + dict → 预测）、视觉化/联想记忆
+3. 场景题/词汇题解题心法：
+   - 第一步：看搭配（如 depend __ → on）
+   - 第二步：析语境，辨近义（如 glance vs stare）
+   - 第三步：挖逻辑（转折、并列、解释）
+4. 若是完形填空：逐句说明为何选该项、线索在哪
+5. 若是阅读理解：抓信息要点，不逐句翻译
+输出简洁、条理清晰，便于学生秒选正确答案。'''
+
+_RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    pass
+
+
+class RetryableError(LLMError):
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def build_prompt(question: Question) -> str:
+    """与 DeepSeekParseService.buildQuestionParsePrompt 一致"""
+    lines = [f"题目：{chr(10).join(question.stem)}", '', '选项：']
+    lines.extend(f'{letter}) {text}' for letter, text in sorted(question.options))
+    lines.append('')
+    lines.append(f'正确答案：{question.answer}')
+    if question.translation:
+        lines.append(f"已有译文：{chr(10).join(question.translation)}")
+    if question.key_point:
+        lines.append(f"已有考点：{chr(10).join(question.key_point)}")
+    if question.analysis:
+        lines.append(f"已有解析：{chr(10).join(question.analysis)}")
+    lines.append('')
+    lines.append('请按系统提示格式，补充/优化上述内容的智能解析（题目翻译、选项翻译、词根词缀、解题心法、完形/阅读技巧）。')
+    return '\n'.join(lines)
+
+
+def request_body(prompt: str, system: str = SYSTEM_PROMPT, model: str = MODEL,
+                 temperature: float = 0.3, max_tokens: int = 4000) -> Dict[str, Any]:
+    return {
+        'model': model,
+        'messages': [
+            {'role': 'system', 'content': system},
+            {'role': 'user', 'content': prompt},
+        ],
+        'temperature': temperature,
+        'max_tokens': max_tokens,
+    }
+
+
+class ResultCache:
+    """（接口 + 请求体）哈希 → 返回内容"""
+
+    SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS results (
+        key TEXT PRIMARY KEY,
+        content TEXT NOT NULL,
+        model TEXT NOT NULL,
+        created REAL NOT NULL
+    )
+    '''
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(self.SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def get(self, key: str) -> Optional[str]:
+        row = self.conn.execute('SELECT content FROM results WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, content: str, model: str = MODEL) -> None:
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO results (key, content, model, created) VALUES (?, ?, ?, ?)',
+                (key, content, model, time.time()),
+            )
+
+
+class AnalysisClient:
+    def __init__(self, api_url: str = API_URL, api_key: Optional[str] = None,
+                 cache: Optional[ResultCache] = None, concurrency: int = 8,
+                 retries: int = 4, backoff: float = 0.5, timeout: float = 120,
+                 cache_scope: Optional[str] = None):
+        self.api_url = api_url
+        # 缓存键中的接口标识，默认为 api_url；替身服务每次端口不同，可以传固定的 'mock'
+        self.cache_scope = cache_scope if cache_scope is not None else api_url
+        self.api_key = api_key if api_key is not None else os.environ.get('DEEPSEEK_API_KEY', '')
+        self.cache = cache
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.stats = {'requests': 0, 'retries': 0, 'cached': 0, 'deduped': 0, 'failed': 0}
+        self.errors: Dict[str, str] = {}  # 缓存键 → 最后一次错误
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _post(self, body: Dict[str, Any]) -> str:
+        """同步发送一次请求（在线程池中运行）"""
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        request = urllib.request.Request(self.api_url, data=data, method='POST')
+        request.add_header('Content-Type', 'application/json')
+        if self.api_key:
+            request.add_header('Authorization', f'Bearer {self.api_key}')
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                payload = json.loads(response.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            retry_after = e.headers.get('Retry-After') if e.headers else None
+            message = f'HTTP {e.code}'
+            if e.code in _RETRY_STATUS:
+                raise RetryableError(message, float(retry_after) if retry_after else None) from e
+            raise LLMError(message) from e
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+            raise RetryableError(f'网络错误：{e}') from e
+        except ValueError as e:
+            raise RetryableError('API 返回的不是 JSON') from e
+        try:
+            content = payload['choices'][0]['message']['content']
+        except (KeyError, IndexError, TypeError):
+            content = None
+        if not content:
+            raise LLMError('API 返回格式错误')
+        return content
+
+    async def _request(self, key: str, body: Dict[str, Any]) -> str:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                self.stats['requests'] += 1
+                try:
+                    content = await loop.run_in_executor(None, self._post, body)
+                    break
+                except RetryableError as e:
+                    if attempt >= self.retries:
+                        raise
+                    delay = e.retry_after
+            # 退避等待时释放并发名额
+            if delay is None:
+                delay = self.backoff * (2 ** attempt) * (1 + random.random() / 2)
+            attempt += 1
+            self.stats['retries'] += 1
+            await asyncio.sleep(delay)
+        if self.cache is not None:
+            self.cache.put(key, content, body.get('model', MODEL))
+        return content
+
+    def cache_key(self, body: Dict[str, Any]) -> str:
+        return record_hash([self.cache_scope, body])
+
+    async def complete(self, body: Dict[str, Any]) -> str:
+        """发送一个请求体，命中缓存或已在途时不重复请求"""
+        key = self.cache_key(body)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.stats['cached'] += 1
+                return cached
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats['deduped'] += 1
+            return await asyncio.shield(future)
+        future = asyncio.ensure_future(self._request(key, body))
+        self._inflight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if future.done():
+                self._inflight.pop(key, None)
+
+    async def _complete_or_none(self, body: Dict[str, Any]) -> Optional[str]:
+        try:
+            return await self.complete(body)
+        except LLMError as e:
+            key = self.cache_key(body)
+            if key not in self.errors:
+                self.stats['failed'] += 1
+            self.errors[key] = str(e)
+            return None
+
+    async def complete_many(self, bodies: Sequence[Dict[str, Any]]) -> List[Optional[str]]:
+        """按顺序返回每个请求体的结果，失败的位置为 None（原因见 errors）"""
+        return list(await asyncio.gather(*(self._complete_or_none(body) for body in bodies)))
+
+    async def analyze_many(self, questions: Iterable[Question], **options) -> List[Optional[str]]:
+        bodies = [request_body(build_prompt(q), **options) for q in questions]
+        return await self.complete_many(bodies)
+
+
+def analyze_questions(questions: Iterable[Question], client: AnalysisClient, **options) -> List[Optional[str]]:
+    """同步入口"""
+    return asyncio.run(client.analyze_many(questions, **options))
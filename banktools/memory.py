@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+翻译记忆库（SQLite）
+
+以原文（去掉首尾空白）为键保存译文。一次性批量查询整个题库的句子，
+未命中的句子按批交给可替换的翻译后端，结果写回记忆库，重复运行不再产生新的翻译请求。
+
+记忆库本身不做归一化：标点、大小写是否算同一句完全由后端决定（词典后端用 translation.normalize），
+因此经记忆库得到的译文与直接查后端逐句相同。
+每条记录带着写入时后端的摘要（digest），后端变了（如词典改了词条）就作废重译；
+后端译不出的句子也记下来（译文为空串），后端不变时不再重复请求。人工写入的译文不随后端作废。
+
+后端只需实现 translate_batch(texts) -> 与 texts 等长的列表，译不出的位置返回 None，并提供 name 和 digest：
+- IndexBackend：本地词典（TranslationIndex），离线可用
+- StubBackend：确定性的假翻译，用于测试，不联网并记录调用次数
+"""
+
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from banktools.cache import record_hash
+from banktools.translation import TranslationIndex
+
+_SQL_BATCH = 500  # 单条 SQL 中的参数个数上限（SQLite 默认 999）
+MANUAL = 'manual'
+
+
+def memory_key(text: str) -> str:
+    """记忆库的键：去掉首尾空白的原文"""
+    return text.strip()
+
+
+class IndexBackend:
+    name = 'dictionary'
+
+    def __init__(self, index: TranslationIndex):
+        self.index = index
+        self.digest = index.digest()
+
+    def translate_batch(self, texts: Sequence[str]) -> List[Optional[str]]:
+        return [self.index.lookup(text) for text in texts]
+
+
+class StubBackend:
+    """测试用后端：译文为 “[译]原文”，calls 记录每批的句子数"""
+    name = 'stub'
+    digest = 'stub'
+
+    def __init__(self):
+        self.calls: List[int] = []
+
+    def translate_batch(self, texts: Sequence[str]) -> List[Optional[str]]:
+        self.calls.append(len(texts))
+        return [f'[译]{text}' for text in texts]
+
+
+class TranslationMemory:
+    SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS memory (
+        key TEXT PRIMARY KEY,
+        source TEXT NOT NULL,
+        target TEXT NOT NULL,
+        backend TEXT NOT NULL,
+        updated REAL NOT NULL,
+        digest TEXT NOT NULL DEFAULT ''
+    )
+    '''
+
+    def __init__(self, path: str, backend=None, batch_size: int = 50):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(self.SCHEMA)
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(memory)')}
+        if 'digest' not in columns:
+            # 旧记忆库没有摘要，其中后端写入的记录都会在下次使用时重译
+            self.conn.execute("ALTER TABLE memory ADD COLUMN digest TEXT NOT NULL DEFAULT ''")
+        self.backend = backend
+        self.batch_size = batch_size
+        self.stats = {'hits': 0, 'backend': 0, 'misses': 0}
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> 'TranslationMemory':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def get_many(self, texts: Iterable[str]) -> Dict[str, str]:
+        """批量查记忆库，返回 {键: 译文}，只含仍然有效的记录；译文为空串表示后端译不出
+
+        有后端时只认人工写入的和当前后端（摘要相同）写入的记录，没有后端时认全部记录。
+        """
+        keys = list({memory_key(text) for text in texts})
+        digest = getattr(self.backend, 'digest', None)
+        found: Dict[str, str] = {}
+        for i in range(0, len(keys), _SQL_BATCH):
+            chunk = keys[i:i + _SQL_BATCH]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f'SELECT key, target, backend, digest FROM memory WHERE key IN ({placeholders})', chunk)
+            for key, target, backend, stored in rows:
+                if self.backend is None or backend == MANUAL or stored == digest:
+                    found[key] = target
+        return found
+
+    def manual_digest(self) -> str:
+        """人工写入的全部译文的摘要；后端写入的记录由后端摘要决定，不计入"""
+        rows = self.conn.execute('SELECT key, target FROM memory WHERE backend = ? ORDER BY key', (MANUAL,))
+        return record_hash(rows.fetchall())
+
+    def put_many(self, pairs: Iterable[Tuple[str, str]], backend: str = MANUAL, digest: str = '') -> None:
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO memory (key, source, target, backend, updated, digest) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                ((memory_key(source), source.strip(), target, backend, now, digest) for source, target in pairs),
+            )
+
+    def translate_many(self, texts: Iterable[str]) -> Dict[str, Optional[str]]:
+        """翻译一批句子，返回 {原文: 译文}；记忆库和后端都没有的句子译文为 None"""
+        texts = list(dict.fromkeys(text.strip() for text in texts))
+        found = self.get_many(texts)
+        missing = [text for text in texts if memory_key(text) not in found]
+
+        if missing and self.backend is not None:
+            for i in range(0, len(missing), self.batch_size):
+                batch = missing[i:i + self.batch_size]
+                results = self.backend.translate_batch(batch)
+                learned = [(source, target or '') for source, target in zip(batch, results)]
+                self.put_many(learned, backend=self.backend.name, digest=self.backend.digest)
+                for source, target in learned:
+                    found[memory_key(source)] = target
+                self.stats['backend'] += sum(1 for _, target in learned if target)
+
+        fresh = set(missing)
+        result: Dict[str, Optional[str]] = {}
+        for text in texts:
+            target = found.get(memory_key(text)) or None
+            result[text] = target
+            if target is None:
+                self.stats['misses'] += 1
+            elif text not in fresh:
+                self.stats['hits'] += 1
+        return result
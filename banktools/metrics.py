@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+生成流程的运行指标（可选开启）
+
+记录各阶段耗时和计数器（每份试卷抽取的题数、翻译精确/部分/兜底命中、规则命中等），
+运行结束时以一行 JSON 追加到指标文件，便于长期看趋势。
+
+没开启时用 NULL_METRICS，所有方法都是空操作，stage() 返回同一个空上下文，几乎没有开销：
+
+    metrics = Metrics('regenerate_part1') if path else NULL_METRICS
+    with metrics.stage('extract'):
+        ...
+    metrics.count('translation', 'exact')
+"""
+
+import contextlib
+import json
+import os
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+METRICS_ENV = 'EHEXAM_METRICS'
+
+
+class Metrics:
+    enabled = True
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.time()
+        self.stages: Dict[str, float] = {}
+        self.calls: Counter = Counter()
+        self.counters: Dict[str, Counter] = defaultdict(Counter)
+        self.values: Dict[str, Any] = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """累计 name 阶段的耗时（同名阶段多次进入时相加）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+            self.calls[name] += 1
+
+    def count(self, group: str, key: str, n: int = 1) -> None:
+        self.counters[group][key] += n
+
+    def set(self, key: str, value: Any) -> None:
+        self.values[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'started': self.started,
+            'wall_seconds': time.time() - self.started,
+            'stages': {name: {'seconds': round(seconds, 6), 'calls': self.calls[name]}
+                       for name, seconds in self.stages.items()},
+            'counters': {group: dict(counter) for group, counter in self.counters.items()},
+            'values': self.values,
+        }
+
+    def dump(self, path: str) -> None:
+        """追加一行 JSON 到 path"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.to_dict(), ensure_ascii=False) + '\n')
+
+    def summary(self) -> Iterator[str]:
+        for name, seconds in self.stages.items():
+            yield f'阶段 {name}: {seconds * 1000:.1f} ms（{self.calls[name]} 次）'
+        for group, counter in self.counters.items():
+            yield f'{group}: ' + '，'.join(f'{key} {n}' for key, n in counter.items())
+
+
+class _NullMetrics:
+    enabled = False
+    _context = contextlib.nullcontext()
+
+    def stage(self, name: str) -> contextlib.nullcontext:
+        return self._context
+
+    def count(self, group: str, key: str, n: int = 1) -> None:
+        pass
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def dump(self, path: str) -> None:
+        pass
+
+    def summary(self) -> Iterator[str]:
+        return iter(())
+
+
+NULL_METRICS = _NullMetrics()
+
+
+def metrics_from_env(name: str) -> Tuple[Union[Metrics, _NullMetrics], Optional[str]]:
+    """环境变量 EHEXAM_METRICS 指定指标文件时开启，返回（指标对象，文件路径）"""
+    path = os.environ.get(METRICS_ENV)
+    if not path:
+        return NULL_METRICS, None
+    return Metrics(name), path
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+本地 DeepSeek 替身服务，用于测试和基准
+
+实现 POST /v1/chat/completions，按请求内容返回确定性的解析文本，不联网、不计费。
+可以模拟延迟和限流：latency 秒后才响应；fail_every=N 时每第 N 个请求返回 429。
+
+    python3 -m banktools.mockserver --port 8765 --latency 0.2 --fail-every 5
+    python3 generate_analyses.py --api-url http://127.0.0.1:8765/v1/chat/completions
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+CHAT_PATH = '/v1/chat/completions'
+
+
+def mock_content(prompt: str) -> str:
+    """由提示生成的固定内容，同一提示总是得到同样的结果"""
+    digest = hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:8]
+    first = prompt.split('\n', 1)[0]
+    return f'【解析·秒选思路】（mock {digest}）{first}'
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    server: 'MockServer'
+
+    def log_message(self, format, *args):  # 不在终端刷请求日志
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: Tuple[Tuple[str, str], ...] = ()) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        if self.path != CHAT_PATH:
+            self._send_json(404, {'error': {'message': 'not found'}})
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length).decode('utf-8'))
+            prompt = body['messages'][-1]['content']
+        except (ValueError, KeyError, IndexError, TypeError):
+            self._send_json(400, {'error': {'message': 'bad request'}})
+            return
+
+        count = self.server.count_request(prompt)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.server.fail_every and count % self.server.fail_every == 0:
+            self._send_json(429, {'error': {'message': 'rate limited'}}, (('Retry-After', '0'),))
+            return
+        self._send_json(200, {
+            'id': f'mock-{count}',
+            'object': 'chat.completion',
+            'model': body.get('model', ''),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': mock_content(prompt)},
+                'finish_reason': 'stop',
+            }],
+        })
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address=('127.0.0.1', 0), latency: float = 0.0, fail_every: int = 0):
+        super().__init__(address, MockHandler)
+        self.latency = latency
+        self.fail_every = fail_every
+        self.requests = 0
+        self.prompts = {}  # 提示 → 收到次数
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}{CHAT_PATH}'
+
+    def count_request(self, prompt: str) -> int:
+        with self._lock:
+            self.requests += 1
+            self.prompts[prompt] = self.prompts.get(prompt, 0) + 1
+            return self.requests
+
+    def start(self) -> 'MockServer':
+        """在后台线程中运行"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> 'MockServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='本地 DeepSeek 替身服务')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='每个请求的延迟（秒）')
+    parser.add_argument('--fail-every', type=int, default=0, help='每第 N 个请求返回 429')
+    args = parser.parse_args()
+
+    server = MockServer((args.host, args.port), args.latency, args.fail_every)
+    print(f'mock 服务已启动: {server.url}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
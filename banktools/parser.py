@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+"""
+题库流式解析
+
+按行读取，一遍扫描完成，不把整个文件读进内存，也不用跨行的 DOTALL 正则。
+格式有问题的题目不会悄悄并入相邻题目：整题跳过，并把行号记入 issues。
+
+第N题 格式（part-I.txt / part-110.txt）：
+
+    第1题
+
+    原题：--- Would you like another cup of tea?
+        --- __________
+    选项：
+    A) ...
+    你的答案：D
+    核对结果：正确
+    译文：--- 你想再喝一杯茶吗？
+        --- 不了，谢谢。
+
+    【考点·高效记忆】
+    ...
+    【解析·秒选思路】
+    ...
+    核心词（音标+拆解记忆）
+
+    • dialogue /ˈdaɪəlɒɡ/：dia-（两者之间）+ logue（说）→ 对话
+
+题目：格式（part3-*.txt / part-en-60.txt），题号单独一行，按试卷分段：
+
+    2021模拟试题一（31-55题）
+
+    31
+
+    题目：___________ many years later did she learn the real cause ...
+    A. Hardly
+    ...
+    答案：C. Not until
+    译文：...
+    考点·高效记忆：...
+    解析·秒选思路：...
+    易错点提示：...
+    核心词：divorce /dɪˈvɔːs/ (n. 离婚)；词根：...
+
+文末的“答案汇总”部分不是题目，解析到此为止。
+"""
+
+import glob
+import itertools
+import os
+import re
+from typing import Generator, Iterable, Iterator, List, Optional, Tuple
+
+from banktools.records import CoreWord, ParseIssue, Question
+
+_NUMBERED_HEADER = re.compile(r'第(\d+)题$')
+_OPTION = re.compile(r'([A-D])[\)）]\s*(.*)$')
+_INLINE_NUMBER = re.compile(r'\d+$')
+_INLINE_OPTION = re.compile(r'([A-D])([\.\)）．])\s*(.*)$')
+_INLINE_ANSWER = re.compile(r'([A-D])(?:[\.\)）．\s]|$)')
+_CORE_WORD = re.compile(r'(\S+)\s+(/[^/]+/)\s*[：:]?\s*(.*)$')
+
+OPTION_LETTERS = ('A', 'B', 'C', 'D')
+
+# 第N题 格式中“行首两个字 → 行类型”
+_NUMBERED_PREFIXES = {
+    '原题': 'stem',
+    '选项': 'options',
+    '你的': 'answer',
+    '核对': 'verdict',
+    '译文': 'translation',
+    '【考': 'key_point',
+    '【解': 'analysis',
+    '核心': 'core',
+}
+
+LAYOUT_NUMBERED = 'numbered'  # 第N题 格式
+LAYOUT_INLINE = 'inline'      # 题目：/答案： 格式
+
+# 题目：格式中“字段前缀 → _Block 属性”
+_INLINE_FIELDS = (
+    ('题目：', 'stem'),
+    ('译文：', 'translation'),
+    ('考点·高效记忆：', 'key_point'),
+    ('解析·秒选思路：', 'analysis'),
+    ('易错点提示：', 'pitfall'),
+)
+
+
+class _Block:
+    """正在解析的一道题"""
+    __slots__ = ('number', 'line', 'section', 'stem', 'options', 'answer', 'verdict',
+                 'translation', 'key_point', 'analysis', 'pitfall', 'core_words', 'state', 'delimiter')
+
+    def __init__(self, number: int, line: int, section: str = ''):
+        self.number = number
+        self.line = line
+        self.section = section
+        self.stem: List[str] = []
+        self.options: List[tuple] = []
+        self.answer = ''
+        self.verdict = ''
+        self.translation: List[str] = []
+        self.key_point: List[str] = []
+        self.analysis: List[str] = []
+        self.pitfall: List[str] = []
+        self.core_words: List[CoreWord] = []
+        self.state = ''
+        self.delimiter = ')'
+
+    def problems(self) -> List[Tuple[str, str]]:
+        """(类别, 说明) 列表，为空表示题目完整"""
+        found = []
+        if not self.stem:
+            found.append(('missing_stem', '缺少原题'))
+        letters = tuple(key for key, _ in self.options)
+        if letters != OPTION_LETTERS:
+            found.append(('bad_options', f'选项应为 A-D，实际为 {"".join(letters) or "空"}'))
+        if not self.answer:
+            found.append(('missing_answer', '缺少答案'))
+        elif self.answer not in letters:
+            found.append(('answer_not_in_options', f'答案 {self.answer} 不在选项中'))
+        return found
+
+    def build(self, source: str) -> Question:
+        return Question(
+            number=self.number,
+            stem=tuple(self.stem),
+            options=tuple(self.options),
+            answer=self.answer,
+            translation=tuple(self.translation),
+            key_point=tuple(self.key_point),
+            analysis=tuple(self.analysis),
+            core_words=tuple(self.core_words),
+            verdict=self.verdict,
+            source=source,
+            line=self.line,
+            section=self.section,
+            pitfall=tuple(self.pitfall),
+            delimiter=self.delimiter,
+        )
+
+
+def parse_core_word(text: str) -> CoreWord:
+    """解析一条核心词（不含前面的 • 或 核心词：）"""
+    text = text.strip()
+    match = _CORE_WORD.match(text)
+    if match:
+        return CoreWord(match.group(1), match.group(2), match.group(3).strip(), text)
+    head, sep, explanation = text.partition('：')
+    if not sep:
+        head, explanation = text, ''
+    words = head.split()
+    return CoreWord(words[0] if words else '', '', explanation.strip(), text)
+
+
+def iter_numbered(lines: Iterable[str], source: str = '',
+                  issues: Optional[List[ParseIssue]] = None) -> Iterator[Question]:
+    """逐行解析第N题格式，依次产出 Question
+
+    issues 不为 None 时，格式问题会追加进去；有缺项的题目不产出。
+    """
+    block: Optional[_Block] = None
+
+    def report(line_no: int, message: str, number: int = 0, code: str = 'unrecognized_line') -> None:
+        if issues is not None:
+            issues.append(ParseIssue(source, line_no, number, message, code))
+
+    def finish(current: _Block) -> Optional[Question]:
+        problems = current.problems()
+        if problems:
+            # 一题一条，类别取第一个问题
+            report(current.line, '；'.join(message for _, message in problems) + '，已跳过',
+                   current.number, problems[0][0])
+            return None
+        return current.build(source)
+
+    for line_no, raw in enumerate(lines, 1):
+        text = raw.strip()
+
+        if text[:1] == '第':
+            header = _NUMBERED_HEADER.match(text)
+            if header:
+                if block is not None:
+                    question = finish(block)
+                    if question is not None:
+                        yield question
+                block = _Block(int(header.group(1)), line_no)
+                continue
+
+        if block is None:
+            if text:
+                report(line_no, '题号之前有多余内容', code='stray_text')
+            continue
+
+        state = block.state
+        if not text:
+            # 原题、译文以空行结束；其余段落内的空行忽略
+            if state in ('stem', 'translation'):
+                block.state = ''
+            continue
+
+        # 按行首两个字分派，正文行只需一次字典查找
+        kind = _NUMBERED_PREFIXES.get(text[:2])
+        if kind is not None:
+            if kind == 'stem' and text.startswith('原题：'):
+                block.stem.append(text[3:].strip())
+                block.state = 'stem'
+                continue
+            if kind == 'options' and text == '选项：':
+                block.state = 'options'
+                continue
+            if kind == 'answer' and text.startswith('你的答案：'):
+                block.answer = text[5:].strip()
+                block.state = ''
+                continue
+            if kind == 'verdict' and text.startswith('核对结果：'):
+                block.verdict = text[5:].strip()
+                continue
+            if kind == 'translation' and text.startswith('译文：'):
+                block.translation.append(text[3:].strip())
+                block.state = 'translation'
+                continue
+            if kind == 'key_point' and text == '【考点·高效记忆】':
+                block.state = 'key_point'
+                continue
+            if kind == 'analysis' and text.startswith('【解析·秒选思路】'):
+                block.state = 'analysis'
+                continue
+            if kind == 'core' and text.startswith('核心词') and state in ('analysis', 'key_point', ''):
+                block.state = 'core'
+                continue
+
+        if state == 'key_point':
+            block.key_point.append(text)
+        elif state == 'analysis':
+            block.analysis.append(text)
+        elif state == 'options':
+            option = _OPTION.match(text)
+            if option:
+                block.options.append((option.group(1), option.group(2).strip()))
+            else:
+                report(line_no, f'无法识别的选项行：{text[:30]}', block.number)
+        elif state == 'stem':
+            block.stem.append(text)
+        elif state == 'translation':
+            block.translation.append(text)
+        elif state == 'core' and text.startswith('•'):
+            block.core_words.append(parse_core_word(text[1:]))
+        else:
+            report(line_no, f'无法识别的行：{text[:30]}', block.number)
+
+    if block is not None:
+        question = finish(block)
+        if question is not None:
+            yield question
+
+
+def iter_inline(lines: Iterable[str], source: str = '', issues: Optional[List[ParseIssue]] = None,
+                section: str = '') -> Generator[Question, None, Optional[str]]:
+    """逐行解析题目：格式，依次产出 Question（verdict 为空，section 为所在试卷段落）
+
+    section 为开头所处的试卷段落（只解析文件中间的一段时使用）。
+    生成器的返回值是结尾时所处的段落；遇到答案汇总时为 None，表示后面不再有题目。
+    """
+    block: Optional[_Block] = None
+
+    def report(line_no: int, message: str, number: int = 0, code: str = 'unrecognized_line') -> None:
+        if issues is not None:
+            issues.append(ParseIssue(source, line_no, number, message, code))
+
+    def finish(current: _Block) -> Optional[Question]:
+        problems = current.problems()
+        if problems:
+            # 一题一条，类别取第一个问题
+            report(current.line, '；'.join(message for _, message in problems) + '，已跳过',
+                   current.number, problems[0][0])
+            return None
+        return current.build(source)
+
+    for line_no, raw in enumerate(lines, 1):
+        text = raw.strip()
+        if not text:
+            continue
+
+        if _INLINE_NUMBER.match(text):
+            if block is not None:
+                question = finish(block)
+                if question is not None:
+                    yield question
+            block = _Block(int(text), line_no, section)
+            continue
+
+        if block is not None:
+            field = next((attr for prefix, attr in _INLINE_FIELDS if text.startswith(prefix)), None)
+            if field is not None:
+                getattr(block, field).append(text.partition('：')[2].strip())
+                continue
+            if text.startswith('答案：'):
+                answer = _INLINE_ANSWER.match(text[3:].strip())
+                if answer:
+                    block.answer = answer.group(1)
+                else:
+                    report(line_no, f'无法识别的答案：{text[:30]}', block.number)
+                continue
+            if text.startswith('核心词：'):
+                block.core_words.append(parse_core_word(text[4:]))
+                continue
+            if not block.answer:
+                # 答案之前的其余行都应是选项
+                option = _INLINE_OPTION.match(text)
+                if option:
+                    if not block.options:
+                        block.delimiter = option.group(2)
+                    block.options.append((option.group(1), option.group(3).strip()))
+                else:
+                    report(line_no, f'无法识别的选项行：{text[:30]}', block.number)
+                continue
+
+        # 题目之外的行是试卷段落标题；遇到答案汇总即结束
+        if block is not None:
+            question = finish(block)
+            if question is not None:
+                yield question
+            block = None
+        if '答案汇总' in text:
+            return None
+        section = text
+
+    if block is not None:
+        question = finish(block)
+        if question is not None:
+            yield question
+    return section
+
+
+def detect_layout(lines: Iterable[str]) -> Tuple[str, Iterator[str]]:
+    """根据开头几行判断题库格式，返回 (格式, 从头开始的行迭代器)"""
+    lines = iter(lines)
+    head: List[str] = []
+    layout = LAYOUT_NUMBERED
+    for raw in lines:
+        head.append(raw)
+        text = raw.strip()
+        if _NUMBERED_HEADER.match(text):
+            break
+        if _INLINE_NUMBER.match(text) or text.startswith('题目：'):
+            layout = LAYOUT_INLINE
+            break
+    return layout, itertools.chain(head, lines)
+
+
+def parse_bank(path: str, issues: Optional[List[ParseIssue]] = None) -> Iterator[Question]:
+    """流式解析一个题库文件，自动识别两种格式"""
+    with open(path, 'r', encoding='utf-8') as f:
+        layout, lines = detect_layout(f)
+        parse = iter_inline if layout == LAYOUT_INLINE else iter_numbered
+        yield from parse(lines, source=path, issues=issues)
+
+
+def bank_paths(resources_dir: str) -> List[str]:
+    """resources 目录下的所有题库文件（part*.txt），按文件名排序"""
+    return sorted(glob.glob(os.path.join(resources_dir, 'part*.txt')))
+
+
+def iter_banks(resources_dir: str, issues: Optional[List[ParseIssue]] = None) -> Iterator[Question]:
+    """依次流式解析 resources 目录下的全部题库"""
+    for path in bank_paths(resources_dir):
+        yield from parse_bank(path, issues)
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Part I 对话题的整段对话翻译与题目生成
+
+整段对话的译文词典放在 banktools/data/part1_translations.json，按试卷分组：
+    {"2021试卷一": [["第一句", "第二句", "第一句译文", "第二句译文"], ...], ...}
+同一对话出现多次时以后出现的为准。
+
+查找顺序：(第一句, 第二句) 精确匹配（第二句是空白时用答案文本）→ 整段对话 n-gram 部分匹配 → 未找到。
+整段都没找到的题由 translate_items 按句交给翻译记忆库（背后是 dialogue_translations.json 句子词典），
+仍没有的句子保持英文原文；regenerate_part1_complete.py 和流水线都经由它翻译，结果一致。
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from banktools.cache import file_hash, record_hash
+from banktools.fuzzy import FuzzyIndex
+from banktools.metrics import NULL_METRICS
+from banktools.records import CoreWord, Question
+from banktools.rules import Classification
+from banktools.sources import source_question
+from banktools.translation import DATA_DIR
+
+PART1_TRANSLATIONS = os.path.join(DATA_DIR, 'part1_translations.json')
+
+# 试卷里第二句为空白时的几种写法
+BLANKS = frozenset({'__________', '______________', '________', '___________________'})
+
+Pair = Tuple[str, str]
+
+
+def load_dialogue_pairs(path: str = PART1_TRANSLATIONS) -> Dict[Pair, Pair]:
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    pairs: Dict[Pair, Pair] = {}
+    for rows in data.values():
+        for d1, d2, t1, t2 in rows:
+            pairs[d1, d2] = (t1, t2)
+    return pairs
+
+
+def fill_blank(d2: str, answer_text: str) -> str:
+    """第二句是空白时用答案文本代替"""
+    d2 = d2.strip()
+    return answer_text.strip() if d2 in BLANKS else d2
+
+
+class DialogueTranslator:
+    def __init__(self, pairs: Dict[Pair, Pair]):
+        self.pairs = pairs
+        # 部分匹配用的 n-gram 索引，键为“第一句 + 第二句”
+        self.index = FuzzyIndex()
+        for (d1, d2), translation in pairs.items():
+            self.index.add(f'{d1} {d2}', translation)
+
+    @classmethod
+    def from_file(cls, path: str = PART1_TRANSLATIONS) -> 'DialogueTranslator':
+        return cls(load_dialogue_pairs(path))
+
+    def lookup(self, d1: str, d2: str, answer_text: str) -> Tuple[Optional[Pair], str]:
+        """返回（(第一句译文, 第二句译文) 或 None，命中方式 exact/partial/fallback）"""
+        d1 = d1.strip()
+        translation = self.pairs.get((d1, fill_blank(d2, answer_text)))
+        if translation is not None:
+            return translation, 'exact'
+        # 取整段对话得分最高的词条
+        match = self.index.best(f'{d1} {d2.strip()}')
+        if match is not None:
+            return match.value, 'partial'
+        return None, 'fallback'
+
+
+def translate_items(items: Sequence[Dict[str, str]], memory_path: str,
+                    translator: Optional[DialogueTranslator] = None,
+                    metrics=NULL_METRICS) -> List[Tuple[Pair, str]]:
+    """翻译抽取出的题目，返回每题的（(第一句译文, 第二句译文)，命中方式）
+
+    整段对话词典没有的题，按句批量查翻译记忆库；记忆库和句子词典都没有的句子保持原文，可以后续手动补充。
+    """
+    if translator is None:
+        translator = DialogueTranslator.from_file()
+    results: List[Tuple[Optional[Pair], str]] = []
+    pending: Dict[int, Pair] = {}  # 整段对话没查到的题：位置 → (第一句, 第二句)
+    for i, item in enumerate(items):
+        answer_text = item[item['answer']].strip()
+        translation, kind = translator.lookup(item['dialogue1'], item['dialogue2'], answer_text)
+        metrics.count('translation', kind)
+        results.append((translation, kind))
+        if translation is None:
+            pending[i] = (item['dialogue1'].strip(), fill_blank(item['dialogue2'], answer_text))
+
+    if pending:
+        from banktools.memory import IndexBackend, TranslationMemory
+        from banktools.translation import DIALOGUE_TRANSLATIONS, TranslationIndex
+
+        os.makedirs(os.path.dirname(memory_path), exist_ok=True)
+        backend = IndexBackend(TranslationIndex.from_files(DIALOGUE_TRANSLATIONS))
+        with TranslationMemory(memory_path, backend=backend) as memory:
+            translated = memory.translate_many(text for pair in pending.values() for text in pair)
+            for key in ('hits', 'backend', 'misses'):
+                metrics.count('sentence_memory', key, memory.stats[key])
+        for i, (d1, d2) in pending.items():
+            results[i] = ((translated.get(d1) or d1, translated.get(d2) or d2), results[i][1])
+    return results
+
+
+def translation_digest(memory_path: str) -> str:
+    """translate_items 用到的数据（两份词典、记忆库中人工写入的译文）的摘要，缓存译文时一并作为键"""
+    from banktools.translation import DIALOGUE_TRANSLATIONS
+
+    manual = ''
+    if os.path.exists(memory_path):
+        from banktools.memory import TranslationMemory
+
+        with TranslationMemory(memory_path) as memory:
+            manual = memory.manual_digest()
+    return record_hash([file_hash(PART1_TRANSLATIONS), file_hash(DIALOGUE_TRANSLATIONS), manual])
+
+
+def part1_question(item: Dict[str, str], number: int, translation: Pair,
+                   classification: Classification, core_words: Sequence[CoreWord]) -> Question:
+    """由抽取结果和各阶段的产物组装题库中的一道题"""
+    t1, t2 = translation
+    return source_question(item, number)._replace(
+        translation=(f'--- {t1}', f'--- {t2}'),
+        key_point=(classification.key_point,),
+        analysis=(classification.analysis,),
+        core_words=tuple(core_words),
+    )
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+Part I 题库的一体化流水线：抽取 → 翻译 → 分析 → 校验 → 写盘
+
+原来要先运行 regenerate_part1_complete.py 写出 part-I.txt，再由 fix_all_translations.py 读回来解析一遍补译文，
+最后 verify_part1.py 把题库和六份试卷各读一遍。流水线让各阶段共用同一份内存中的题目，
+校验直接对内存中的题目做，题库只在最后写一次。
+
+- extract   抽取六份试卷的 Part I
+- translate 整段对话词典（精确/部分匹配）；仍未命中的题按句交给翻译记忆库批量翻译
+- analyze   规则引擎批量分类考点/解析，词表挑核心词
+- verify    与原始试卷比对答案和对话，检查译文
+- write     原子写入，内容不变则不改写
+
+词表、规则、SQLite 翻译记忆库等较重的模块都在阶段内才导入。
+每次运行结束记下输入（试卷、数据文件、代码、其他题库）和输出的哈希，
+再次运行时都没有变化就直接返回，不导入、不解析任何东西。
+"""
+
+import glob
+import json
+import os
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from banktools.cache import file_hash, record_hash
+from banktools.config import BUILD_DIR, PART1_BANK, source_papers
+from banktools.metrics import NULL_METRICS
+from banktools.parser import bank_paths
+
+if TYPE_CHECKING:
+    from banktools.records import Question
+    from banktools.verify import VerifyReport
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class PipelineConfig(NamedTuple):
+    sources: Tuple[str, ...] = tuple(source_papers())
+    bank_path: str = PART1_BANK
+    build_dir: str = BUILD_DIR
+    force: bool = False  # 忽略上次运行的记录，全部重跑
+
+    @property
+    def resources_dir(self) -> str:
+        return os.path.dirname(os.path.abspath(self.bank_path))
+
+    @property
+    def stamp_path(self) -> str:
+        return os.path.join(self.build_dir, 'cache', 'pipeline.json')
+
+    @property
+    def lexicon_path(self) -> str:
+        return os.path.join(self.build_dir, 'lexicon.bin')
+
+    @property
+    def memory_path(self) -> str:
+        return os.path.join(self.build_dir, 'cache', 'translation_memory.sqlite')
+
+
+class PipelineResult(NamedTuple):
+    skipped: bool                 # 输入输出都没变，什么也没做
+    questions: int
+    changed: bool                 # 题库文件是否被改写（有试卷读取失败时不写）
+    report: Optional['VerifyReport']  # 跳过时为 None
+    errors: Tuple[str, ...] = ()  # 读取失败的试卷、被跳过的题
+    unreadable: int = 0           # 读取失败的试卷数
+
+
+class Pipeline:
+    def __init__(self, config: PipelineConfig = PipelineConfig(), metrics=NULL_METRICS):
+        self.config = config
+        self.metrics = metrics
+        self.errors: List[str] = []
+        self.unreadable = 0  # 读取失败的试卷数
+
+    # ---- 上次运行的记录 ----
+
+    def input_hash(self) -> str:
+        """影响输出的全部输入：试卷、数据文件、本包代码，以及词表取词用的其他题库"""
+        config = self.config
+        files = list(config.sources)
+        files += sorted(glob.glob(os.path.join(_PACKAGE_DIR, '*.py')))
+        files += sorted(glob.glob(os.path.join(_PACKAGE_DIR, 'data', '*')))
+        output = os.path.abspath(config.bank_path)
+        files += [p for p in bank_paths(config.resources_dir) if os.path.abspath(p) != output]
+        return record_hash([[path, file_hash(path) if os.path.exists(path) else None] for path in files])
+
+    def _load_stamp(self) -> Dict[str, str]:
+        try:
+            with open(self.config.stamp_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def up_to_date(self, inputs: str) -> bool:
+        stamp = self._load_stamp()
+        path = self.config.bank_path
+        return (stamp.get('inputs') == inputs and os.path.exists(path)
+                and stamp.get('output') == file_hash(path))
+
+    def _save_stamp(self, inputs: str, output: str) -> None:
+        os.makedirs(os.path.dirname(self.config.stamp_path), exist_ok=True)
+        with open(self.config.stamp_path, 'w', encoding='utf-8') as f:
+            json.dump({'inputs': inputs, 'output': output}, f)
+
+    # ---- 各阶段 ----
+
+    def extract(self) -> List[Dict[str, str]]:
+        from banktools.sources import extract_part1
+
+        items = []
+        for path in self.config.sources:
+            issues = []
+            try:
+                extracted = extract_part1(path, issues)
+            except OSError as e:
+                self.errors.append(f'{path}: {e}')
+                self.unreadable += 1
+                self.metrics.count('extract_errors', os.path.basename(path))
+                continue
+            self.metrics.count('extracted', os.path.basename(path), len(extracted))
+            # 试卷里格式不完整的题被跳过，与读取失败一样报告出来
+            self.errors.extend(str(issue) for issue in issues)
+            items.extend(extracted)
+        return items
+
+    def translate(self, items: Sequence[Dict[str, str]]) -> List[Tuple[str, str]]:
+        from banktools.part1 import translate_items
+
+        return [translation for translation, _ in
+                translate_items(items, self.config.memory_path, metrics=self.metrics)]
+
+    def analyze(self, items: Sequence[Dict[str, str]], translations: Sequence[Tuple[str, str]]) -> List['Question']:
+        from banktools.lexicon import CoreWordExtractor, open_lexicon
+        from banktools.part1 import part1_question
+        from banktools.render import DIALOGUE_CORE_WORD
+        from banktools.rules import RuleEngine
+
+        rules = RuleEngine.from_file()
+        classifications = rules.classify_many(
+            (item['dialogue1'], item['dialogue2'], item[item['answer']]) for item in items
+        )
+        for name, count in rules.coverage():
+            self.metrics.count('rules', name, count)
+
+        core_words = CoreWordExtractor(open_lexicon(self.config.resources_dir, self.config.lexicon_path))
+        questions = []
+        for number, (item, translation, classification) in enumerate(zip(items, translations, classifications), 1):
+            answer_text = item[item['answer']]
+            words = core_words.extract([item['dialogue1'], item['dialogue2'], answer_text]) or (DIALOGUE_CORE_WORD,)
+            questions.append(part1_question(item, number, translation, classification, words))
+        return questions
+
+    def render(self, questions: Sequence['Question']) -> Tuple[List[str], List['Question']]:
+        """生成全部文本行，同时给每道题填上写盘后的题号行号（校验结果要指向文件中的位置）"""
+        from banktools.render import render_numbered
+
+        lines = ['', '', '']
+        line_number = len(lines) + 1
+        placed = []
+        for question in questions:
+            block = list(render_numbered(question))
+            placed.append(question._replace(source=self.config.bank_path, line=line_number))
+            lines.extend(block)
+            line_number += sum(line.count('\n') + 1 for line in block)
+        return lines, placed
+
+    def verify(self, items: Sequence[Dict[str, str]], questions: Sequence['Question']) -> 'VerifyReport':
+        from banktools.sources import source_question
+        from banktools.verify import verify_records
+
+        originals = [source_question(item) for item in items]
+        _, report = verify_records(questions, originals, self.config.bank_path)
+        for check, count in report.counts().items():
+            self.metrics.count('findings', check, count)
+        return report
+
+    def run(self) -> PipelineResult:
+        metrics = self.metrics
+        with metrics.stage('check'):
+            inputs = self.input_hash()
+            if not self.config.force and self.up_to_date(inputs):
+                return PipelineResult(True, 0, False, None)
+
+        with metrics.stage('extract'):
+            items = self.extract()
+        with metrics.stage('translate'):
+            translations = self.translate(items)
+        with metrics.stage('analyze'):
+            questions = self.analyze(items, translations)
+        with metrics.stage('render'):
+            lines, questions = self.render(questions)
+        with metrics.stage('verify'):
+            report = self.verify(items, questions)
+        # 有试卷没读到时结果不完整，不覆盖现有题库
+        changed = False
+        if not self.unreadable:
+            with metrics.stage('write'):
+                from banktools.writer import write_bank
+
+                result = write_bank(self.config.bank_path, lines)
+                self._save_stamp(inputs, result.sha1)
+            changed = result.changed
+
+        metrics.set('questions', len(questions))
+        metrics.set('changed', changed)
+        return PipelineResult(False, len(questions), changed, report, tuple(self.errors), self.unreadable)
+
+
+def run_pipeline(config: PipelineConfig = PipelineConfig(), metrics=NULL_METRICS) -> PipelineResult:
+    return Pipeline(config, metrics).run()
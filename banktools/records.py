@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+题目记录类型
+
+字段与 App 端 Models/Question.swift 对应；全部用 NamedTuple，
+一道题就是一个元组，不为每题建 dict。两种题库格式解析出的都是 Question。
+"""
+
+import hashlib
+import re
+from typing import NamedTuple, Optional, Tuple
+
+_TAG_END = re.compile(r'[：:，,（(]')
+
+
+class CoreWord(NamedTuple):
+    """核心词：word /phonetic/：explanation"""
+    word: str
+    phonetic: str
+    explanation: str
+    raw: str  # 原始行（去掉前面的 •），用于原样写回
+
+
+class Question(NamedTuple):
+    """一道题"""
+    number: int
+    stem: Tuple[str, ...]          # 原题，每行一项；对话题每行以 '--- ' 开头
+    options: Tuple[Tuple[str, str], ...]  # (('A', '...'), ('B', '...'), ...)
+    answer: str
+    translation: Tuple[str, ...]   # 译文，每行一项
+    key_point: Tuple[str, ...]     # 【考点·高效记忆】
+    analysis: Tuple[str, ...]      # 【解析·秒选思路】
+    core_words: Tuple[CoreWord, ...]
+    verdict: str = '正确'           # 核对结果
+    source: str = ''
+    line: int = 0                  # 题号所在行（从 1 开始）
+    section: str = ''              # 所属试卷段落，如 “2021模拟试题一（31-55题）”
+    pitfall: Tuple[str, ...] = ()  # 易错点提示
+    delimiter: str = ')'           # 选项字母后的分隔符，写回 题目：格式时沿用（如 “A.”）
+
+    @property
+    def dialogue(self) -> Tuple[str, ...]:
+        """原题的对话行（去掉 '--- ' 前缀）"""
+        return tuple(_strip_dash(s) for s in self.stem)
+
+    @property
+    def translated_dialogue(self) -> Tuple[str, ...]:
+        """译文的对话行（去掉 '--- ' 前缀）"""
+        return tuple(_strip_dash(s) for s in self.translation)
+
+    def option(self, letter: str) -> Optional[str]:
+        for key, text in self.options:
+            if key == letter:
+                return text
+        return None
+
+    @property
+    def answer_text(self) -> str:
+        return self.option(self.answer) or ''
+
+
+class ParseIssue(NamedTuple):
+    """解析时发现的格式问题"""
+    source: str
+    line: int
+    number: int  # 所在题号，题号之前的内容为 0
+    message: str
+    code: str = ''  # 问题类别，如 missing_answer，见 banktools/lint.py 的 RULES
+
+    def __str__(self) -> str:
+        where = f'{self.source}:{self.line}' if self.source else f'第{self.line}行'
+        if self.number:
+            return f'{where}: 第{self.number}题 {self.message}'
+        return f'{where}: {self.message}'
+
+
+def _strip_dash(line: str) -> str:
+    if line.startswith('---'):
+        return line[3:].strip()
+    return line
+
+
+def question_key(question: Question) -> str:
+    """题库内唯一的题目键：part3 等分试卷段落的题库各段题号重复，键为“段落:题号”，否则就是题号"""
+    if question.section:
+        return f'{question.section}:{question.number}'
+    return str(question.number)
+
+
+def content_hash(question: Question) -> str:
+    """题目内容的哈希（不含题号、来源和行号），内容不变则哈希不变"""
+    parts = (
+        '\x1e'.join(question.stem),
+        '\x1e'.join(f'{key}\x1d{text}' for key, text in question.options),
+        question.answer,
+        '\x1e'.join(question.translation),
+        '\x1e'.join(question.key_point),
+        '\x1e'.join(question.analysis),
+        '\x1e'.join(word.raw for word in question.core_words),
+        '\x1e'.join(question.pitfall),
+    )
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def key_point_tags(question: Question) -> Tuple[str, ...]:
+    """考点分类标签，取考点首行冒号/逗号/括号之前的部分，按 + 拆分
+
+    例：“考名词词义辨析+固定搭配，口诀：…” → ('名词词义辨析', '固定搭配')
+    """
+    if not question.key_point:
+        return ()
+    head = _TAG_END.split(question.key_point[0], 1)[0].strip()
+    if head.startswith('考'):
+        head = head[1:]
+    return tuple(tag.strip() for tag in head.split('+') if tag.strip())
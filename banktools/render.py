@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+把 Question 写回第N题格式的文本行
+"""
+
+from typing import Iterator
+
+from banktools.records import CoreWord, Question
+
+CORE_WORDS_HEADER = '核心词（音标+拆解记忆）'
+
+# 对话题暂未提取核心词时使用的占位条目
+DIALOGUE_CORE_WORD = CoreWord(
+    'dialogue', '/ˈdaɪəlɒɡ/', 'dia-（两者之间）+ logue（说）→ 对话',
+    'dialogue /ˈdaɪəlɒɡ/：dia-（两者之间）+ logue（说）→ 对话',
+)
+
+
+def render_numbered(question: Question, number: int = 0) -> Iterator[str]:
+    """生成一道题的文本行（不含换行符），number 为 0 时沿用原题号"""
+    yield f'第{number or question.number}题'
+    yield ''
+    for i, line in enumerate(question.stem):
+        yield f'原题：{line}' if i == 0 else f'    {line}'
+    yield '选项：'
+    for letter, text in question.options:
+        yield f'{letter}) {text}'
+    yield f'你的答案：{question.answer}'
+    yield f'核对结果：{question.verdict or "正确"}'
+    for i, line in enumerate(question.translation or ('',)):
+        yield f'译文：{line}' if i == 0 else f'    {line}'
+    yield ''
+    yield '【考点·高效记忆】'
+    yield from question.key_point
+    yield ''
+    yield '【解析·秒选思路】'
+    yield from question.analysis
+    yield ''
+    yield CORE_WORDS_HEADER
+    yield ''
+    for word in question.core_words:
+        yield f'• {word.raw}'
+        yield ''
+
+
+def render_inline(question: Question) -> Iterator[str]:
+    """生成一道题的 题目：/答案： 格式文本行（题号行起，末尾空一行）；选项字母后的分隔符沿用解析时的"""
+    yield str(question.number)
+    yield ''
+    for i, line in enumerate(question.stem):
+        yield f'题目：{line}' if i == 0 else line
+    delimiter = question.delimiter
+    for letter, text in question.options:
+        yield f'{letter}{delimiter} {text}'
+    yield ''
+    yield f'答案：{question.answer}{delimiter} {question.answer_text}'
+    for label, lines in (('译文', question.translation), ('考点·高效记忆', question.key_point),
+                         ('解析·秒选思路', question.analysis), ('易错点提示', question.pitfall)):
+        for i, line in enumerate(lines):
+            yield f'{label}：{line}' if i == 0 else line
+    for word in question.core_words:
+        yield f'核心词：{word.raw}'
+    yield ''
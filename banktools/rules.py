@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+对话题考点/解析的规则引擎
+
+规则放在 banktools/data/analysis_rules.json 里，不再写成 if/elif 链。
+所有规则用到的短语编译成一个 Aho-Corasick 自动机，每个字段的文本只小写一次、扫描一遍，
+就能得到其中出现的全部短语（包括相互重叠的，如 may i help / help you），
+再按优先级找第一条条件全部满足的规则。整套题库一次批量分类，并统计每条规则的命中次数。
+"""
+
+import json
+import os
+from collections import Counter, deque
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Set, Tuple
+
+from banktools.translation import DATA_DIR
+
+ANALYSIS_RULES = os.path.join(DATA_DIR, 'analysis_rules.json')
+
+FIELDS = ('d1', 'd2', 'answer')
+
+
+class Rule(NamedTuple):
+    name: str
+    priority: int
+    when: Tuple[Tuple[str, Tuple[int, ...]], ...]  # (字段, 短语 id) 的合取
+    key_point: str
+    analysis: str
+
+
+class Classification(NamedTuple):
+    rule: str
+    key_point: str
+    analysis: str
+
+
+class PhraseMatcher:
+    """Aho-Corasick：一遍扫描找出文本中出现的所有短语"""
+
+    def __init__(self, phrases: Sequence[str]):
+        self.phrases = list(phrases)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        for pid, phrase in enumerate(self.phrases):
+            state = 0
+            for ch in phrase:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[state][ch] = nxt
+                state = nxt
+            self._out[state] += (pid,)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> Set[int]:
+        """text 应已小写；返回出现过的短语 id"""
+        found: Set[int] = set()
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+class RuleEngine:
+    def __init__(self, rules: Iterable[dict]):
+        phrase_ids: Dict[str, int] = {}
+        compiled = []
+        for spec in rules:
+            when = []
+            for condition in spec.get('when', ()):
+                if condition['field'] not in FIELDS:
+                    raise ValueError(f"规则 {spec['name']}: 未知字段 {condition['field']}")
+                ids = tuple(phrase_ids.setdefault(p.lower(), len(phrase_ids)) for p in condition['any'])
+                when.append((condition['field'], ids))
+            compiled.append(Rule(spec['name'], spec.get('priority', 0), tuple(when),
+                                 spec['key_point'], spec['analysis']))
+        compiled.sort(key=lambda r: r.priority)
+        if not compiled or compiled[-1].when:
+            raise ValueError('最后一条规则（兜底规则）不能有条件')
+        self.rules = compiled
+        self.matcher = PhraseMatcher(sorted(phrase_ids, key=phrase_ids.get))
+        self.hits: Counter = Counter()
+
+    @classmethod
+    def from_file(cls, path: str = ANALYSIS_RULES) -> 'RuleEngine':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f)['rules'])
+
+    def match(self, d1: str, d2: str, answer_text: str) -> Rule:
+        found = {
+            'd1': self.matcher.find(d1.lower()),
+            'd2': self.matcher.find(d2.lower()),
+            'answer': self.matcher.find(answer_text.lower()),
+        }
+        for rule in self.rules:
+            if all(not found[field].isdisjoint(ids) for field, ids in rule.when):
+                return rule
+        return self.rules[-1]
+
+    def classify(self, d1: str, d2: str, answer_text: str) -> Classification:
+        rule = self.match(d1, d2, answer_text)
+        self.hits[rule.name] += 1
+        values = {'answer_text': answer_text, 'd1_head': d1[:30], 'd2_head': d2[:30]}
+        return Classification(rule.name, rule.key_point.format(**values), rule.analysis.format(**values))
+
+    def classify_many(self, items: Iterable[Tuple[str, str, str]]) -> List[Classification]:
+        """批量分类 (第一句, 第二句, 答案文本)"""
+        return [self.classify(d1, d2, answer_text) for d1, d2, answer_text in items]
+
+    def coverage(self) -> List[Tuple[str, int]]:
+        """每条规则（按优先级）的命中次数，包括没有命中的规则"""
+        return [(rule.name, self.hits.get(rule.name, 0)) for rule in self.rules]
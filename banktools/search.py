@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+"""
+题库全文检索
+
+倒排索引建立在解析后的题目上，不依赖各题库的文本格式：
+- 英文按单词切分（小写），中文按相邻两字切分（bigram），单独的一个汉字保留为一个词
+- 索引字段：原题、选项、译文、考点、解析
+- 保存在 SQLite 中；更新时按题库文件哈希跳过没变的题库，变了的题库再按题目内容哈希只增删改动的题
+- 查询：所有词都出现的题目按 BM25 打分排序（各字段加权）
+"""
+
+import math
+import os
+import re
+import sqlite3
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from banktools.cache import file_hash
+from banktools.parser import bank_paths, parse_bank
+from banktools.records import ParseIssue, Question, content_hash
+from banktools.store import bank_name
+
+# 字段名 → 权重
+FIELDS = {
+    '原题': 2.0,
+    '选项': 1.0,
+    '译文': 1.0,
+    '考点': 1.5,
+    '解析': 1.0,
+}
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?|[\u4e00-\u9fff]+")
+_K1 = 1.2
+_B = 0.75
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS banks (
+    name TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    source_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    bank TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    line INTEGER NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fields (
+    doc_id INTEGER NOT NULL,
+    field TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (doc_id, field)
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    field TEXT NOT NULL,
+    tf INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS postings_by_term ON postings(term);
+CREATE INDEX IF NOT EXISTS postings_by_doc ON postings(doc_id);
+CREATE INDEX IF NOT EXISTS docs_by_bank ON docs(bank, content_hash);
+'''
+
+
+class SearchHit(NamedTuple):
+    bank: str
+    number: int
+    line: int
+    score: float
+    fields: Tuple[str, ...]  # 命中的字段
+    snippet: str
+
+
+def tokenize(text: str) -> Iterator[str]:
+    for match in _TOKEN.finditer(text.lower()):
+        token = match.group()
+        if token[0] < '\u4e00':
+            yield token
+        elif len(token) == 1:
+            yield token
+        else:
+            for i in range(len(token) - 1):
+                yield token[i:i + 2]
+
+
+def question_fields(question: Question) -> Dict[str, str]:
+    return {
+        '原题': '\n'.join(question.stem),
+        '选项': '\n'.join(f'{letter}) {text}' for letter, text in question.options),
+        '译文': '\n'.join(question.translation),
+        '考点': '\n'.join(question.key_point),
+        '解析': '\n'.join(question.analysis),
+    }
+
+
+def snippet(text: str, terms: Sequence[str], width: int = 60) -> str:
+    """取包含第一个查询词的那一行"""
+    lowered = text.lower()
+    for term in terms:
+        pos = lowered.find(term)
+        if pos >= 0:
+            start = lowered.rfind('\n', 0, pos) + 1
+            end = lowered.find('\n', pos)
+            line = text[start:end if end >= 0 else len(text)].strip()
+            return line if len(line) <= width else line[:width] + '…'
+    return text.split('\n', 1)[0][:width]
+
+
+class SearchIndex:
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        self.stats = {'banks_skipped': 0, 'added': 0, 'removed': 0, 'moved': 0}
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> 'SearchIndex':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _add(self, bank: str, question: Question, digest: str) -> None:
+        doc_id = self.conn.execute(
+            'INSERT INTO docs (bank, number, line, content_hash) VALUES (?, ?, ?, ?)',
+            (bank, question.number, question.line, digest),
+        ).lastrowid
+        postings = []
+        for field, text in question_fields(question).items():
+            counts = Counter(tokenize(text))
+            self.conn.execute('INSERT INTO fields (doc_id, field, length, text) VALUES (?, ?, ?, ?)',
+                              (doc_id, field, sum(counts.values()), text))
+            postings.extend((term, doc_id, field, tf) for term, tf in counts.items())
+        self.conn.executemany('INSERT INTO postings (term, doc_id, field, tf) VALUES (?, ?, ?, ?)', postings)
+
+    def _remove(self, doc_ids: Sequence[int]) -> None:
+        for table, column in (('postings', 'doc_id'), ('fields', 'doc_id'), ('docs', 'id')):
+            self.conn.executemany(f'DELETE FROM {table} WHERE {column} = ?', ((i,) for i in doc_ids))
+
+    def update_bank(self, path: str, issues: Optional[List[ParseIssue]] = None,
+                    questions: Optional[Iterable[Question]] = None) -> bool:
+        """题库文件有变化时增量更新，返回是否有变化
+
+        questions 为调用方已解析好的题目（如监视模式），给出时不再重新解析文件。
+        """
+        name = bank_name(path)
+        digest = file_hash(path)
+        row = self.conn.execute('SELECT source_hash FROM banks WHERE name = ?', (name,)).fetchone()
+        if row and row[0] == digest:
+            self.stats['banks_skipped'] += 1
+            return False
+
+        # 同一内容的题可能出现多次，按内容哈希分组后逐个配对
+        existing: Dict[str, List[Tuple[int, int, int]]] = defaultdict(list)
+        for doc_id, number, line, h in self.conn.execute(
+                'SELECT id, number, line, content_hash FROM docs WHERE bank = ? ORDER BY id', (name,)):
+            existing[h].append((doc_id, number, line))
+
+        with self.conn:
+            for question in parse_bank(path, issues) if questions is None else questions:
+                h = content_hash(question)
+                if existing.get(h):
+                    doc_id, number, line = existing[h].pop(0)
+                    if (number, line) != (question.number, question.line):
+                        self.conn.execute('UPDATE docs SET number = ?, line = ? WHERE id = ?',
+                                          (question.number, question.line, doc_id))
+                        self.stats['moved'] += 1
+                else:
+                    self._add(name, question, h)
+                    self.stats['added'] += 1
+            stale = [doc_id for docs in existing.values() for doc_id, _, _ in docs]
+            self._remove(stale)
+            self.stats['removed'] += len(stale)
+            self.conn.execute('INSERT OR REPLACE INTO banks (name, path, source_hash) VALUES (?, ?, ?)',
+                              (name, os.path.abspath(path), digest))
+        return True
+
+    def patch_bank(self, path: str, digest: str, removed: Iterable[Question], added: Iterable[Question],
+                   moved: Iterable[Tuple[int, Question]] = (), after_line: int = 0, line_delta: int = 0) -> None:
+        """按调用方算好的改动更新一个题库（监视模式）
+
+        removed 中的旧题（行号为改动前的行号）删除，added 中的新题加入，
+        moved 中的 (改动前的行号, 题目) 只改行号；改动前第 after_line 行之后的其余题整体平移 line_delta 行。
+        """
+        name = bank_name(path)
+
+        def find(line: int, question: Question) -> Optional[int]:
+            row = self.conn.execute('SELECT id FROM docs WHERE bank = ? AND line = ? AND content_hash = ?',
+                                    (name, line, content_hash(question))).fetchone()
+            return row[0] if row else None
+
+        with self.conn:
+            stale = [doc_id for doc_id in (find(q.line, q) for q in removed) if doc_id is not None]
+            # 先按旧行号找齐，再改，免得改过的行号与后面要找的旧行号撞上
+            moves = [(q.number, q.line, find(line, q)) for line, q in moved]
+            self._remove(stale)
+            self.stats['removed'] += len(stale)
+            if line_delta:
+                shifted = self.conn.execute('UPDATE docs SET line = line + ? WHERE bank = ? AND line > ?',
+                                            (line_delta, name, after_line)).rowcount
+                self.stats['moved'] += shifted
+            self.conn.executemany('UPDATE docs SET number = ?, line = ? WHERE id = ?',
+                                  [move for move in moves if move[2] is not None])
+            self.stats['moved'] += len(moves)
+            for question in added:
+                self._add(name, question, content_hash(question))
+                self.stats['added'] += 1
+            self.conn.execute('INSERT OR REPLACE INTO banks (name, path, source_hash) VALUES (?, ?, ?)',
+                              (name, os.path.abspath(path), digest))
+
+    def update(self, paths: Iterable[str], issues: Optional[List[ParseIssue]] = None) -> None:
+        """索引 paths 中的题库，并删除已不存在的题库"""
+        names = set()
+        for path in paths:
+            names.add(bank_name(path))
+            self.update_bank(path, issues)
+        gone = [name for name, in self.conn.execute('SELECT name FROM banks') if name not in names]
+        with self.conn:
+            for name in gone:
+                self._remove([doc_id for doc_id, in self.conn.execute('SELECT id FROM docs WHERE bank = ?', (name,))])
+                self.conn.execute('DELETE FROM banks WHERE name = ?', (name,))
+
+    def update_resources(self, resources_dir: str, issues: Optional[List[ParseIssue]] = None) -> None:
+        self.update(bank_paths(resources_dir), issues)
+
+    def __len__(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM docs').fetchone()[0]
+
+    def search(self, query: str, limit: int = 10, fields: Optional[Sequence[str]] = None,
+               bank: Optional[str] = None) -> List[SearchHit]:
+        """所有查询词都命中的题目，按 BM25 得分降序"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        fields = list(fields or FIELDS)
+        field_marks = ','.join('?' * len(fields))
+        total = len(self)
+        avg_length = dict(self.conn.execute(
+            f'SELECT field, AVG(length) FROM fields WHERE field IN ({field_marks}) GROUP BY field', fields))
+
+        # 每个词的命中：doc_id → [(field, tf)]
+        postings: Dict[str, Dict[int, List[Tuple[str, int]]]] = {}
+        for term in terms:
+            sql = (f'SELECT p.doc_id, p.field, p.tf FROM postings p'
+                   f' WHERE p.term = ? AND p.field IN ({field_marks})')
+            params: List = [term, *fields]
+            if bank is not None:
+                sql += ' AND p.doc_id IN (SELECT id FROM docs WHERE bank = ?)'
+                params.append(bank)
+            hits: Dict[int, List[Tuple[str, int]]] = defaultdict(list)
+            for doc_id, field, tf in self.conn.execute(sql, params):
+                hits[doc_id].append((field, tf))
+            if not hits:
+                return []
+            postings[term] = hits
+
+        candidates = set.intersection(*(set(hits) for hits in postings.values()))
+        if not candidates:
+            return []
+        lengths: Dict[Tuple[int, str], int] = {}
+        doc_marks = ','.join('?' * len(candidates))
+        for doc_id, field, length in self.conn.execute(
+                f'SELECT doc_id, field, length FROM fields WHERE doc_id IN ({doc_marks})', list(candidates)):
+            lengths[doc_id, field] = length
+
+        scores: Dict[int, float] = defaultdict(float)
+        matched: Dict[int, set] = defaultdict(set)
+        for term, hits in postings.items():
+            df = len(hits)
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for doc_id in candidates:
+                for field, tf in hits[doc_id]:
+                    norm = 1 - _B + _B * lengths.get((doc_id, field), 0) / (avg_length.get(field) or 1)
+                    scores[doc_id] += FIELDS.get(field, 1.0) * idf * tf * (_K1 + 1) / (tf + _K1 * norm)
+                    matched[doc_id].add(field)
+
+        ranked = sorted(scores.items(), key=lambda item: -item[1])[:limit]
+        results = []
+        for doc_id, score in ranked:
+            bank_name_, number, line = self.conn.execute(
+                'SELECT bank, number, line FROM docs WHERE id = ?', (doc_id,)).fetchone()
+            hit_fields = tuple(f for f in FIELDS if f in matched[doc_id])
+            text = self.conn.execute('SELECT text FROM fields WHERE doc_id = ? AND field = ?',
+                                     (doc_id, hit_fields[0])).fetchone()[0]
+            results.append(SearchHit(bank_name_, number, line, score, hit_fields, snippet(text, terms)))
+        return results
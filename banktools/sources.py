@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+原始试卷的 Part I 抽取
+
+regenerate_part1_complete.py、verify_part1.py 和流水线共用同一份抽取逻辑。
+每道题抽成一个 dict：num、dialogue1、dialogue2、A-D、answer，可直接 JSON 缓存。
+
+试卷用 mmap 打开，向前扫描一遍找出所有 **Part N 标题，得到每一节的字节区间；
+只有 Part I 的区间交给题目解析器。区间先按“N. ---”题号行切成一道道题，
+每道题内部按 第一句 → 第二句 → A-D → 答案 的顺序各找一次分隔标记。
+不再用 DOTALL 的懒惰正则在整份试卷上回溯：内存只与单道题的长度有关，耗时与文件大小成线性，
+某道题格式有误时只跳过这一题并记入 issues，不会把后面的题吞进来。
+"""
+
+import mmap
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from banktools.records import ParseIssue, Question
+
+_HEADER_MARK = b'**Part'
+_HEADER = re.compile(rb'\*\*Part\s+([IVX]+)\b([^\r\n]*)')
+_QUESTION_LINE = re.compile(rb'^[ \t]*((\d+)\.\s*---)', re.MULTILINE)
+_QUESTION_START = re.compile(r'(\d+)\.\s*---')
+_OPTION_MARKS = tuple(re.compile(letter + r'[).]') for letter in 'ABCD')
+_ANSWER = re.compile(r'答案[：:]\s*([A-D])')
+_COUNT_CHUNK = 1 << 20
+
+
+class Section(NamedTuple):
+    part: str    # 罗马数字：I、II、III ...
+    title: str   # 标题行（去掉 ** 和首尾空白）
+    start: int   # 标题的字节偏移
+    end: int     # 下一节标题（或文件末尾）的字节偏移
+    line: int    # 标题所在行（从 1 开始）
+
+
+def _count_lines(buffer: mmap.mmap, start: int, end: int) -> int:
+    """按块统计 [start, end) 中的换行数，不复制整段"""
+    count = 0
+    for offset in range(start, end, _COUNT_CHUNK):
+        count += buffer[offset:min(offset + _COUNT_CHUNK, end)].count(b'\n')
+    return count
+
+
+def _scan_sections(buffer: mmap.mmap) -> Iterator[Section]:
+    headers: List[Tuple[int, str, str]] = []
+    pos = buffer.find(_HEADER_MARK)
+    while pos >= 0:
+        match = _HEADER.match(buffer, pos)
+        if match:
+            title = match.group(0).decode('utf-8', 'replace').replace('**', '').strip()
+            headers.append((pos, match.group(1).decode('ascii'), title))
+            pos = match.end()
+        else:
+            pos += len(_HEADER_MARK)
+        pos = buffer.find(_HEADER_MARK, pos)
+
+    line, counted = 1, 0
+    for i, (start, part, title) in enumerate(headers):
+        line += _count_lines(buffer, counted, start)
+        counted = start
+        end = headers[i + 1][0] if i + 1 < len(headers) else len(buffer)
+        yield Section(part, title, start, end, line)
+
+
+def iter_sections(path: str) -> Iterator[Section]:
+    """一遍扫描列出试卷中所有 **Part N 节"""
+    with open(path, 'rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # 空文件
+            return
+        with buffer:
+            yield from _scan_sections(buffer)
+
+
+def _question_chunks(buffer: mmap.mmap, section: Section) -> Iterator[Tuple[int, str]]:
+    """把一节按题号行切块，逐块给出（题号所在行, 该题全文）"""
+    line, counted = section.line, section.start
+    previous = -1
+    for match in _QUESTION_LINE.finditer(buffer, section.start, section.end):
+        start = match.start(1)
+        if previous >= 0:
+            chunk = buffer[previous:start]
+            yield line, chunk.decode('utf-8')
+            line += chunk.count(b'\n')
+        else:
+            line += _count_lines(buffer, counted, start)
+        previous = start
+    if previous >= 0:
+        yield line, buffer[previous:section.end].decode('utf-8')
+
+
+def _parse_question(text: str) -> Optional[Dict[str, str]]:
+    """解析一道题的全文（从题号开始）；格式不完整时返回 None"""
+    start = _QUESTION_START.match(text)
+    if not start:
+        return None
+    pos = start.end()
+    second = text.find('---', pos)
+    if second < 0:
+        return None
+    fields = {'num': start.group(1), 'dialogue1': text[pos:second].strip()}
+    pos = second + 3
+    for key, mark in zip(('dialogue2', 'A', 'B', 'C'), _OPTION_MARKS):
+        match = mark.search(text, pos)
+        if not match:
+            return None
+        fields[key] = text[pos:match.start()].strip()
+        pos = match.end()
+    answer = _ANSWER.search(text, pos)
+    if not answer:
+        return None
+    option_d = text[pos:answer.start()]
+    if option_d.endswith('**'):
+        option_d = option_d[:-2]
+    fields['D'] = option_d.strip()
+    fields['answer'] = answer.group(1)
+    return fields
+
+
+def parse_part1(chunks: Iterable[Tuple[int, str]], source: str = '',
+                issues: Optional[List[ParseIssue]] = None) -> Iterator[Dict[str, str]]:
+    """逐题解析（题号所在行, 该题全文）"""
+    for line, text in chunks:
+        fields = _parse_question(text)
+        if fields is not None:
+            yield fields
+        elif issues is not None:
+            number = int(_QUESTION_START.match(text).group(1))
+            issues.append(ParseIssue(source, line, number, '题目不完整（缺少对话、选项或答案）',
+                                     'incomplete_question'))
+
+
+def extract_part1(path: str, issues: Optional[List[ParseIssue]] = None) -> List[Dict[str, str]]:
+    """抽取一份试卷所有 Part I 节的全部题目；没有 Part I 时返回空列表"""
+    extracted: List[Dict[str, str]] = []
+    with open(path, 'rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # 空文件
+            return extracted
+        with buffer:
+            for section in _scan_sections(buffer):
+                if section.part == 'I':
+                    extracted.extend(parse_part1(_question_chunks(buffer, section), path, issues))
+    return extracted
+
+
+def source_question(item: Dict[str, str], number: int = 0) -> Question:
+    """抽取结果转成 Question（译文、考点等留空），number 为 0 时用试卷中的题号"""
+    return Question(
+        number=number or int(item['num']),
+        stem=(f"--- {item['dialogue1']}", f"--- {item['dialogue2']}"),
+        options=tuple((letter, item[letter]) for letter in 'ABCD'),
+        answer=item['answer'],
+        translation=(),
+        key_point=(),
+        analysis=(),
+        core_words=(),
+    )
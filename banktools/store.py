@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+题库编译：resources/ 下所有题库 → 一个带索引的 SQLite 文件
+
+App 启动时不必再把几十 KB 的文本逐行解析一遍，只需按 id 读取需要的题。
+每题的 payload 是与 Models/Question.swift 字段一致的 JSON，可直接用 Codable 解码。
+
+表结构：
+- banks(id, name, source_hash, questions)
+- sections(id, bank_id, name)
+- questions(id, bank_id, section_id, number, line, answer, content_hash, payload)
+- key_points(tag, question_id)  考点标签索引
+"""
+
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from banktools.cache import file_hash
+from banktools.parser import bank_paths, parse_bank
+from banktools.records import ParseIssue, Question, content_hash, key_point_tags
+
+SCHEMA = '''
+CREATE TABLE banks (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    source_hash TEXT NOT NULL,
+    questions INTEGER NOT NULL
+);
+CREATE TABLE sections (
+    id INTEGER PRIMARY KEY,
+    bank_id INTEGER NOT NULL REFERENCES banks(id),
+    name TEXT NOT NULL
+);
+CREATE TABLE questions (
+    id INTEGER PRIMARY KEY,
+    bank_id INTEGER NOT NULL REFERENCES banks(id),
+    section_id INTEGER NOT NULL REFERENCES sections(id),
+    number INTEGER NOT NULL,
+    line INTEGER NOT NULL,
+    answer TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE TABLE key_points (
+    tag TEXT NOT NULL,
+    question_id INTEGER NOT NULL REFERENCES questions(id)
+);
+CREATE INDEX questions_by_section ON questions(section_id, number);
+CREATE INDEX questions_by_bank ON questions(bank_id, number);
+CREATE INDEX questions_by_hash ON questions(content_hash);
+CREATE INDEX key_points_by_tag ON key_points(tag, question_id);
+'''
+
+
+def bank_name(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def question_payload(question: Question, position: int) -> Dict[str, Any]:
+    """与 App 端 Question 结构一致的字典
+
+    id 是题目在题库中的位置（从 1 开始）：part3 等题库分几段，各段题号重复，题号不能作 Identifiable 的 id。
+    """
+    return {
+        'id': position,
+        'questionNumber': f'第{question.number}题',
+        'questionText': '\n'.join(question.stem),
+        'options': dict(question.options),
+        'correctAnswer': question.answer,
+        'translation': '\n'.join(question.translation),
+        'keyPoint': '\n'.join(question.key_point),
+        'analysis': '\n'.join(question.analysis),
+        'coreWords': [
+            {'word': w.word, 'phonetic': w.phonetic, 'explanation': w.explanation}
+            for w in question.core_words
+        ],
+    }
+
+
+def compile_banks(paths: Iterable[str], out_path: str,
+                  issues: Optional[List[ParseIssue]] = None) -> Dict[str, int]:
+    """把题库编译成 SQLite，返回 {题库名: 题数}
+
+    先写临时文件再改名，编译中断不会留下半成品，失败时临时文件也会删掉。
+    """
+    tmp_path = out_path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    counts: Dict[str, int] = {}
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SCHEMA)
+        for path in paths:
+            name = bank_name(path)
+            bank_id = conn.execute(
+                'INSERT INTO banks (name, source_hash, questions) VALUES (?, ?, 0)',
+                (name, file_hash(path)),
+            ).lastrowid
+            sections: Dict[str, int] = {}
+            count = 0
+            for question in parse_bank(path, issues):
+                section_id = sections.get(question.section)
+                if section_id is None:
+                    section_id = conn.execute(
+                        'INSERT INTO sections (bank_id, name) VALUES (?, ?)',
+                        (bank_id, question.section),
+                    ).lastrowid
+                    sections[question.section] = section_id
+                question_id = conn.execute(
+                    'INSERT INTO questions (bank_id, section_id, number, line, answer, content_hash, payload)'
+                    ' VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (bank_id, section_id, question.number, question.line, question.answer,
+                     content_hash(question),
+                     json.dumps(question_payload(question, count + 1), ensure_ascii=False, separators=(',', ':'))),
+                ).lastrowid
+                conn.executemany(
+                    'INSERT INTO key_points (tag, question_id) VALUES (?, ?)',
+                    ((tag, question_id) for tag in key_point_tags(question)),
+                )
+                count += 1
+            conn.execute('UPDATE banks SET questions = ? WHERE id = ?', (count, bank_id))
+            counts[name] = count
+        conn.commit()
+        conn.close()
+        os.replace(tmp_path, out_path)
+    finally:
+        conn.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return counts
+
+
+def compile_resources(resources_dir: str, out_path: str,
+                      issues: Optional[List[ParseIssue]] = None) -> Dict[str, int]:
+    return compile_banks(bank_paths(resources_dir), out_path, issues)
+
+
+class QuestionStore:
+    """编译产物的只读访问，按 id 懒加载题目"""
+
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> 'QuestionStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def banks(self) -> List[Tuple[str, int]]:
+        return self.conn.execute('SELECT name, questions FROM banks ORDER BY id').fetchall()
+
+    def sections(self, bank: str) -> List[str]:
+        rows = self.conn.execute(
+            'SELECT s.name FROM sections s JOIN banks b ON b.id = s.bank_id WHERE b.name = ? ORDER BY s.id',
+            (bank,),
+        )
+        return [name for name, in rows]
+
+    def key_points(self) -> List[Tuple[str, int]]:
+        """全部考点标签及题数，按题数降序"""
+        return self.conn.execute(
+            'SELECT tag, COUNT(*) FROM key_points GROUP BY tag ORDER BY COUNT(*) DESC, tag'
+        ).fetchall()
+
+    def ids(self, bank: Optional[str] = None, section: Optional[str] = None,
+            key_point: Optional[str] = None) -> List[int]:
+        """按题库 / 试卷段落 / 考点标签筛选题目 id"""
+        sql = ['SELECT q.id FROM questions q JOIN banks b ON b.id = q.bank_id'
+               ' JOIN sections s ON s.id = q.section_id']
+        where, params = [], []
+        if key_point is not None:
+            sql.append('JOIN key_points k ON k.question_id = q.id')
+            where.append('k.tag = ?')
+            params.append(key_point)
+        if bank is not None:
+            where.append('b.name = ?')
+            params.append(bank)
+        if section is not None:
+            where.append('s.name = ?')
+            params.append(section)
+        if where:
+            sql.append('WHERE ' + ' AND '.join(where))
+        sql.append('ORDER BY q.id')
+        return [qid for qid, in self.conn.execute(' '.join(sql), params)]
+
+    def get(self, question_id: int) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute('SELECT payload FROM questions WHERE id = ?', (question_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def content_hash(self, question_id: int) -> Optional[str]:
+        row = self.conn.execute('SELECT content_hash FROM questions WHERE id = ?', (question_id,)).fetchone()
+        return row[0] if row else None
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+合成题库（用于基准测试）
+
+按随机种子生成任意规模、结构与真实题库一致的题目，两种格式都支持：
+- numbered：第N题 格式（对话题，同 part-I.txt）
+- inline：题目：/答案： 格式（词汇语法题，同 part3-2024-75.txt），每 25 题一个试卷段落
+
+同样的种子和规模总是得到同样的文件，基准结果可以和保存的基线比较。
+"""
+
+import random
+from typing import Iterator, List
+
+from banktools.records import CoreWord, Question
+from banktools.render import render_inline, render_numbered
+from banktools.writer import write_bank
+
+LAYOUTS = ('numbered', 'inline')
+SYNTH_VERSION = 1  # 生成规则改变时递增
+
+_OPENERS = [
+    'Would you like', 'Will you', 'Do you think', 'May I help you with', 'Would you mind',
+    'Thank you for', "I'm sorry about", 'Can you speak about', 'What do you like about', 'Have you seen',
+]
+_OBJECTS = [
+    'the new library', 'my graduation ceremony', 'a cup of coffee', 'the leather jacket',
+    'the English examination', 'the subway station', 'your summer holiday', 'the marathon race',
+    'the birthday party', 'the science museum', 'the weather report', 'the grammar lesson',
+]
+_REPLIES = [
+    "Yes, I'd love to.", "No, thanks.", "I don't think so.", "Not at all.", "It doesn't matter.",
+    "That's very kind of you.", "It's my pleasure.", "A little.", "Here you are.", "Sounds great.",
+]
+_SUBJECTS = ['The professor', 'My neighbour', 'The company', 'Our teacher', 'The young scientist', 'Peter']
+_VERBS = ['insisted', 'suggested', 'denied', 'admitted', 'regretted', 'remembered']
+_PHRASES = [
+    'regardless of the weather', 'in spite of the difficulties', 'on account of the delay',
+    'in terms of the cost', 'with regard to the plan', 'by means of hard work',
+]
+_WORDS = [
+    ('regardless', '/rɪˈɡɑːdləs/', 're-（相反）+ gard（注意）+ -less（无）→ 不顾'),
+    ('graduation', '/ˌɡrædʒuˈeɪʃn/', 'graduate（毕业）+ -ion → 毕业典礼'),
+    ('ceremony', '/ˈserəməni/', 'cere（神圣）+ -mony → 典礼'),
+    ('distinguish', '/dɪˈstɪŋɡwɪʃ/', 'dis-（分开）+ stingu（刺）+ -ish → 区分'),
+    ('promote', '/prəˈməʊt/', 'pro-（向前）+ mote（移动）→ 促进'),
+    ('interrupt', '/ˌɪntəˈrʌpt/', 'inter-（之间）+ rupt（断）→ 打断'),
+]
+_CJK = '的一是在不了有和人这中大为上个国我以要他时来用们生到作地于出就分对成会可主发年动同工也能下过子说产种面而方后多定行学法所民得经'
+
+
+def _chinese(rng: random.Random, length: int) -> str:
+    return ''.join(rng.choice(_CJK) for _ in range(length)) + '。'
+
+
+def _core_words(rng: random.Random) -> tuple:
+    words = []
+    for word, phonetic, explanation in rng.sample(_WORDS, rng.randint(1, 2)):
+        words.append(CoreWord(word, phonetic, explanation, f'{word} {phonetic}：{explanation}'))
+    return tuple(words)
+
+
+def _options(rng: random.Random, pool: List[str]) -> tuple:
+    return tuple(zip('ABCD', rng.sample(pool, 4)))
+
+
+def synthetic_question(rng: random.Random, number: int, layout: str) -> Question:
+    if layout == 'numbered':
+        d1 = f'{rng.choice(_OPENERS)} {rng.choice(_OBJECTS)}?'
+        options = _options(rng, _REPLIES)
+        answer = rng.choice('ABCD')
+        stem = (f'--- {d1}', '--- __________')
+        translation = (f'--- {_chinese(rng, 12)}', f'--- {_chinese(rng, 8)}')
+        pitfall = ()
+    else:
+        options = _options(rng, _PHRASES)
+        answer = rng.choice('ABCD')
+        stem = (f'{rng.choice(_SUBJECTS)} {rng.choice(_VERBS)} going on ________ {rng.randint(1, 9999)}.',)
+        translation = (_chinese(rng, 20),)
+        pitfall = (_chinese(rng, 16),)
+    return Question(
+        number=number,
+        stem=stem,
+        options=options,
+        answer=answer,
+        translation=translation,
+        key_point=(f'考{_chinese(rng, 6)}，口诀：{_chinese(rng, 10)}',),
+        analysis=(f'看到“{dict(options)[answer]}”→ {_chinese(rng, 14)}→ 选{answer}。',),
+        core_words=_core_words(rng),
+        pitfall=pitfall,
+    )
+
+
+def synthetic_questions(count: int, layout: str = 'numbered', seed: int = 0) -> Iterator[Question]:
+    if layout not in LAYOUTS:
+        raise ValueError(f'未知格式 {layout}')
+    rng = random.Random(f'{layout}:{seed}')
+    for i in range(count):
+        # inline 格式每个试卷段落 25 题，题号在段落内从 1 开始
+        number = i + 1 if layout == 'numbered' else i % 25 + 1
+        yield synthetic_question(rng, number, layout)
+
+
+def synthetic_lines(count: int, layout: str = 'numbered', seed: int = 0) -> Iterator[str]:
+    if layout == 'numbered':
+        yield from ('', '', '')
+        for question in synthetic_questions(count, layout, seed):
+            yield from render_numbered(question)
+        return
+    yield f'合成题库（共{count}题）'
+    yield ''
+    for i, question in enumerate(synthetic_questions(count, layout, seed)):
+        if i % 25 == 0:
+            yield f'合成试卷{i // 25 + 1}'
+            yield ''
+        yield from render_inline(question)
+
+
+def write_synthetic_bank(path: str, count: int, layout: str = 'numbered', seed: int = 0) -> None:
+    write_bank(path, synthetic_lines(count, layout, seed))
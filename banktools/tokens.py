@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+"""
+预先算好的单词位置表（供 App 选词、高亮使用）
+
+App 每次显示一道题都要在原题、选项、译文里现找单词（SelectableTextWithMenu 的 wordAt），
+加入单词本、高亮核心词时还要再做一遍。这里在构建时把每道题的英文单词一次切好：
+每个单词记 (起点, 终点, 原形序号, 标志)，起止位置是 UTF-16 偏移（与 NSString 一致），
+原形是小写的词典形式，标志里有所在字段和是否为本题核心词。运行时选词、高亮都只是查表。
+
+文件格式（build/tokens.bin，整数都是本机字节序的 u32，直接 cast 成 memoryview 使用）：
+    b'EHTK' | 版本 | 题数 q | 单词数 t | 原形数 m | 元数据长度 | 指纹 40 字节（来源文件的 sha1）
+    题目表 (q + 1) 项：每题第一个单词的序号
+    单词表 t × 4 项：起点、终点、原形序号、标志（字段 << 1 | 核心词）
+    原形偏移表 (m + 1) 项，原形区：按字节序排好的小写原形
+    元数据 JSON：各题库的题目范围、试卷段落、每题的 (段落序号, 题号)
+"""
+
+import json
+import mmap
+import os
+import struct
+from array import array
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from banktools.cache import file_hash, record_hash
+from banktools.lexicon import BASIC_WORDS, WORD, Lexicon, lemma_candidates, lexicon_sources, load_word_list
+from banktools.parser import bank_paths, parse_bank
+from banktools.records import Question
+from banktools.store import bank_name
+
+# 字段：原题、四个选项、译文；文本与 store.question_payload 中的 questionText / options / translation 相同
+FIELDS = ('原题', '选项A', '选项B', '选项C', '选项D', '译文')
+CORE = 1
+
+_MAGIC = b'EHTK'
+_VERSION = 1
+_HEADER = struct.Struct('<4sIIIII40s')
+
+
+class TokenSpan(NamedTuple):
+    field: str
+    start: int   # UTF-16 偏移
+    end: int
+    lemma: str
+    core: bool
+
+
+def question_texts(question: Question) -> List[Tuple[int, str]]:
+    """(字段序号, 文本)，文本与 App 中显示的一致"""
+    texts = [(0, '\n'.join(question.stem))]
+    options = dict(question.options)
+    texts.extend((1 + i, options[letter]) for i, letter in enumerate('ABCD') if letter in options)
+    texts.append((5, '\n'.join(question.translation)))
+    return texts
+
+
+def utf16_offsets(text: str) -> Optional[List[int]]:
+    """每个字符的 UTF-16 偏移；没有 BMP 以外的字符时返回 None（偏移就是下标）"""
+    if all(ord(ch) < 0x10000 for ch in text):
+        return None
+    offsets = [0]
+    for ch in text:
+        offsets.append(offsets[-1] + (2 if ord(ch) >= 0x10000 else 1))
+    return offsets
+
+
+class Lemmatizer:
+    """单词 → 小写原形：本身就在词表或基础词表里的不变（his 不会变成 hi），
+    否则取词形还原候选中先在词表、再在基础词表里出现的，都没有就是小写的原词"""
+
+    def __init__(self, lexicon: Optional[Lexicon] = None, basic_words: Optional[Set[str]] = None):
+        self.lexicon = lexicon
+        self.basic_words = load_word_list() if basic_words is None else basic_words
+        self._cache: Dict[str, str] = {}
+
+    def __call__(self, word: str) -> str:
+        lemma = self._cache.get(word)
+        if lemma is None:
+            candidates = lemma_candidates(word)
+            known = [self.basic_words.__contains__]
+            if self.lexicon is not None:
+                known.insert(0, self.lexicon.__contains__)
+            if any(check(candidates[0]) for check in known):
+                lemma = candidates[0]
+            else:
+                lemma = next((c for check in known for c in candidates[1:] if check(c)), candidates[0])
+            self._cache[word] = lemma
+        return lemma
+
+
+def tokenize_question(question: Question, lemmatize: Lemmatizer) -> Iterator[Tuple[int, int, str, int]]:
+    """一道题的全部单词：(起点, 终点, 原形, 标志)"""
+    core = {w.word.lower() for w in question.core_words}
+    for field, text in question_texts(question):
+        offsets = utf16_offsets(text)
+        for match in WORD.finditer(text):
+            word = match.group()
+            lemma = lemmatize(word)
+            flag = CORE if core.intersection(lemma_candidates(word)) or lemma in core else 0
+            start, end = match.span()
+            if offsets is not None:
+                start, end = offsets[start], offsets[end]
+            yield start, end, lemma, field << 1 | flag
+
+
+def token_fingerprint(resources_dir: str) -> str:
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = [file_hash(os.path.join(here, name)) for name in ('tokens.py', 'lexicon.py', 'parser.py')]
+    return record_hash([file_hash(p) for p in lexicon_sources(resources_dir) + [BASIC_WORDS]] + code)
+
+
+def compile_tokens(paths: Iterable[str], out_path: str, lemmatize: Lemmatizer, fingerprint: str = '') -> int:
+    """把题库的单词位置写成二进制表（先写临时文件再改名），返回单词数"""
+    starts = array('I', [0])
+    raw: List[Tuple[int, int, str, int]] = []
+    banks: Dict[str, List[int]] = {}
+    sections: Dict[str, int] = {}
+    numbers: List[List[int]] = []
+    for path in paths:
+        first = len(numbers)
+        for question in parse_bank(path):
+            raw.extend(tokenize_question(question, lemmatize))
+            starts.append(len(raw))
+            numbers.append([sections.setdefault(question.section, len(sections)), question.number])
+        banks[bank_name(path)] = [first, len(numbers) - first]
+
+    lemmas = sorted({lemma.encode('utf-8') for _, _, lemma, _ in raw})
+    lemma_ids = {lemma.decode('utf-8'): i for i, lemma in enumerate(lemmas)}
+    spans = array('I')
+    for start, end, lemma, flags in raw:
+        spans.extend((start, end, lemma_ids[lemma], flags))
+    lemma_offsets = array('I', [0])
+    for lemma in lemmas:
+        lemma_offsets.append(lemma_offsets[-1] + len(lemma))
+    if spans.itemsize != 4:
+        raise RuntimeError('array("I") 不是 4 字节')
+    meta = json.dumps({'banks': banks, 'sections': list(sections), 'numbers': numbers},
+                      ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(numbers), len(raw), len(lemmas), len(meta),
+                             fingerprint.encode('ascii').ljust(40)[:40]))
+        f.write(starts.tobytes())
+        f.write(spans.tobytes())
+        f.write(lemma_offsets.tobytes())
+        f.writelines(lemmas)
+        f.write(meta)
+    os.replace(tmp_path, out_path)
+    return len(raw)
+
+
+class TokenTable:
+    """编译好的单词位置表（只读，mmap）
+
+    题目用全局序号表示（题库按编译顺序排列，题库内按题目顺序），
+    由 question(bank, number, section) 或 bank_range(bank) 得到。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, questions, spans, lemmas, meta_len, fingerprint = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self._mm.close()
+            raise ValueError(f'{path} 不是单词位置表')
+        self.questions = questions
+        self.span_count = spans
+        self.fingerprint = fingerprint.decode('ascii').strip()
+        view = memoryview(self._mm)
+        pos = _HEADER.size
+        self._starts = view[pos:pos + 4 * (questions + 1)].cast('I')
+        pos += 4 * (questions + 1)
+        self._spans = view[pos:pos + 16 * spans].cast('I')
+        pos += 16 * spans
+        self._lemma_offsets = view[pos:pos + 4 * (lemmas + 1)].cast('I')
+        pos += 4 * (lemmas + 1)
+        self._lemma_data = pos
+        self.lemma_count = lemmas
+        pos += self._lemma_offsets[lemmas]
+        self.meta = json.loads(self._mm[pos:pos + meta_len].decode('utf-8'))
+        self._view = view
+        self._positions: Optional[Dict[Tuple[str, str, int], int]] = None
+
+    def close(self) -> None:
+        for view in (self._starts, self._spans, self._lemma_offsets, self._view):
+            view.release()
+        self._mm.close()
+
+    def __enter__(self) -> 'TokenTable':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.questions
+
+    # ---- 原形 ----
+
+    def lemma(self, lemma_id: int) -> str:
+        start = self._lemma_data + self._lemma_offsets[lemma_id]
+        return self._mm[start:self._lemma_data + self._lemma_offsets[lemma_id + 1]].decode('utf-8')
+
+    def lemma_id(self, lemma: str) -> Optional[int]:
+        """原形的序号（原形按字节序排列，二分查找）"""
+        key = lemma.lower().encode('utf-8')
+        lo, hi = 0, self.lemma_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = self._lemma_data + self._lemma_offsets[mid]
+            if self._mm[start:self._lemma_data + self._lemma_offsets[mid + 1]] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.lemma_count and self.lemma(lo).encode('utf-8') == key:
+            return lo
+        return None
+
+    # ---- 题目 ----
+
+    def bank_range(self, bank: str) -> range:
+        first, count = self.meta['banks'].get(bank, (0, 0))
+        return range(first, first + count)
+
+    def question(self, bank: str, number: int, section: str = '') -> Optional[int]:
+        """按题库、试卷段落和题号找到题目序号（段落内题号重复时取第一道）"""
+        if self._positions is None:
+            self._positions = {}
+            sections = self.meta['sections']
+            for name, (first, count) in self.meta['banks'].items():
+                for i in range(first, first + count):
+                    s, n = self.meta['numbers'][i]
+                    self._positions.setdefault((name, sections[s], n), i)
+        return self._positions.get((bank, section, number))
+
+    def _span(self, i: int) -> TokenSpan:
+        start, end, lemma_id, flags = self._spans[4 * i:4 * i + 4]
+        return TokenSpan(FIELDS[flags >> 1], start, end, self.lemma(lemma_id), bool(flags & CORE))
+
+    def _range(self, question: int, field: Optional[str] = None) -> range:
+        lo, hi = self._starts[question], self._starts[question + 1]
+        if field is None:
+            return range(lo, hi)
+        # 同一题内按字段顺序排列，二分找出这个字段的一段
+        code = FIELDS.index(field)
+
+        def first_at_least(target: int) -> int:
+            a, b = lo, hi
+            while a < b:
+                mid = (a + b) // 2
+                if self._spans[4 * mid + 3] >> 1 < target:
+                    a = mid + 1
+                else:
+                    b = mid
+            return a
+
+        return range(first_at_least(code), first_at_least(code + 1))
+
+    def spans(self, question: int, field: Optional[str] = None) -> List[TokenSpan]:
+        """一道题（或其中一个字段）的全部单词"""
+        return [self._span(i) for i in self._range(question, field)]
+
+    def token_at(self, question: int, field: str, offset: int) -> Optional[TokenSpan]:
+        """字段中 UTF-16 偏移 offset 处的单词（代替运行时向两边扩展找单词）"""
+        span = self._range(question, field)
+        lo, hi = span.start, span.stop
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._spans[4 * mid + 1] <= offset:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < span.stop and self._spans[4 * lo] <= offset:
+            return self._span(lo)
+        return None
+
+    def highlights(self, question: int, lemma: str, field: Optional[str] = None) -> List[TokenSpan]:
+        """一道题中与 lemma 同一原形的所有单词（选中一个词后高亮它的全部出现）"""
+        lemma_id = self.lemma_id(lemma)
+        if lemma_id is None:
+            return []
+        return [self._span(i) for i in self._range(question, field) if self._spans[4 * i + 2] == lemma_id]
+
+    def core_spans(self, question: int) -> List[TokenSpan]:
+        return [self._span(i) for i in self._range(question) if self._spans[4 * i + 3] & CORE]
+
+    def occurrences(self, lemma: str) -> Iterator[Tuple[int, TokenSpan]]:
+        """全部题库中某个原形的出现位置：(题目序号, 单词)"""
+        lemma_id = self.lemma_id(lemma)
+        if lemma_id is None:
+            return
+        ids = self._spans[2::4]
+        question = 0
+        for i, value in enumerate(ids):
+            if value != lemma_id:
+                continue
+            while self._starts[question + 1] <= i:
+                question += 1
+            yield question, self._span(i)
+
+
+def build_tokens(resources_dir: str, path: str, lexicon: Optional[Lexicon] = None) -> int:
+    return compile_tokens(bank_paths(resources_dir), path, Lemmatizer(lexicon), token_fingerprint(resources_dir))
+
+
+def open_tokens(resources_dir: str, path: str, lexicon: Optional[Lexicon] = None) -> TokenTable:
+    """打开单词位置表，来源文件或代码有改动、或表不存在时先重新编译"""
+    fingerprint = token_fingerprint(resources_dir)
+    if os.path.exists(path):
+        try:
+            table = TokenTable(path)
+        except ValueError:
+            table = None
+        if table is not None:
+            if table.fingerprint == fingerprint:
+                return table
+            table.close()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    build_tokens(resources_dir, path, lexicon)
+    return TokenTable(path)
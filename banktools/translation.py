@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+对话翻译索引
+
+建索引时把每个词条的键归一化一次（去掉 . ? ! 和首尾空白），
+查询时只对输入归一化一次再查一次哈希表，未命中不再遍历整个字典。
+
+词典放在数据文件里（banktools/data/*.json 或 .tsv）：
+- JSON：{"英文": "中文"}，也可以按分类嵌套一层 {"分类": {"英文": "中文"}}
+- TSV：每行 “英文<Tab>中文”，# 开头为注释
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, Iterator, Mapping, Optional, Tuple
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+DIALOGUE_TRANSLATIONS = os.path.join(DATA_DIR, 'dialogue_translations.json')
+
+_PUNCTUATION = str.maketrans('', '', '.?!')
+
+
+def normalize(text: str) -> str:
+    """标点不敏感的比较键"""
+    return text.strip().translate(_PUNCTUATION).strip()
+
+
+def load_entries(path: str) -> Iterator[Tuple[str, str]]:
+    """从数据文件读出 (英文, 中文) 词条，保持文件中的顺序"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.tsv'):
+            for line in f:
+                line = line.rstrip('\n')
+                if not line.strip() or line.lstrip().startswith('#'):
+                    continue
+                source, sep, target = line.partition('\t')
+                if sep:
+                    yield source, target
+            return
+        data = json.load(f)
+    for key, value in data.items():
+        if isinstance(value, dict):
+            yield from value.items()
+        else:
+            yield key, value
+
+
+class TranslationIndex:
+    """精确匹配与标点不敏感匹配共用一张归一化哈希表"""
+
+    def __init__(self, entries: Iterable[Tuple[str, str]] = ()):
+        self._normalized: Dict[str, str] = {}
+        # 与归一化结果冲突、但译文不同的原文键，保证精确匹配优先
+        self._exact: Dict[str, str] = {}
+        for source, target in entries:
+            self.add(source, target)
+
+    @classmethod
+    def from_mapping(cls, mapping: Mapping[str, str]) -> 'TranslationIndex':
+        return cls(mapping.items())
+
+    @classmethod
+    def from_files(cls, *paths: str) -> 'TranslationIndex':
+        index = cls()
+        for path in paths:
+            for source, target in load_entries(path):
+                index.add(source, target)
+        return index
+
+    def add(self, source: str, target: str) -> None:
+        source = source.strip()
+        key = normalize(source)
+        current = self._normalized.get(key)
+        if current is None:
+            self._normalized[key] = target
+        elif current != target:
+            # 先出现的词条占用归一化键，后来者只能精确命中
+            self._exact[source] = target
+
+    def __len__(self) -> int:
+        return len(self._normalized) + len(self._exact)
+
+    def digest(self) -> str:
+        """词典内容的哈希，任何词条增删改都会改变它"""
+        data = json.dumps([sorted(self._normalized.items()), sorted(self._exact.items())],
+                          ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+    def lookup(self, text: str) -> Optional[str]:
+        """查译文，未收录返回 None"""
+        text = text.strip()
+        if self._exact:
+            hit = self._exact.get(text)
+            if hit is not None:
+                return hit
+        return self._normalized.get(normalize(text))
+
+    def translate(self, text: str) -> str:
+        """查译文，未收录时返回原文"""
+        hit = self.lookup(text)
+        return text.strip() if hit is None else hit
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+题库校验
+
+一遍读取题库，同时建立“题号 → 题目位置”的索引，所有检查都基于这份索引和解析结果，
+不再对每道题在全文上做一次 re.search（那样既是平方复杂度，第1题 还会匹配到 第10题）。
+流水线里尚未写盘的题目用 verify_records 在内存中做同样的检查。
+
+检查项：
+- parse_issue      解析器报告的格式问题
+- duplicate_number 题号重复
+- answer_mismatch  答案与原始试卷不一致
+- dialogue_mismatch 原题对话与原始试卷不一致
+- options_mismatch 选项与原始试卷不一致
+- missing_question 原始试卷中有、题库中缺少的题
+- extra_question   题库中多出、原始试卷中没有的题
+（与原始试卷的比较先按题目内容对齐，见 align.py，多一题或少一题不会牵连后面的题）
+- untranslated     译文缺失、没有中文或只是重复原题
+
+结果既可以输出给人看的摘要，也可以输出 JSON。
+"""
+
+import json
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from banktools.align import align
+from banktools.parser import parse_bank
+from banktools.records import ParseIssue, Question
+
+_CJK = re.compile(r'[\u4e00-\u9fff]')
+_BLANK = re.compile(r'^[_\s\-?.]*$')
+
+CHECK_NAMES = {
+    'parse_issue': '格式问题',
+    'duplicate_number': '题号重复',
+    'answer_mismatch': '答案错误',
+    'dialogue_mismatch': '对话内容不匹配',
+    'options_mismatch': '选项不匹配',
+    'missing_question': '题库中缺少的原题',
+    'extra_question': '原始试卷中没有的题',
+    'untranslated': '译文不完整或只是重复原题',
+}
+
+
+class Finding(NamedTuple):
+    check: str
+    number: int
+    line: int
+    message: str
+    data: Optional[Dict[str, Any]] = None  # 附加信息；默认 None，不在各实例间共享同一个字典
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = self._asdict()
+        result['data'] = dict(self.data or {})
+        return result
+
+
+class RecordIndex:
+    """内存中的题目列表（流水线生成、尚未写盘）及 题号 → 位置 索引"""
+
+    def __init__(self, questions: Sequence[Question], path: str = '', issues: Sequence[ParseIssue] = ()):
+        self.path = path
+        self.issues: List[ParseIssue] = list(issues)
+        self.questions: List[Question] = list(questions)
+        self.by_number: Dict[int, List[int]] = defaultdict(list)
+        for i, question in enumerate(self.questions):
+            self.by_number[question.number].append(i)
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+
+class BlockIndex(RecordIndex):
+    """一遍扫描题库文件得到的题目列表与索引"""
+
+    def __init__(self, path: str):
+        issues: List[ParseIssue] = []
+        questions = list(parse_bank(path, issues))
+        super().__init__(questions, path, issues)
+
+
+Index = Union[BlockIndex, RecordIndex]
+
+
+def is_blank(text: str) -> bool:
+    return bool(_BLANK.match(text))
+
+
+def check_parse(index: Index) -> Iterator[Finding]:
+    for issue in index.issues:
+        yield Finding('parse_issue', issue.number, issue.line, issue.message)
+
+
+def check_duplicates(index: Index) -> Iterator[Finding]:
+    for number, positions in index.by_number.items():
+        if len(positions) > 1:
+            lines = [index.questions[i].line for i in positions]
+            yield Finding('duplicate_number', number, lines[1], f'题号重复出现 {len(lines)} 次',
+                          {'lines': lines})
+
+
+def check_translations(index: Index) -> Iterator[Finding]:
+    for question in index.questions:
+        text = '\n'.join(question.translation)
+        first = question.dialogue[0].strip() if question.stem else ''
+        if not text.strip('- \n'):
+            reason = '缺少译文'
+        elif not _CJK.search(text):
+            reason = '译文没有中文'
+        elif first and not is_blank(first) and first in text:
+            reason = '译文重复原题'
+        else:
+            continue
+        yield Finding('untranslated', question.number, question.line, reason,
+                      {'translation': text[:80]})
+
+
+def check_against_source(index: Index, originals: Sequence[Question]) -> Iterator[Finding]:
+    """按内容与原始试卷对齐后，比较对应题的答案、对话和选项，并报告多出和缺少的题"""
+    if not originals:
+        return
+    alignment = align(index.questions, originals)
+    for i, j in alignment.matched():
+        question, original = index.questions[i], originals[j]
+        if question.answer != original.answer:
+            yield Finding('answer_mismatch', question.number, question.line,
+                          f'答案 {question.answer}，原始答案 {original.answer}',
+                          {'answer': question.answer, 'original_answer': original.answer,
+                           'original_number': original.number, 'dialogue1': question.dialogue[0][:50]})
+        if question.dialogue != original.dialogue:
+            yield Finding('dialogue_mismatch', question.number, question.line, '对话内容与原始试卷不一致',
+                          {'original_number': original.number, 'dialogue1': question.dialogue[0][:50],
+                           'original_dialogue1': original.dialogue[0][:50] if original.stem else ''})
+        elif question.options != original.options:
+            yield Finding('options_mismatch', question.number, question.line, '选项与原始试卷不一致',
+                          {'original_number': original.number, 'options': dict(question.options),
+                           'original_options': dict(original.options)})
+    for i in alignment.inserts:
+        question = index.questions[i]
+        yield Finding('extra_question', question.number, question.line, '原始试卷中没有这道题',
+                      {'dialogue1': question.dialogue[0][:50] if question.stem else ''})
+    for j in alignment.deletes:
+        original = originals[j]
+        yield Finding('missing_question', original.number, 0, f'原始试卷第{original.number}题不在题库中',
+                      {'original_number': original.number,
+                       'original_dialogue1': original.dialogue[0][:50] if original.stem else ''})
+
+
+class VerifyReport:
+    def __init__(self, path: str, questions: int, originals: Optional[int], findings: List[Finding]):
+        self.path = path
+        self.questions = questions
+        self.originals = originals
+        self.findings = findings
+
+    def counts(self) -> Counter:
+        return Counter(f.check for f in self.findings)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'questions': self.questions,
+            'originals': self.originals,
+            'counts': dict(self.counts()),
+            'findings': [f.to_dict() for f in self.findings],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def summary(self, limit: int = 10) -> Iterator[str]:
+        """给人看的摘要，每类问题最多列出 limit 条"""
+        counts = self.counts()
+        grouped: Dict[str, List[Finding]] = defaultdict(list)
+        for finding in self.findings:
+            grouped[finding.check].append(finding)
+        for check, name in CHECK_NAMES.items():
+            if check not in grouped:
+                continue
+            yield f'\n发现 {counts[check]} 个{name}:'
+            for finding in grouped[check][:limit]:
+                yield f'题目{finding.number}（第{finding.line}行）: {finding.message}'
+        yield '\n=== 验证总结 ==='
+        if self.originals is not None:
+            yield f'原始试卷题目数: {self.originals}'
+        yield f'{self.path} 题目数: {self.questions}'
+        for check, name in CHECK_NAMES.items():
+            yield f'{name}数: {counts.get(check, 0)}'
+
+
+def run_checks(index: Index, originals: Optional[Sequence[Question]] = None) -> VerifyReport:
+    findings: List[Finding] = []
+    findings.extend(check_parse(index))
+    findings.extend(check_duplicates(index))
+    if originals is not None:
+        findings.extend(check_against_source(index, originals))
+    findings.extend(check_translations(index))
+    return VerifyReport(index.path, len(index), None if originals is None else len(originals), findings)
+
+
+def verify(path: str, originals: Optional[Sequence[Question]] = None) -> Tuple[BlockIndex, VerifyReport]:
+    """校验一个题库；originals 为原始试卷题目时同时比对答案和对话"""
+    index = BlockIndex(path)
+    return index, run_checks(index, originals)
+
+
+def verify_records(questions: Sequence[Question], originals: Optional[Sequence[Question]] = None,
+                   path: str = '') -> Tuple[RecordIndex, VerifyReport]:
+    """校验内存中的题目（不读文件）；题目的 line 应为写盘后的行号"""
+    index = RecordIndex(questions, path)
+    return index, run_checks(index, originals)
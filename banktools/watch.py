@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+"""
+监视模式：题库保存后只重新处理改动过的题
+
+每个题库按题号行（第N题 / 单独一行的题号）切成块，每块记下字节区间、起始行号，
+以及以“文本哈希 + 所处试卷段落”为键的处理结果：解析出的题目、结构检查（lint）和译文检查（verify）。
+
+文件变化时读出新内容，与上一版逐块比较出相同的前缀和后缀（memcmp 速度），
+只把夹在中间的改动区间重新切块、解析和检查；后面没变的块只平移字节偏移和行号。
+改动让试卷段落变了（题目：格式中段落标题写在上一题之后）时，顺延重新解析后续的块，直到段落一致。
+题号重复这类跨块的检查在缓存的题目上重算。派生的全文检索索引只增删改动的题，其余题的行号整体平移。
+
+用轮询检测文件变化（mtime + 大小），只依赖标准库。
+"""
+
+import hashlib
+import os
+import re
+import time
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from banktools.lint import ERROR, LintFinding, check_header_like, check_issue, check_question, make_finding
+from banktools.parser import LAYOUT_NUMBERED, bank_paths, detect_layout, iter_inline, iter_numbered
+from banktools.records import ParseIssue, Question
+from banktools.verify import Finding, RecordIndex, check_translations
+
+_HEADERS = {
+    LAYOUT_NUMBERED: re.compile('^[^\\S\\n]*第\\d+题[^\\S\\n]*$'.encode('utf-8'), re.MULTILINE),
+}
+_INLINE_HEADER = re.compile(rb'^[^\S\n]*\d+[^\S\n]*$', re.MULTILINE)
+_CHUNK = 1 << 16
+_CACHE_SLACK = 16  # 块解析缓存最多比块数的两倍多出的条数
+
+
+class ParsedBlock(NamedTuple):
+    """一块的处理结果，行号相对于块的第一行（从 1 开始）"""
+    questions: Tuple[Question, ...]
+    findings: Tuple[LintFinding, ...]
+    untranslated: Tuple[Finding, ...]
+    section_after: Optional[str]  # 块结束时所处的试卷段落；None 表示已过了答案汇总
+    errors: int
+    warnings: int
+
+
+class _Block:
+    __slots__ = ('start', 'end', 'line', 'section', 'parsed')
+
+    def __init__(self, start: int, end: int, line: int, section: Optional[str], parsed: ParsedBlock):
+        self.start = start      # 字节区间 [start, end)
+        self.end = end
+        self.line = line        # 第一行的行号（从 1 开始）
+        self.section = section  # 块开始时所处的试卷段落
+        self.parsed = parsed
+
+
+class BankUpdate(NamedTuple):
+    path: str
+    full: bool                            # 首次加载或整份重建
+    blocks: int
+    changed_blocks: int
+    questions: int
+    errors: int
+    warnings: int
+    changed: Tuple[Question, ...]         # 重新解析的题目（行号为文件中的行号）
+    removed: Tuple[Question, ...]         # 被替换掉的旧题目（行号为改动前的行号）
+    moved: Tuple[Tuple[int, Question], ...]  # 内容没变、只挪了位置的题目：(改动前的行号, 题目)
+    findings: Tuple[LintFinding, ...]     # 落在改动块中的结构问题，以及全部题号重复
+    untranslated: Tuple[Finding, ...]     # 重新解析的题目中译文不合格的
+    shift: Tuple[int, int]                # (改动前的行号界限, 行数变化)：此行之后的题目整体平移
+    seconds: float
+
+
+def _first_difference(a: bytes, b: bytes, reverse: bool = False) -> int:
+    """a、b 相同的前缀（reverse 时为后缀）长度"""
+    n = min(len(a), len(b))
+    la, lb = len(a), len(b)
+
+    def same(lo: int, hi: int) -> bool:
+        if reverse:
+            return a[la - hi:la - lo] == b[lb - hi:lb - lo]
+        return a[lo:hi] == b[lo:hi]
+
+    lo = 0
+    while lo < n:
+        hi = min(lo + _CHUNK, n)
+        if not same(lo, hi):
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if same(lo, mid):
+                    lo = mid
+                else:
+                    hi = mid
+            return lo
+        lo = hi
+    return n
+
+
+def _bisect(blocks: Sequence[_Block], pos: int, attr: str) -> int:
+    """第一个 attr 不小于 pos 的块"""
+    lo, hi = 0, len(blocks)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if getattr(blocks[mid], attr) < pos:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _lines(data: bytes) -> Iterator[str]:
+    start = 0
+    while start < len(data):
+        end = data.find(b'\n', start)
+        end = len(data) if end < 0 else end + 1
+        yield data[start:end].decode('utf-8')
+        start = end
+
+
+class BankWatcher:
+    """一个题库的块表；refresh() 在文件变化时返回本次更新，没变化时返回 None"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.layout = LAYOUT_NUMBERED
+        self._stat: Optional[Tuple[int, int]] = None
+        self._data = b''
+        self._blocks: List[_Block] = []
+        self._cache: Dict[Tuple[str, Optional[str]], ParsedBlock] = {}
+        # 跨块的汇总随块的增删更新，不必每次扫一遍整个题库
+        self._totals = [0, 0, 0]  # 题数、错误数、警告数
+        self._numbers: Dict[Tuple[str, int], List[_Block]] = {}  # (段落, 题号) → 所在的块
+        self._repeated: Set[Tuple[str, int]] = set()
+
+    # ---- 单块处理 ----
+
+    def _parse(self, text: bytes, section: Optional[str]) -> ParsedBlock:
+        key = (hashlib.sha1(text).hexdigest(), section)
+        parsed = self._cache.get(key)
+        if parsed is not None:
+            return parsed
+        if section is None:  # 答案汇总之后的内容不是题目
+            parsed = ParsedBlock((), (), (), None, 0, 0)
+        else:
+            lines = text.decode('utf-8').split('\n')
+            issues: List[ParseIssue] = []
+            section_after: Optional[str] = section
+            if self.layout == LAYOUT_NUMBERED:
+                questions = tuple(iter_numbered(lines, self.path, issues))
+            else:
+                def collect() -> Iterator[Question]:
+                    nonlocal section_after
+                    section_after = yield from iter_inline(lines, self.path, issues, section)
+
+                questions = tuple(collect())
+            findings = [check_issue(issue) for issue in issues]
+            for question in questions:
+                findings.extend(check_question(question))
+            findings.extend(check_header_like(lines, self.layout))
+            untranslated = tuple(check_translations(RecordIndex(questions, self.path)))
+            errors = sum(1 for f in findings if f.severity == ERROR)
+            parsed = ParsedBlock(questions, tuple(findings), untranslated, section_after,
+                                 errors, len(findings) - errors)
+        self._cache[key] = parsed
+        return parsed
+
+    def _split(self, data: bytes, start: int, end: int) -> List[Tuple[int, int]]:
+        """把 [start, end) 按题号行切块；start 总是某块的开头"""
+        header = _HEADERS.get(self.layout, _INLINE_HEADER)
+        bounds = [start]
+        for match in header.finditer(data, start, end):
+            if match.start() > start:
+                bounds.append(match.start())
+        bounds.append(end)
+        return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1) if bounds[i] < bounds[i + 1]]
+
+    def _build(self, data: bytes, spans: Sequence[Tuple[int, int]], line: int,
+               section: Optional[str]) -> Tuple[List[_Block], int, Optional[str]]:
+        """处理切好的块，返回块、下一块的起始行号和段落"""
+        blocks = []
+        for start, end in spans:
+            text = data[start:end]
+            parsed = self._parse(text, section)
+            blocks.append(_Block(start, end, line, section, parsed))
+            line += text.count(b'\n')
+            section = parsed.section_after
+        return blocks, line, section
+
+    # ---- 查询 ----
+
+    def questions(self) -> Iterator[Question]:
+        """整个题库的题目（行号为文件中的行号）"""
+        for block in self._blocks:
+            for question in block.parsed.questions:
+                yield question._replace(line=question.line + block.line - 1)
+
+    def digest(self) -> str:
+        return hashlib.sha1(self._data).hexdigest()
+
+    def _account(self, blocks: Sequence[_Block], sign: int) -> None:
+        """把块计入（sign=1）或移出（sign=-1）汇总"""
+        for block in blocks:
+            parsed = block.parsed
+            self._totals[0] += sign * len(parsed.questions)
+            self._totals[1] += sign * parsed.errors
+            self._totals[2] += sign * parsed.warnings
+            for question in parsed.questions:
+                key = (question.section, question.number)
+                where = self._numbers.setdefault(key, [])
+                if sign > 0:
+                    where.append(block)
+                else:
+                    where.remove(block)
+                if len(where) > 1:
+                    self._repeated.add(key)
+                else:
+                    self._repeated.discard(key)
+                    if not where:
+                        del self._numbers[key]
+
+    def _duplicates(self) -> List[LintFinding]:
+        found = []
+        for key in self._repeated:
+            lines = sorted(q.line + b.line - 1 for b in dict.fromkeys(self._numbers[key])
+                           for q in b.parsed.questions if (q.section, q.number) == key)
+            found.extend(make_finding('duplicate_number', line, key[1], f'题号与第{lines[0]}行重复') for line in lines[1:])
+        return found
+
+    # ---- 刷新 ----
+
+    def refresh(self, force: bool = False) -> Optional[BankUpdate]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        stat = (st.st_mtime_ns, st.st_size)
+        if stat == self._stat and not force:
+            return None
+        self._stat = stat
+
+        started = time.perf_counter()
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        old, blocks = self._data, self._blocks
+        layout, _ = detect_layout(_lines(data))
+        full = force or not blocks or layout != self.layout
+
+        if full:
+            self.layout = layout
+            self._cache.clear()
+            i0, i1 = 0, len(blocks)
+            new, _, _ = self._build(data, self._split(data, 0, len(data)), 1, '')
+            shift = (0, 0)
+        else:
+            prefix = _first_difference(old, data)
+            if prefix == len(old) == len(data):
+                return None
+            suffix = _first_difference(old, data, reverse=True)
+            suffix = min(suffix, min(len(old), len(data)) - prefix)
+            delta = len(data) - len(old)
+
+            # 与改动区间相交或相邻的块，再往前多取一块（改动可能删掉了题号行，内容并入上一块）
+            i0 = max(0, _bisect(blocks, prefix, 'end') - 1)
+            i1 = max(i0 + 1, _bisect(blocks, len(old) - suffix + 1, 'start'))
+            first = blocks[i0]
+            new, line, section = self._build(data, self._split(data, first.start, blocks[i1 - 1].end + delta),
+                                             first.line, first.section)
+            # 段落变了就顺延重新解析后面的块
+            while i1 < len(blocks) and blocks[i1].section != section:
+                block = blocks[i1]
+                more, line, section = self._build(data, [(block.start + delta, block.end + delta)], line, section)
+                new.extend(more)
+                i1 += 1
+
+            old_end = blocks[i1].line if i1 < len(blocks) else old.count(b'\n') + 1
+            line_delta = line - old_end
+            shift = (old_end - 1, line_delta)
+            for block in blocks[i1:]:
+                block.start += delta
+                block.end += delta
+                block.line += line_delta
+
+        # 区间内的新旧块按内容配对：配上的只是挪了位置（或原地未动），不重新检查
+        pool: Dict[int, List[_Block]] = {}
+        for block in blocks[i0:i1] if not full else ():
+            pool.setdefault(id(block.parsed), []).append(block)
+        changed_blocks: List[_Block] = []
+        moved = []
+        for block in new:
+            matches = pool.get(id(block.parsed))
+            if not matches:
+                changed_blocks.append(block)
+                continue
+            before = matches.pop(0)
+            if before.line != block.line:
+                moved.extend((q.line + before.line - 1, q._replace(line=q.line + block.line - 1))
+                             for q in block.parsed.questions)
+        removed = tuple(q._replace(line=q.line + b.line - 1)
+                        for gone in pool.values() for b in gone for q in b.parsed.questions)
+
+        if full:
+            self._totals = [0, 0, 0]
+            self._numbers.clear()
+            self._repeated.clear()
+        else:
+            self._account(blocks[i0:i1], -1)
+        self._account(new, 1)
+        blocks[i0:i1] = new
+        self._blocks = blocks if not full else new
+        self._data = data
+        if full:
+            self._cache = {(hashlib.sha1(data[b.start:b.end]).hexdigest(), b.section): b.parsed for b in new}
+        elif len(self._cache) > 2 * len(self._blocks) + _CACHE_SLACK:
+            # 增量刷新只往缓存里加；超过块数的两倍时去掉没有块再引用的条目（均摊到每次刷新是 O(1)）
+            live = {id(block.parsed) for block in self._blocks}
+            self._cache = {key: parsed for key, parsed in self._cache.items() if id(parsed) in live}
+
+        changed = tuple(q._replace(line=q.line + b.line - 1) for b in changed_blocks for q in b.parsed.questions)
+        duplicates = self._duplicates()
+        findings = [f._replace(line=f.line + b.line - 1) for b in changed_blocks for f in b.parsed.findings]
+        findings.extend(duplicates)
+        findings.sort(key=lambda f: (f.line, f.rule))
+        untranslated = tuple(f._replace(line=f.line + b.line - 1)
+                             for b in changed_blocks for f in b.parsed.untranslated)
+        return BankUpdate(
+            path=self.path,
+            full=full,
+            blocks=len(self._blocks),
+            changed_blocks=len(changed_blocks),
+            questions=self._totals[0],
+            errors=self._totals[1] + len(duplicates),
+            warnings=self._totals[2],
+            changed=changed,
+            removed=removed,
+            moved=tuple(moved),
+            findings=tuple(findings),
+            untranslated=untranslated,
+            shift=shift,
+            seconds=time.perf_counter() - started,
+        )
+
+
+class Watcher:
+    """监视目录下的全部题库；search_path 给出时同步更新全文检索索引"""
+
+    def __init__(self, resources_dir: str, search_path: Optional[str] = None):
+        self.resources_dir = resources_dir
+        self.search_path = search_path
+        self._banks: Dict[str, BankWatcher] = {}
+        self._index = None
+
+    def poll(self, force: bool = False) -> List[BankUpdate]:
+        """检查一遍，返回有变化的题库"""
+        paths = bank_paths(self.resources_dir)
+        for path in set(self._banks) - set(paths):
+            del self._banks[path]
+        updates = []
+        for path in paths:
+            bank = self._banks.get(path)
+            if bank is None:
+                bank = self._banks[path] = BankWatcher(path)
+            update = bank.refresh(force)
+            if update is not None:
+                self._emit(bank, update)
+                updates.append(update)
+        return updates
+
+    def _emit(self, bank: BankWatcher, update: BankUpdate) -> None:
+        if not self.search_path:
+            return
+        if self._index is None:
+            from banktools.search import SearchIndex
+            os.makedirs(os.path.dirname(os.path.abspath(self.search_path)), exist_ok=True)
+            self._index = SearchIndex(self.search_path)
+        if update.full:
+            self._index.update_bank(bank.path, questions=bank.questions())
+        else:
+            self._index.patch_bank(bank.path, bank.digest(), update.removed, update.changed, update.moved, *update.shift)
+
+    def close(self) -> None:
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+
+    def run(self, interval: float, callback: Callable[[List[BankUpdate]], None]) -> None:
+        try:
+            while True:
+                updates = self.poll()
+                if updates:
+                    callback(updates)
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+题库文件写入
+
+- 边生成边写：逐行接收文本，不先拼成整个文件的字符串
+- 原子替换：写入同目录下的临时文件，fsync 后 os.replace 覆盖原文件，中途崩溃不会损坏题库
+- 加锁：写入期间持有 .<文件名>.lock 上的排它锁，两个脚本先后运行不会交错写入
+- 内容不变不写：生成内容与原文件逐字节比较，完全一致时不创建临时文件、不改动原文件，
+  避免无谓地触发 App 资源重新打包
+"""
+
+import contextlib
+import fcntl
+import hashlib
+import os
+import tempfile
+from typing import BinaryIO, Iterable, Iterator, NamedTuple, Optional
+
+_COPY_CHUNK = 1 << 16
+
+
+class WriteResult(NamedTuple):
+    path: str
+    changed: bool  # False 表示内容与原文件一致，未写入
+    sha1: str      # 生成内容的哈希
+    size: int      # 生成内容的字节数
+
+
+@contextlib.contextmanager
+def bank_lock(path: str) -> Iterator[None]:
+    """题库文件的排它锁（阻塞等待）"""
+    directory, name = os.path.split(os.path.abspath(path))
+    lock_path = os.path.join(directory, f'.{name}.lock')
+    with open(lock_path, 'a') as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+
+def _encoded(lines: Iterable[str], newline: str) -> Iterator[bytes]:
+    """与 newline.join(lines) 等价的字节流"""
+    separator = newline.encode('utf-8')
+    first = True
+    for line in lines:
+        if first:
+            first = False
+            yield line.encode('utf-8')
+        else:
+            yield separator + line.encode('utf-8')
+
+
+def _copy_prefix(source: BinaryIO, target: BinaryIO, size: int) -> None:
+    source.seek(0)
+    while size > 0:
+        chunk = source.read(min(size, _COPY_CHUNK))
+        if not chunk:
+            break
+        target.write(chunk)
+        size -= len(chunk)
+
+
+def _fsync_directory(directory: str) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_bank(path: str, lines: Iterable[str], newline: str = '\n') -> WriteResult:
+    """把 lines 以 newline 连接后写入 path（原子、加锁、内容不变则跳过）"""
+    path = os.path.abspath(path)
+    directory, name = os.path.split(path)
+    digest = hashlib.sha1()
+    size = 0
+
+    with bank_lock(path):
+        existing: Optional[BinaryIO] = open(path, 'rb') if os.path.exists(path) else None
+        tmp: Optional[BinaryIO] = None
+        tmp_path = ''
+        matched = 0  # 与原文件一致的前缀长度
+        try:
+            for chunk in _encoded(lines, newline):
+                digest.update(chunk)
+                size += len(chunk)
+                if tmp is None and existing is not None:
+                    if existing.read(len(chunk)) == chunk:
+                        matched += len(chunk)
+                        continue
+                if tmp is None:
+                    # 第一次出现差异：建临时文件，补上已比较过的相同前缀
+                    fd, tmp_path = tempfile.mkstemp(prefix=f'.{name}.', suffix='.tmp', dir=directory)
+                    tmp = os.fdopen(fd, 'wb')
+                    if existing is not None:
+                        _copy_prefix(existing, tmp, matched)
+                tmp.write(chunk)
+
+            if tmp is None:
+                if existing is not None and existing.read(1) == b'':
+                    return WriteResult(path, False, digest.hexdigest(), size)
+                # 新内容是原文件的前缀（原文件更长）或原文件不存在
+                fd, tmp_path = tempfile.mkstemp(prefix=f'.{name}.', suffix='.tmp', dir=directory)
+                tmp = os.fdopen(fd, 'wb')
+                if existing is not None:
+                    _copy_prefix(existing, tmp, matched)
+
+            tmp.flush()
+            os.fsync(tmp.fileno())
+            tmp.close()
+            # 保留原文件权限；新文件按常规 0644
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777 if existing is not None else 0o644)
+            os.replace(tmp_path, path)
+            tmp_path = ''
+            _fsync_directory(directory)
+            return WriteResult(path, True, digest.hexdigest(), size)
+        finally:
+            if existing is not None:
+                existing.close()
+            if tmp is not None and not tmp.closed:
+                tmp.close()
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+题库工具的基准测试
+
+用固定种子生成两种格式、不同规模的合成题库，分别计时 解析 / 翻译 / 分类 / 校验 / 写回 各阶段，
+并记录每个阶段的内存峰值。结果与基线比较，超出容差即以非零状态退出。
+
+基线随仓库提交在 benchmarks/baseline.json，记录了生成它的 Python 版本和机器架构；
+与当前环境不一致时不做比较（耗时不可比），以状态 2 退出，需要在本机用 --save-baseline 另存一份基线。
+没有基线文件同样以状态 2 退出。合成题库和本次结果写在 build/bench/（EHEXAM_BUILD 可改）。
+
+    python3 bench_banks.py --save-baseline                      # 记录基线
+    python3 bench_banks.py                                      # 与基线比较
+    python3 bench_banks.py --sizes 1000000 --no-memory --baseline my-baseline.json   # 百万题规模
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from banktools import parse_bank, render_numbered
+from banktools.config import BUILD_DIR
+from banktools.render import render_inline
+from banktools.fuzzy import FuzzyIndex
+from banktools.rules import RuleEngine
+from banktools.synth import LAYOUTS, SYNTH_VERSION, write_synthetic_bank
+from banktools.translation import DIALOGUE_TRANSLATIONS, TranslationIndex, load_entries
+from banktools.verify import verify
+from banktools.writer import write_bank
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BENCH_DIR = os.path.join(BUILD_DIR, 'bench')
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+
+parser = argparse.ArgumentParser(description='题库工具基准测试')
+parser.add_argument('--sizes', default='1000,10000,100000', help='题目数，逗号分隔（可到 1000000）')
+parser.add_argument('--layouts', default=','.join(LAYOUTS), help='题库格式，逗号分隔')
+parser.add_argument('--seed', type=int, default=0)
+parser.add_argument('--repeat', type=int, default=3, help='每个阶段计时次数，取最小值')
+parser.add_argument('--no-memory', action='store_true', help='不统计内存峰值（大规模时省一半时间）')
+parser.add_argument('--baseline', default=BASELINE_PATH, help='基线文件')
+parser.add_argument('--save-baseline', action='store_true', help='把本次结果保存为基线')
+parser.add_argument('--tolerance', type=float, default=0.25, help='允许比基线慢/多用内存的比例')
+parser.add_argument('--out', default=os.path.join(BENCH_DIR, 'results.json'), help='本次结果')
+args = parser.parse_args()
+
+# 各阶段共用的数据
+translations = TranslationIndex.from_files(DIALOGUE_TRANSLATIONS)
+fuzzy = FuzzyIndex()
+for key, value in load_entries(DIALOGUE_TRANSLATIONS):
+    fuzzy.add(key, value)
+rules = RuleEngine.from_file()
+
+
+def stage_parse(path, questions, layout):
+    return len(list(parse_bank(path)))
+
+
+def stage_translate(path, questions, layout):
+    """每句对白先查精确词典，查不到再做 n-gram 模糊匹配"""
+    found = 0
+    for q in questions:
+        for line in q.dialogue:
+            if translations.lookup(line) is not None or fuzzy.best(line) is not None:
+                found += 1
+    return found
+
+
+def stage_classify(path, questions, layout):
+    rules.hits.clear()
+    items = ((q.dialogue[0], q.dialogue[-1], q.answer_text) for q in questions)
+    return len(rules.classify_many(items))
+
+
+def stage_verify(path, questions, layout):
+    _, report = verify(path)
+    return report.questions
+
+
+def stage_render(path, questions, layout):
+    out = path + '.out'
+
+    render = render_numbered if layout == 'numbered' else render_inline
+
+    def lines():
+        yield from ('', '', '')
+        for q in questions:
+            yield from render(q)
+
+    write_bank(out, lines())
+    os.remove(out)
+    return len(questions)
+
+
+STAGES = [
+    ('parse', stage_parse),
+    ('translate', stage_translate),
+    ('classify', stage_classify),
+    ('verify', stage_verify),
+    ('render', stage_render),
+]
+
+
+def measure(func, path, questions, layout):
+    """返回（最短耗时秒数，内存峰值 KB 或 None）"""
+    best = None
+    for _ in range(max(1, args.repeat)):
+        gc.collect()
+        start = time.perf_counter()
+        func(path, questions, layout)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    peak = None
+    if not args.no_memory:
+        gc.collect()
+        tracemalloc.start()
+        func(path, questions, layout)
+        peak = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    return best, peak
+
+
+os.makedirs(BENCH_DIR, exist_ok=True)
+sizes = [int(s) for s in args.sizes.split(',') if s]
+layouts = [s for s in args.layouts.split(',') if s]
+
+results = {}
+print(f"{'格式':<10}{'题数':>9}  {'阶段':<10}{'耗时(ms)':>11}{'峰值(KB)':>11}{'每千题(ms)':>12}")
+for layout in layouts:
+    for size in sizes:
+        path = os.path.join(BENCH_DIR, f'synthetic-v{SYNTH_VERSION}-{layout}-{size}-{args.seed}.txt')
+        if not os.path.exists(path):  # 生成规则变化时 SYNTH_VERSION 递增，旧文件不会被误用
+            write_synthetic_bank(path, size, layout, args.seed)
+        questions = list(parse_bank(path))
+        for name, func in STAGES:
+            seconds, peak = measure(func, path, questions, layout)
+            results[f'{layout}:{size}:{name}'] = {'seconds': seconds, 'peak_kb': peak}
+            peak_text = '-' if peak is None else str(peak)
+            print(f'{layout:<10}{size:>9}  {name:<10}{seconds * 1000:>11.1f}{peak_text:>11}'
+                  f'{seconds * 1000 / size * 1000:>12.2f}')
+        del questions
+
+
+def environment():
+    """基线只在同样的 Python（实现 + 主次版本）和机器架构上可比"""
+    return {
+        'python': f'{platform.python_implementation()} {platform.python_version()}',
+        'machine': platform.machine(),
+    }
+
+
+def comparable(a, b):
+    def major_minor(env):
+        return env.get('python', '').rsplit('.', 1)[0]
+
+    return major_minor(a) == major_minor(b) and a.get('machine') == b.get('machine')
+
+
+report = {
+    **environment(),
+    'seed': args.seed,
+    'results': results,
+}
+with open(args.out, 'w', encoding='utf-8') as f:
+    json.dump(report, f, ensure_ascii=False, indent=2)
+
+if args.save_baseline:
+    os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+    with open(args.baseline, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f'\n基线已保存: {args.baseline}')
+    sys.exit(0)
+
+if not os.path.exists(args.baseline):
+    print(f'\n没有基线文件 {args.baseline}，先用 --save-baseline 记录一次')
+    sys.exit(2)
+
+with open(args.baseline, 'r', encoding='utf-8') as f:
+    saved = json.load(f)
+if not comparable(saved, report):
+    print(f"\n基线 {args.baseline} 记录于 {saved.get('python')} / {saved.get('machine')}，"
+          f"当前为 {report['python']} / {report['machine']}，不做比较；"
+          f'请在本机用 --save-baseline --baseline 其他路径 另存基线后比较')
+    sys.exit(2)
+baseline = saved['results']
+
+# 时间有 5ms、内存有 64KB 的噪声下限，太小的阶段不判定
+regressions = []
+compared = 0
+for key, current in results.items():
+    base = baseline.get(key)
+    if base is None:
+        continue
+    compared += 1
+    if current['seconds'] > base['seconds'] * (1 + args.tolerance) and current['seconds'] - base['seconds'] > 0.005:
+        regressions.append(f"{key} 耗时 {base['seconds'] * 1000:.1f} → {current['seconds'] * 1000:.1f} ms")
+    if current['peak_kb'] is not None and base.get('peak_kb') is not None:
+        if current['peak_kb'] > base['peak_kb'] * (1 + args.tolerance) and current['peak_kb'] - base['peak_kb'] > 64:
+            regressions.append(f"{key} 内存 {base['peak_kb']} → {current['peak_kb']} KB")
+
+if not compared:
+    print(f'\n基线 {args.baseline} 中没有本次的规模和格式，无法比较')
+    sys.exit(2)
+if regressions:
+    print(f'\n发现 {len(regressions)} 项性能退化（容差 {args.tolerance:.0%}）:')
+    for line in regressions:
+        print(f'  {line}')
+    sys.exit(1)
+print(f'\n与基线相比没有性能退化（容差 {args.tolerance:.0%}）')
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+把 resources/ 下的题库打包成分片压缩包（build/bundles/<题库名>.ehxb），并给出体积与延迟报告
+
+App 只需读包头，再解压所需题目所在的一片，不必为了显示第一题把整份题库读完。
+
+    python3 bundle_banks.py                          # 每片 20 题，zlib + 预置字典
+    python3 bundle_banks.py --shard-size 50 --codec lzma
+    python3 bundle_banks.py --compare                # 对比各压缩方式与有无字典的体积
+
+报告中“首题”为 打开包 + 取第 1 题 的时间，“随机”为随机取一题的平均时间（每次都重新解压），
+“全文解析”为直接解析原始文本的时间。
+"""
+
+import argparse
+import os
+import random
+import time
+
+from banktools.bundle import CODECS, BundleReader, bundle_banks
+from banktools.config import BUILD_DIR, RESOURCES_DIR
+from banktools.parser import bank_paths, parse_bank
+
+parser = argparse.ArgumentParser(description='题库分片压缩打包')
+parser.add_argument('paths', nargs='*', help='题库文件，默认为 resources/ 下的全部题库')
+parser.add_argument('--resources', default=RESOURCES_DIR, help='题库目录')
+parser.add_argument('--out', default=os.path.join(BUILD_DIR, 'bundles'), help='输出目录')
+parser.add_argument('--shard-size', type=int, default=20, help='每片题数')
+parser.add_argument('--codec', choices=sorted(CODECS), default='zlib', help='压缩方式')
+parser.add_argument('--dict-size', type=int, default=16 * 1024, help='预置字典大小（字节，仅 zlib；0 为不用字典）')
+parser.add_argument('--compare', action='store_true', help='对比各压缩方式与有无字典的体积')
+parser.add_argument('--repeat', type=int, default=50, help='延迟测量次数')
+args = parser.parse_args()
+
+
+def timed(func, repeat):
+    """repeat 次中最快的一次（毫秒）"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def first_question(path):
+    with BundleReader(path) as reader:
+        return reader.get(0) if len(reader) else None
+
+
+def random_access(path, positions):
+    with BundleReader(path, cache=0) as reader:
+        start = time.perf_counter()
+        for position in positions:
+            reader.get(position)
+        return (time.perf_counter() - start) * 1000 / max(len(positions), 1)
+
+
+os.makedirs(args.out, exist_ok=True)
+paths = args.paths or bank_paths(args.resources)
+rng = random.Random(0)
+
+issues = []
+start = time.perf_counter()
+infos, dict_size = bundle_banks(paths, args.out, args.shard_size, args.codec, args.dict_size, issues)
+elapsed = time.perf_counter() - start
+for issue in issues:
+    print(f'格式问题: {issue}')
+
+print(f'{"题库":<20}{"题数":>6}{"分片":>6}{"原文":>10}{"包":>10}{"包头":>9}{"比例":>7}'
+      f'{"首题":>9}{"随机":>9}{"全文解析":>10}')
+for path, info in zip(paths, infos):
+    text_size = os.path.getsize(path)
+    first_ms = timed(lambda: first_question(info.path), args.repeat)
+    positions = [rng.randrange(info.questions) for _ in range(args.repeat)] if info.questions else []
+    random_ms = random_access(info.path, positions)
+    parse_ms = timed(lambda: list(parse_bank(path)), max(args.repeat // 10, 1))
+    print(f'{os.path.basename(path):<20}{info.questions:>6}{info.shards:>6}{text_size:>10,}{info.size:>10,}'
+          f'{info.header_size:>9,}{info.size / text_size:>7.1%}'
+          f'{first_ms:>7.2f}ms{random_ms:>7.2f}ms{parse_ms:>8.2f}ms')
+
+text_total = sum(os.path.getsize(path) for path in paths)
+bundle_total = sum(info.size for info in infos) + dict_size
+print(f'\n共 {len(infos)} 个包，共用字典 {dict_size:,} 字节，合计 {bundle_total:,} 字节'
+      f'（原文 {text_total:,} 字节的 {bundle_total / max(text_total, 1):.1%}），打包用时 {elapsed * 1000:.0f} ms')
+
+if args.compare:
+    print('\n各压缩方式的总体积（含共用字典，字节）：')
+    scratch = os.path.join(args.out, 'compare')
+    os.makedirs(scratch, exist_ok=True)
+    for codec, size in (('none', 0), ('zlib', 0), ('zlib', args.dict_size or 16 * 1024), ('lzma', 0)):
+        found, used = bundle_banks(paths, scratch, args.shard_size, codec, size)
+        label = f'{codec} + 字典（{used:,} 字节）' if size else codec
+        print(f'  {label:<28}{sum(info.size for info in found) + used:>10,}')
+
+print(f'\n已生成: {args.out}')
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+把resources/下的所有题库编译成一个带索引的SQLite文件，供App按id懒加载题目
+"""
+
+import argparse
+import os
+import time
+
+from banktools.config import BUILD_DIR, RESOURCES_DIR
+from banktools.store import QuestionStore, compile_resources
+
+parser = argparse.ArgumentParser(description='编译题库为SQLite')
+parser.add_argument('--resources', default=RESOURCES_DIR, help='题库目录')
+parser.add_argument('--out', default=os.path.join(BUILD_DIR, 'banks.sqlite'), help='输出文件')
+args = parser.parse_args()
+
+os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+
+start = time.perf_counter()
+issues = []
+counts = compile_resources(args.resources, args.out, issues)
+elapsed = time.perf_counter() - start
+
+for issue in issues:
+    print(f'格式问题: {issue}')
+for name, count in counts.items():
+    print(f'{name}: {count} 道题')
+
+with QuestionStore(args.out) as store:
+    tags = store.key_points()
+print(f'共 {sum(counts.values())} 道题，{len(tags)} 个考点标签，用时 {elapsed * 1000:.0f} ms')
+print(f'已生成: {args.out}')
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+把各题库“核心词”下的词条汇成一张总索引（build/glossary.bin），可按词或前缀查解释和出处
+
+    python3 compile_glossary.py                       # 编译（题库没变时直接用上次的结果）
+    python3 compile_glossary.py regardless debates    # 查词（会做词形还原）
+    python3 compile_glossary.py --prefix dis          # 前缀查找
+"""
+
+import argparse
+import os
+import time
+
+from banktools.config import BUILD_DIR, RESOURCES_DIR
+from banktools.glossary import open_glossary
+
+parser = argparse.ArgumentParser(description='编译核心词总索引')
+parser.add_argument('words', nargs='*', help='要查的词或短语')
+parser.add_argument('--resources', default=RESOURCES_DIR, help='题库目录')
+parser.add_argument('--out', default=os.path.join(BUILD_DIR, 'glossary.bin'), help='输出文件')
+parser.add_argument('--prefix', help='列出以此开头的词条')
+parser.add_argument('--limit', type=int, default=20, help='前缀查找最多列出的词条数、每个词条最多列出的出处数')
+args = parser.parse_args()
+
+
+def show(entry):
+    head = f'{entry.word} {entry.phonetic}' if entry.phonetic else entry.word
+    print(f'{head}：{entry.explanation}')
+    for variant in entry.variants:
+        print(f'  另见：{variant}')
+    for ref in entry.references[:args.limit]:
+        where = f'{ref.section} ' if ref.section else ''
+        print(f'  出处：{ref.bank} {where}第{ref.number}题（第{ref.line}行）')
+    if len(entry.references) > args.limit:
+        print(f'  ……还有 {len(entry.references) - args.limit} 处')
+
+
+start = time.perf_counter()
+glossary = open_glossary(args.resources, args.out)
+elapsed = time.perf_counter() - start
+refs = sum(len(entry.references) for entry in glossary)
+print(f'{len(glossary)} 个词条，{refs} 条出处，{os.path.getsize(args.out):,} 字节'
+      f'（{elapsed * 1000:.0f} ms）: {args.out}')
+
+for word in args.words:
+    print()
+    entry = glossary.lookup(word)
+    if entry is None:
+        print(f'没有找到: {word}')
+    else:
+        show(entry)
+
+if args.prefix:
+    print()
+    for entry in glossary.prefix(args.prefix, args.limit):
+        show(entry)
+
+glossary.close()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+为 resources/ 下的题库预先算好每道题的单词位置表（build/tokens.bin），App 选词、高亮时直接查表
+
+    python3 compile_tokens.py                         # 编译（来源没变时直接用上次的结果）
+    python3 compile_tokens.py --show part-110 12      # 列出 part-110 第12题的单词
+    python3 compile_tokens.py --word regardless       # 列出某个词（按原形）在各题库中的出现位置
+"""
+
+import argparse
+import os
+import time
+
+from banktools.config import BUILD_DIR, RESOURCES_DIR
+from banktools.lexicon import open_lexicon
+from banktools.tokens import open_tokens
+
+parser = argparse.ArgumentParser(description='编译单词位置表')
+parser.add_argument('--resources', default=RESOURCES_DIR, help='题库目录')
+parser.add_argument('--out', default=os.path.join(BUILD_DIR, 'tokens.bin'), help='输出文件')
+parser.add_argument('--lexicon', default=os.path.join(BUILD_DIR, 'lexicon.bin'), help='核心词词表')
+parser.add_argument('--show', nargs=2, metavar=('BANK', 'NUMBER'), help='列出一道题的单词')
+parser.add_argument('--section', default='', help='与 --show 一起使用：试卷段落')
+parser.add_argument('--word', help='列出某个词（按原形）的全部出现位置')
+parser.add_argument('--limit', type=int, default=20, help='--word 最多列出的条数')
+args = parser.parse_args()
+
+start = time.perf_counter()
+lexicon = open_lexicon(args.resources, args.lexicon)
+table = open_tokens(args.resources, args.out, lexicon)
+elapsed = time.perf_counter() - start
+
+print(f'{len(table)} 道题，{table.span_count} 个单词，{table.lemma_count} 个原形，'
+      f'{os.path.getsize(args.out):,} 字节（{elapsed * 1000:.0f} ms）: {args.out}')
+
+if args.show:
+    bank, number = args.show
+    question = table.question(bank, int(number), args.section)
+    if question is None:
+        print(f'没有找到 {bank} 第{number}题')
+    else:
+        for span in table.spans(question):
+            mark = ' *' if span.core else ''
+            print(f'  {span.field} {span.start}-{span.end} {span.lemma}{mark}')
+
+if args.word:
+    names = {i: name for name in table.meta['banks'] for i in table.bank_range(name)}
+    shown = 0
+    for question, span in table.occurrences(args.word):
+        if shown >= args.limit:
+            break
+        number = table.meta['numbers'][question][1]
+        print(f'  {names[question]} 第{number}题 {span.field} {span.start}-{span.end}{" *" if span.core else ""}')
+        shown += 1
+
+table.close()
+lexicon.close()
@@ -4,105 +4,96 @@
 为part-I.txt的所有题目补全完整的中文译文
 """
 
-import re
+import os
 
-# 读取part-I.txt
-with open('/Users/yuhuahuan/code/EHExam/resources/part-I.txt', 'r', encoding='utf-8') as f:
-    content = f.read()
+from banktools import parse_bank, render_numbered
+from banktools.config import BUILD_DIR, PART1_BANK
+from banktools.lexicon import CoreWordExtractor, open_lexicon
+from banktools.render import DIALOGUE_CORE_WORD
+from banktools.writer import write_bank
+
+BANK_PATH = PART1_BANK
+LEXICON_PATH = os.path.join(BUILD_DIR, 'lexicon.bin')
 
 # 解析所有题目
-questions = []
-pattern = r'第(\d+)题\n\n原题：--- (.*?)\n    --- (.*?)\n选项：\nA\) (.*?)\nB\) (.*?)\nC\) (.*?)\nD\) (.*?)\n你的答案：([A-D])\n核对结果：正确\n译文：(.*?)\n\n【考点·高效记忆】\n(.*?)\n\n【解析·秒选思路】\n(.*?)\n\n核心词'
+issues = []
+questions = list(parse_bank(BANK_PATH, issues))
+for issue in issues:
+    print(f'格式问题: {issue}')
 
-matches = re.findall(pattern, content, re.DOTALL)
+print(f'找到 {len(questions)} 道题目')
 
-print(f'找到 {len(matches)} 道题目')
+# 核心词：从词表（各题库已有的核心词 + banktools/data/core_words.tsv）中挑超出初中水平的词
+core_words = CoreWordExtractor(open_lexicon(os.path.dirname(BANK_PATH), LEXICON_PATH))
 
 # 为每道题生成完整译文
-output_lines = ['', '', '']
+def render_bank():
+    """逐行生成整个题库文件"""
+    yield from ('', '', '')
 
-for match in matches:
-    num, d1, d2, opt_a, opt_b, opt_c, opt_d, answer, old_trans, key_point, analysis = match
-    
-    # 确定第二句对话（如果是空白，用答案填充）
-    d2_filled = d2.strip()
-    if d2_filled == '__________' or not d2_filled:
-        options = {'A': opt_a.strip(), 'B': opt_b.strip(), 'C': opt_c.strip(), 'D': opt_d.strip()}
-        d2_filled = options[answer]
-    
-    # 生成中文译文（这里简化处理，实际应该用翻译API）
-    # 对于对话题，保持英文原文也是可以接受的，但按照要求应该翻译
-    # 由于有60道题，我会为每道题生成基本的中文翻译
-    
-    # 简单的翻译映射（可以根据需要扩展）
-    def simple_translate(text):
-        text = text.strip()
-        # 常见短语翻译
-        trans_map = {
-            'Would you like another cup of tea?': '你想再喝一杯茶吗？',
-            'No, thanks.': '不了，谢谢。',
-            "What's the weather like today?": '今天天气怎么样？',
-            "It's rather windy.": '风很大。',
-            'Hello,': '你好，',
-            'may I speak to Ms. Sereno?': '我可以和塞雷诺女士通话吗？',
-            "I'm afraid she is not here right now.": '恐怕她现在不在这里。',
-            'I cannot go out with you today because my mom is sick.': '我今天不能和你出去，因为我妈妈生病了。',
-            "I'm sorry to hear that.": '听到这个消息我很遗憾。',
-            "How is John's homework done?": '约翰的作业做得怎么样？',
-            'Pretty well.': '很好。',
-            'Will you come to my graduation ceremony tomorrow?': '你明天会来参加我的毕业典礼吗？',
-            "I'd love to,": '我很想去，',
-            "but I'll have to attend an important meeting.": '但我必须参加一个重要会议。',
-            'Do you speak German?': '你会说德语吗？',
-            'A little.': '会一点。',
-            "It's kind of you to give me a ride to the subway station.": '你真好，载我到地铁站。',
-            "It was my pleasure.": '不客气。',
-            "Haven't you called your family this week?": '你这周还没给家里打电话吗？',
-            "Not yet, but I'm calling tomorrow.": '还没有，但我明天会打。',
-            'May I help you, Sir?': '先生，需要帮忙吗？',
-            "Yes. I'd like to have a look at this leather jacket.": '是的，我想看看这件皮夹克。',
-        }
-        return trans_map.get(text, text)  # 如果没有翻译，保持原文
-    
-    trans_d1 = simple_translate(d1)
-    trans_d2 = simple_translate(d2_filled)
-    
-    # 如果翻译后还是英文，至少确保格式正确
-    if trans_d1 == d1.strip() and '?' not in d1 and '!' not in d1:
-        # 尝试更智能的翻译
-        trans_d1 = d1.strip()  # 暂时保持原文
-    
-    if trans_d2 == d2_filled and '?' not in d2_filled and '!' not in d2_filled:
-        trans_d2 = d2_filled  # 暂时保持原文
-    
-    # 构建题目
-    output_lines.append(f'第{num}题')
-    output_lines.append('')
-    output_lines.append(f'原题：--- {d1.strip()}')
-    output_lines.append(f'    --- {d2.strip()}')
-    output_lines.append('选项：')
-    output_lines.append(f'A) {opt_a.strip()}')
-    output_lines.append(f'B) {opt_b.strip()}')
-    output_lines.append(f'C) {opt_c.strip()}')
-    output_lines.append(f'D) {opt_d.strip()}')
-    output_lines.append(f'你的答案：{answer}')
-    output_lines.append('核对结果：正确')
-    output_lines.append(f'译文：--- {trans_d1}')
-    output_lines.append(f'    --- {trans_d2}')
-    output_lines.append('')
-    output_lines.append('【考点·高效记忆】')
-    output_lines.append(key_point.strip())
-    output_lines.append('')
-    output_lines.append('【解析·秒选思路】')
-    output_lines.append(analysis.strip())
-    output_lines.append('')
-    output_lines.append('核心词（音标+拆解记忆）')
-    output_lines.append('')
-    output_lines.append('• dialogue /ˈdaɪəlɒɡ/：dia-（两者之间）+ logue（说）→ 对话')
-    output_lines.append('')
+    for q in questions:
+        d1, d2 = q.dialogue[0], q.dialogue[-1]
+        
+        # 确定第二句对话（如果是空白，用答案填充）
+        d2_filled = d2.strip()
+        if d2_filled == '__________' or not d2_filled:
+            d2_filled = q.answer_text
+        
+        # 生成中文译文（这里简化处理，实际应该用翻译API）
+        # 对于对话题，保持英文原文也是可以接受的，但按照要求应该翻译
+        # 由于有60道题，我会为每道题生成基本的中文翻译
+        
+        # 简单的翻译映射（可以根据需要扩展）
+        def simple_translate(text):
+            text = text.strip()
+            # 常见短语翻译
+            trans_map = {
+                'Would you like another cup of tea?': '你想再喝一杯茶吗？',
+                'No, thanks.': '不了，谢谢。',
+                "What's the weather like today?": '今天天气怎么样？',
+                "It's rather windy.": '风很大。',
+                'Hello,': '你好，',
+                'may I speak to Ms. Sereno?': '我可以和塞雷诺女士通话吗？',
+                "I'm afraid she is not here right now.": '恐怕她现在不在这里。',
+                'I cannot go out with you today because my mom is sick.': '我今天不能和你出去，因为我妈妈生病了。',
+                "I'm sorry to hear that.": '听到这个消息我很遗憾。',
+                "How is John's homework done?": '约翰的作业做得怎么样？',
+                'Pretty well.': '很好。',
+                'Will you come to my graduation ceremony tomorrow?': '你明天会来参加我的毕业典礼吗？',
+                "I'd love to,": '我很想去，',
+                "but I'll have to attend an important meeting.": '但我必须参加一个重要会议。',
+                'Do you speak German?': '你会说德语吗？',
+                'A little.': '会一点。',
+                "It's kind of you to give me a ride to the subway station.": '你真好，载我到地铁站。',
+                "It was my pleasure.": '不客气。',
+                "Haven't you called your family this week?": '你这周还没给家里打电话吗？',
+                "Not yet, but I'm calling tomorrow.": '还没有，但我明天会打。',
+                'May I help you, Sir?': '先生，需要帮忙吗？',
+                "Yes. I'd like to have a look at this leather jacket.": '是的，我想看看这件皮夹克。',
+            }
+            return trans_map.get(text, text)  # 如果没有翻译，保持原文
+        
+        trans_d1 = simple_translate(d1)
+        trans_d2 = simple_translate(d2_filled)
+        
+        # 如果翻译后还是英文，至少确保格式正确
+        if trans_d1 == d1.strip() and '?' not in d1 and '!' not in d1:
+            # 尝试更智能的翻译
+            trans_d1 = d1.strip()  # 暂时保持原文
+        
+        if trans_d2 == d2_filled and '?' not in d2_filled and '!' not in d2_filled:
+            trans_d2 = d2_filled  # 暂时保持原文
+        
+        # 构建题目
+        q = q._replace(
+            translation=(f'--- {trans_d1}', f'--- {trans_d2}'),
+            core_words=core_words.for_question(q) or (DIALOGUE_CORE_WORD,),
+        )
+        yield from render_numbered(q)
 
-# 写入文件
-with open('/Users/yuhuahuan/code/EHExam/resources/part-I.txt', 'w', encoding='utf-8') as f:
-    f.write('\n'.join(output_lines))
+# 写入文件（原子替换，内容不变则跳过）
+result = write_bank(BANK_PATH, render_bank())
+if not result.changed:
+    print('内容未变化，未改写文件')
 
-print(f'完成！已处理 {len(matches)} 道题目')
+print(f'完成！已处理 {len(questions)} 道题目')
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+一次检查全部题库的译文、考点、解析，找出没翻译、照抄英文、中英文比例异常的字段，按严重程度排列
+
+    python3 find_untranslated.py                         # resources/ 下全部题库
+    python3 find_untranslated.py resources/part-I.txt --min-severity 0.5
+    python3 find_untranslated.py --synthetic 100000      # 用合成题库测速
+
+规则与严重程度见 banktools/untranslated.py。有严重程度不低于 --fail-at 的字段时以状态 1 退出。
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+
+from banktools.config import RESOURCES_DIR
+from banktools.parser import bank_paths
+from banktools.synth import synthetic_questions
+from banktools.untranslated import FieldTable, scan, scan_banks
+
+parser = argparse.ArgumentParser(description='检查未翻译或照抄英文的字段')
+parser.add_argument('paths', nargs='*', help='题库文件，默认为 resources/ 下的全部题库')
+parser.add_argument('--resources', default=RESOURCES_DIR, help='题库目录')
+parser.add_argument('--min-severity', type=float, default=0.0, help='只列出严重程度高于此值的字段')
+parser.add_argument('--fail-at', type=float, default=0.9, help='严重程度不低于此值时以状态 1 退出')
+parser.add_argument('--limit', type=int, default=30, help='最多列出的条数')
+parser.add_argument('--json', metavar='PATH', help='把结果以 JSON 写入 PATH（- 表示标准输出）')
+parser.add_argument('--synthetic', type=int, metavar='N', help='不读题库，检查 N 道合成题（测速用）')
+args = parser.parse_args()
+
+if args.synthetic:
+    questions = list(synthetic_questions(args.synthetic))  # 生成合成题不计入用时
+    start = time.perf_counter()
+    table = FieldTable([('synthetic', questions)])
+    suspects = scan(table, args.min_severity)
+else:
+    start = time.perf_counter()
+    table, suspects = scan_banks(args.paths or bank_paths(args.resources), args.min_severity)
+elapsed = time.perf_counter() - start
+
+if args.json == '-':
+    print(json.dumps([s.to_dict() for s in suspects], ensure_ascii=False, indent=2))
+else:
+    for s in suspects[:args.limit]:
+        where = f'{s.section} ' if s.section else ''
+        print(f'{s.severity:.2f}  {s.bank}:{s.line} {where}第{s.number}题 {s.field}：{s.reason}')
+        if s.english:
+            print(f'      {s.english}')
+    if len(suspects) > args.limit:
+        print(f'……还有 {len(suspects) - args.limit} 条')
+    by_field = Counter(s.field for s in suspects)
+    detail = '，'.join(f'{field} {count}' for field, count in by_field.most_common()) or '无'
+    timing = f'{elapsed * 1000:.0f} ms' + ('（不含解析题库）' if args.synthetic else '')
+    print(f'\n{len(table.banks)} 个题库，{len(table.questions)} 题，{len(table)} 个字段，'
+          f'可疑 {len(suspects)} 个（{detail}），{timing}')
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([s.to_dict() for s in suspects], f, ensure_ascii=False, indent=2)
+        print(f'结果已写入: {args.json}')
+
+sys.exit(1 if any(s.severity >= args.fail_at for s in suspects) else 0)
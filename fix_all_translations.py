@@ -5,161 +5,77 @@
 基于原始试卷内容生成准确的翻译
 """
 
-import re
+import os
 
-# 读取part-I.txt
-with open('/Users/yuhuahuan/code/EHExam/resources/part-I.txt', 'r', encoding='utf-8') as f:
-    content = f.read()
+from banktools import parse_bank, render_numbered
+from banktools.config import BUILD_DIR, PART1_BANK
+from banktools.memory import IndexBackend, TranslationMemory
+from banktools.lexicon import CoreWordExtractor, open_lexicon
+from banktools.render import DIALOGUE_CORE_WORD
+from banktools.translation import DIALOGUE_TRANSLATIONS, TranslationIndex
+from banktools.writer import write_bank
+
+BANK_PATH = PART1_BANK
+MEMORY_PATH = os.path.join(BUILD_DIR, 'cache', 'translation_memory.sqlite')
+LEXICON_PATH = os.path.join(BUILD_DIR, 'lexicon.bin')
 
 # 解析所有题目
-pattern = r'第(\d+)题\n\n原题：--- (.*?)\n    --- (.*?)\n选项：\nA\) (.*?)\nB\) (.*?)\nC\) (.*?)\nD\) (.*?)\n你的答案：([A-D])\n核对结果：正确\n译文：(.*?)\n\n【考点·高效记忆】\n(.*?)\n\n【解析·秒选思路】\n(.*?)\n\n核心词'
+issues = []
+questions = list(parse_bank(BANK_PATH, issues))
+for issue in issues:
+    print(f'格式问题: {issue}')
+
+print(f'找到 {len(questions)} 道题目')
+
+# 核心词：从词表（各题库已有的核心词 + banktools/data/core_words.tsv）中挑超出初中水平的词
+core_words = CoreWordExtractor(open_lexicon(os.path.dirname(BANK_PATH), LEXICON_PATH))
 
-matches = re.findall(pattern, content, re.DOTALL)
+def dialogue_pair(q):
+    """(第一句, 第二句)，第二句是空白时用答案填充"""
+    d1, d2 = q.dialogue[0], q.dialogue[-1]
+    d2_filled = d2.strip()
+    if d2_filled == '__________' or not d2_filled:
+        d2_filled = q.answer_text
+    return d1, d2_filled
 
-print(f'找到 {len(matches)} 道题目')
+# 翻译记忆库：整个题库的句子一次批量查询，未命中的交给本地词典
+# （banktools/data/dialogue_translations.json）翻译后写回，重复运行不再重复翻译
+os.makedirs(os.path.dirname(MEMORY_PATH), exist_ok=True)
+backend = IndexBackend(TranslationIndex.from_files(DIALOGUE_TRANSLATIONS))
+with TranslationMemory(MEMORY_PATH, backend=backend) as memory:
+    translated = memory.translate_many(text for q in questions for text in dialogue_pair(q))
+    print(f"翻译记忆库命中 {memory.stats['hits']} 句，新翻译 {memory.stats['backend']} 句，未翻译 {memory.stats['misses']} 句")
 
-# 翻译函数 - 基于对话内容生成中文翻译
 def translate_text(text):
-    """翻译英文文本为中文"""
-    text = text.strip()
-    
-    # 常见对话翻译字典
-    translations = {
-        # 邀请和回应
-        'Would you like another cup of tea?': '你想再喝一杯茶吗？',
-        'No, thanks.': '不了，谢谢。',
-        "I'd love to,": '我很想去，',
-        "but I'll have to attend an important meeting.": '但我必须参加一个重要会议。',
-        'Will you come to my graduation ceremony tomorrow?': '你明天会来参加我的毕业典礼吗？',
-        'Will you come to our party tonight?': '你今晚会来参加我们的聚会吗？',
-        
-        # 天气询问
-        "What's the weather like today?": '今天天气怎么样？',
-        "It's rather windy.": '风很大。',
-        "It's very well.": '很好。',
-        "Nice day, isn't it": '天气不错，不是吗？',
-        "Yes, a bit cold, though.": '是的，虽然有点冷。',
-        
-        # 电话对话
-        'Hello,': '你好，',
-        'may I speak to Ms. Sereno?': '我可以和塞雷诺女士通话吗？',
-        "I'm afraid she is not here right now.": '恐怕她现在不在这里。',
-        'may I speak to Mike?': '我可以和迈克通话吗？',
-        'Just a second, please.': '请稍等。',
-        
-        # 道歉和回应
-        'I cannot go out with you today because my mom is sick.': '我今天不能和你出去，因为我妈妈生病了。',
-        "I'm sorry to hear that.": '听到这个消息我很遗憾。',
-        "I'm sorry I'm late.": '对不起，我迟到了。',
-        "It doesn't matter.": '没关系。',
-        "That's all right.": '没关系。',
-        "I'm so sorry to interrupt you again.": '很抱歉再次打扰你。',
-        "It's all right.": '没关系。',
-        
-        # 评价和看法
-        "How is John's homework done?": '约翰的作业做得怎么样？',
-        'Pretty well.': '很好。',
-        "How do you like the movie?": '你觉得这部电影怎么样？',
-        "It tells a touching story.": '它讲述了一个感人的故事。',
-        "What do you think of this novel?": '你觉得这本小说怎么样？',
-        "It's well-written.": '写得很好。',
-        
-        # 语言能力
-        'Do you speak German?': '你会说德语吗？',
-        'A little.': '会一点。',
-        'Shall we speak German?': '我们讲德语好吗？',
-        
-        # 感谢和回应
-        "It's kind of you to give me a ride to the subway station.": '你真好，载我到地铁站。',
-        "It was my pleasure.": '不客气。',
-        "It's a pleasure.": '不客气。',
-        "Thank you for your invitation.": '谢谢你的邀请。',
-        
-        # 电话和联系
-        "Haven't you called your family this week?": '你这周还没给家里打电话吗？',
-        "Not yet, but I'm calling tomorrow.": '还没有，但我明天会打。',
-        
-        # 商店服务
-        'May I help you, Sir?': '先生，需要帮忙吗？',
-        "Yes. I'd like to have a look at this leather jacket.": '是的，我想看看这件皮夹克。',
-        "Yes, how much is this shirt?": '是的，这件衬衫多少钱？',
-        'May I help you?': '需要帮忙吗？',
-        
-        # 其他常见对话
-        "That's a beautiful dress you have on!": '你穿的这件裙子真漂亮！',
-        "Oh, thanks. My husband gives it to me as a birthday gift": '哦，谢谢。这是我丈夫送给我的生日礼物。',
-        "Oh, thanks. My husband gives it to me as a birthday gift.": '哦，谢谢。这是我丈夫送给我的生日礼物。',
-        "I really can't remember these grammar rules!": '我真的记不住这些语法规则！',
-        "You're not alone": '你不是一个人',
-        "Practice more.": '多练习。',
-        "Would you mind if I use your dictionary?": '你介意我用一下你的词典吗？',
-        "Of course not.": '当然不介意。',
-        "Here you are.": '给你。',
-        "Do you think they will fail in the examination?": '你认为他们会考试不及格吗？',
-        "No,": '不，',
-        "I don't think so.": '我不这么认为。',
-    }
-    
-    # 直接匹配
-    if text in translations:
-        return translations[text]
-    
-    # 部分匹配（处理标点差异）
-    for key, value in translations.items():
-        if text.replace('.', '').replace('?', '').replace('!', '').strip() == key.replace('.', '').replace('?', '').replace('!', '').strip():
-            return value
-    
-    # 如果没有找到翻译，返回原文（可以后续手动补充）
-    return text
+    """取批量翻译的结果，没有找到翻译时返回原文（可以后续手动补充）"""
+    return translated.get(text.strip()) or text.strip()
 
 # 重新构建文件内容
-output_lines = ['', '', '']
+def render_bank():
+    """逐行生成整个题库文件"""
+    yield from ('', '', '')
 
-for match in matches:
-    num, d1, d2, opt_a, opt_b, opt_c, opt_d, answer, old_trans, key_point, analysis = match
-    
-    # 确定第二句对话（如果是空白，用答案填充）
-    d2_filled = d2.strip()
-    if d2_filled == '__________' or not d2_filled:
-        options = {'A': opt_a.strip(), 'B': opt_b.strip(), 'C': opt_c.strip(), 'D': opt_d.strip()}
-        d2_filled = options[answer]
-    
-    # 生成中文译文
-    trans_d1 = translate_text(d1)
-    trans_d2 = translate_text(d2_filled)
-    
-    # 如果翻译后还是英文（说明字典中没有），至少确保格式正确
-    # 对于对话题，保持英文原文也是可以接受的，但我们会尽量翻译
-    
-    # 构建题目
-    output_lines.append(f'第{num}题')
-    output_lines.append('')
-    output_lines.append(f'原题：--- {d1.strip()}')
-    output_lines.append(f'    --- {d2.strip()}')
-    output_lines.append('选项：')
-    output_lines.append(f'A) {opt_a.strip()}')
-    output_lines.append(f'B) {opt_b.strip()}')
-    output_lines.append(f'C) {opt_c.strip()}')
-    output_lines.append(f'D) {opt_d.strip()}')
-    output_lines.append(f'你的答案：{answer}')
-    output_lines.append('核对结果：正确')
-    output_lines.append(f'译文：--- {trans_d1}')
-    output_lines.append(f'    --- {trans_d2}')
-    output_lines.append('')
-    output_lines.append('【考点·高效记忆】')
-    output_lines.append(key_point.strip())
-    output_lines.append('')
-    output_lines.append('【解析·秒选思路】')
-    output_lines.append(analysis.strip())
-    output_lines.append('')
-    output_lines.append('核心词（音标+拆解记忆）')
-    output_lines.append('')
-    output_lines.append('• dialogue /ˈdaɪəlɒɡ/：dia-（两者之间）+ logue（说）→ 对话')
-    output_lines.append('')
+    for q in questions:
+        d1, d2_filled = dialogue_pair(q)
+        
+        # 生成中文译文
+        trans_d1 = translate_text(d1)
+        trans_d2 = translate_text(d2_filled)
+        
+        # 如果翻译后还是英文（说明字典中没有），至少确保格式正确
+        # 对于对话题，保持英文原文也是可以接受的，但我们会尽量翻译
+        
+        # 构建题目
+        q = q._replace(
+            translation=(f'--- {trans_d1}', f'--- {trans_d2}'),
+            core_words=core_words.for_question(q) or (DIALOGUE_CORE_WORD,),
+        )
+        yield from render_numbered(q)
 
-# 写入文件
-with open('/Users/yuhuahuan/code/EHExam/resources/part-I.txt', 'w', encoding='utf-8') as f:
-    f.write('\n'.join(output_lines))
+# 写入文件（原子替换，内容不变则跳过）
+result = write_bank(BANK_PATH, render_bank())
+if not result.changed:
+    print('内容未变化，未改写文件')
 
-print(f'完成！已处理 {len(matches)} 道题目')
+print(f'完成！已处理 {len(questions)} 道题目')
 print('\\n注意：部分题目如果翻译字典中没有，会保持英文原文，可以后续手动补充。')
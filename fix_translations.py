@@ -4,11 +4,11 @@
 为part-I.txt补全所有题目的中文译文
 """
 
-import re
+from banktools import parse_bank, render_numbered
+from banktools.config import PART1_BANK
+from banktools.writer import write_bank
 
-# 读取part-I.txt
-with open('/Users/yuhuahuan/code/EHExam/resources/part-I.txt', 'r', encoding='utf-8') as f:
-    content = f.read()
+BANK_PATH = PART1_BANK
 
 # 翻译字典（基于对话内容）
 translations = {
@@ -136,32 +136,27 @@ def translate_dialogue(d1, d2, answer_text):
     return f'--- {trans_d1}\n    --- {trans_d2}'
 
 # 提取所有题目并更新译文
-pattern = r'(第(\d+)题\n\n原题：--- (.*?)\n    --- (.*?)\n选项：\nA\) (.*?)\nB\) (.*?)\nC\) (.*?)\nD\) (.*?)\n你的答案：([A-D])\n核对结果：正确\n译文：)(.*?)(\n\n【考点)'
+issues = []
+questions = list(parse_bank(BANK_PATH, issues))
+for issue in issues:
+    print(f'格式问题: {issue}')
 
-def replace_translation(match):
-    full_match = match.group(0)
-    num = match.group(2)
-    d1 = match.group(3)
-    d2 = match.group(4)
-    answer = match.group(9)
-    answer_text = match.group(int(ord(answer) - ord('A') + 5))  # 获取对应选项
-    
-    before_trans = match.group(1)
-    old_trans = match.group(11)
-    after_trans = match.group(12)
-    
-    # 检查是否需要翻译
-    if '---' in old_trans and not any('\u4e00' <= char <= '\u9fff' for char in old_trans):
-        new_trans = translate_dialogue(d1, d2, answer_text)
-        return before_trans + new_trans + after_trans
-    else:
-        return full_match
+def render_bank():
+    """逐行生成整个题库文件"""
+    yield from ('', '', '')
 
-# 替换所有需要翻译的部分
-new_content = re.sub(pattern, replace_translation, content, flags=re.DOTALL)
+    for q in questions:
+        old_trans = '\n'.join(q.translation)
+        
+        # 检查是否需要翻译
+        if '---' in old_trans and not any('\u4e00' <= char <= '\u9fff' for char in old_trans):
+            new_trans = translate_dialogue(q.dialogue[0], q.dialogue[-1], q.answer_text)
+            q = q._replace(translation=tuple(line.strip() for line in new_trans.split('\n')))
+        yield from render_numbered(q)
 
-# 写入文件
-with open('/Users/yuhuahuan/code/EHExam/resources/part-I.txt', 'w', encoding='utf-8') as f:
-    f.write(new_content)
+# 写入文件（原子替换，内容不变则跳过）
+result = write_bank(BANK_PATH, render_bank())
+if not result.changed:
+    print('内容未变化，未改写文件')
 
 print('译文补全完成！')
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量调用 DeepSeek 为题库生成智能解析，结果写成 JSON
+
+JSON 的键是题号；part3 等分试卷段落的题库各段题号重复，键为“段落:题号”（见 records.question_key）。
+相同的题只请求一次，结果缓存在 build/cache/analyses.sqlite，重复运行只请求新增或改动过的题。
+API Key 从环境变量 DEEPSEEK_API_KEY 读取；--mock 时启动本地替身服务，不联网，
+结果缓存在单独的 build/cache/analyses-mock.sqlite，不会被真实运行当作已有解析。
+"""
+
+import argparse
+import json
+import os
+import time
+
+from banktools import parse_bank
+from banktools.config import BUILD_DIR
+from banktools.llm import API_URL, AnalysisClient, ResultCache, analyze_questions
+from banktools.records import question_key
+
+parser = argparse.ArgumentParser(description='批量生成题目解析')
+parser.add_argument('bank', help='题库文件')
+parser.add_argument('--out', help='输出 JSON（默认 build/analyses/<题库名>.json）')
+parser.add_argument('--api-url', default=API_URL)
+parser.add_argument('--concurrency', type=int, default=8, help='同时在途的请求数')
+parser.add_argument('--retries', type=int, default=4)
+parser.add_argument('--cache', help='结果缓存（默认 build/cache/analyses.sqlite，--mock 时为 analyses-mock.sqlite）')
+parser.add_argument('--mock', action='store_true', help='使用本地替身服务')
+args = parser.parse_args()
+
+issues = []
+questions = list(parse_bank(args.bank, issues))
+for issue in issues:
+    print(f'格式问题: {issue}')
+print(f'找到 {len(questions)} 道题目')
+
+out = args.out or os.path.join(BUILD_DIR, 'analyses', os.path.splitext(os.path.basename(args.bank))[0] + '.json')
+cache_path = args.cache or os.path.join(BUILD_DIR, 'cache', 'analyses-mock.sqlite' if args.mock else 'analyses.sqlite')
+os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+
+server = None
+api_url = args.api_url
+if args.mock:
+    from banktools.mockserver import MockServer
+    server = MockServer().start()
+    api_url = server.url
+
+cache = ResultCache(cache_path)
+client = AnalysisClient(api_url, cache=cache, concurrency=args.concurrency, retries=args.retries,
+                        cache_scope='mock' if args.mock else None)
+if not client.api_key and not args.mock:
+    print('警告：未设置 DEEPSEEK_API_KEY')
+
+start = time.perf_counter()
+try:
+    results = analyze_questions(questions, client)
+    elapsed = time.perf_counter() - start
+finally:
+    cache.close()
+    if server is not None:
+        server.stop()
+
+analyses = {question_key(q): content for q, content in zip(questions, results) if content is not None}
+with open(out, 'w', encoding='utf-8') as f:
+    json.dump(analyses, f, ensure_ascii=False, indent=2)
+
+stats = client.stats
+print(f"请求 {stats['requests']} 次（重试 {stats['retries']}），缓存命中 {stats['cached']}，"
+      f"重复题合并 {stats['deduped']}，失败 {stats['failed']}，用时 {elapsed:.1f} 秒")
+for key, error in client.errors.items():
+    print(f'失败: {key[:8]} {error}')
+print(f'已生成: {out}')
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+检查所有题库的结构（缺少答案、答案不在选项中、题号重复、缺少译文……）
+
+    python3 lint_banks.py                        # 检查 resources/ 下全部题库
+    python3 lint_banks.py resources/part-110.txt --json -
+    python3 lint_banks.py --json build/lint.json --no-cache
+
+有 error 级别的问题时以状态 1 退出；规则列表见 banktools/lint.py 的 RULES。
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from banktools.config import BUILD_DIR, RESOURCES_DIR
+from banktools.lint import ERROR, RULES, WARNING, lint_banks
+from banktools.parser import bank_paths
+
+parser = argparse.ArgumentParser(description='检查题库结构')
+parser.add_argument('paths', nargs='*', help='题库文件，默认为 resources/ 下的全部题库')
+parser.add_argument('--resources', default=RESOURCES_DIR, help='题库目录')
+parser.add_argument('--jobs', type=int, help='进程数，默认为 CPU 核数')
+parser.add_argument('--cache', default=os.path.join(BUILD_DIR, 'cache', 'lint.json'), help='结果缓存')
+parser.add_argument('--no-cache', action='store_true', help='不读写缓存，全部重新检查')
+parser.add_argument('--json', metavar='PATH', help='把检查结果以 JSON 写入 PATH（- 表示标准输出）')
+parser.add_argument('--limit', type=int, default=20, help='每个文件最多列出的问题数')
+args = parser.parse_args()
+
+paths = args.paths or bank_paths(args.resources)
+start = time.perf_counter()
+results = lint_banks(paths, None if args.no_cache else args.cache, args.jobs)
+elapsed = time.perf_counter() - start
+
+errors = sum(r.count(ERROR) for r in results)
+warnings = sum(r.count(WARNING) for r in results)
+
+if args.json == '-':
+    print(json.dumps({'errors': errors, 'warnings': warnings, 'files': [r.to_dict() for r in results]},
+                     ensure_ascii=False, indent=2))
+else:
+    for result in results:
+        note = '（缓存）' if result.cached else ''
+        print(f'{result.path}: {result.questions} 题，{result.count(ERROR)} 个错误，'
+              f'{result.count(WARNING)} 个警告{note}')
+        for finding in result.findings[:args.limit]:
+            where = f'第{finding.number}题 ' if finding.number else ''
+            print(f'  {finding.line}: [{finding.severity}] {finding.rule} {where}{finding.message}')
+        if len(result.findings) > args.limit:
+            print(f'  ……还有 {len(result.findings) - args.limit} 条')
+    cached = sum(1 for r in results if r.cached)
+    print(f'\n共 {len(results)} 个文件（缓存 {cached} 个），{errors} 个错误，{warnings} 个警告，'
+          f'{elapsed * 1000:.0f} ms')
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'errors': errors, 'warnings': warnings, 'rules': RULES,
+                       'files': [r.to_dict() for r in results]}, f, ensure_ascii=False, indent=2)
+        print(f'检查结果已写入: {args.json}')
+
+sys.exit(1 if errors else 0)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+一次完成 Part I 题库的 抽取 → 翻译 → 分析 → 校验 → 写盘
+
+代替依次运行 regenerate_part1_complete.py、fix_all_translations.py、verify_part1.py，
+各阶段共用内存中的同一份题目，题库只写一次。输入输出都没变时立即返回。
+
+    python3 run_pipeline.py
+    python3 run_pipeline.py --sources ~/papers --bank resources/part-I.txt --json build/verify.json
+    EHEXAM_METRICS=build/metrics.jsonl python3 run_pipeline.py --force
+
+路径默认值见 banktools/config.py，也可以用环境变量 EHEXAM_SOURCES / EHEXAM_RESOURCES / EHEXAM_BUILD 指定。
+"""
+
+import argparse
+import sys
+import time
+
+from banktools.config import BUILD_DIR, PART1_BANK, SOURCES_DIR, source_papers
+from banktools.metrics import metrics_from_env
+from banktools.pipeline import Pipeline, PipelineConfig
+
+parser = argparse.ArgumentParser(description='Part I 题库一体化流水线')
+parser.add_argument('--sources', default=SOURCES_DIR, help='原始试卷目录')
+parser.add_argument('--bank', default=PART1_BANK, help='输出的题库文件')
+parser.add_argument('--build', default=BUILD_DIR, help='生成物目录（词表、缓存）')
+parser.add_argument('--force', action='store_true', help='即使输入输出都没变也重跑')
+parser.add_argument('--json', metavar='PATH', help='把校验结果以 JSON 写入 PATH（- 表示标准输出）')
+args = parser.parse_args()
+
+start = time.perf_counter()
+metrics, metrics_path = metrics_from_env('run_pipeline')
+config = PipelineConfig(tuple(source_papers(args.sources)), args.bank, args.build, args.force)
+result = Pipeline(config, metrics).run()
+elapsed = time.perf_counter() - start
+
+if result.skipped:
+    print(f'输入和题库都没有变化，跳过（{elapsed * 1000:.0f} ms）: {args.bank}')
+    sys.exit(0)
+
+for error in result.errors:
+    print(f'试卷问题: {error}')
+if result.unreadable:
+    print(f'有 {result.unreadable} 份试卷读取失败，未改写题库: {args.bank}')
+elif result.changed:
+    print(f'文件已生成: {args.bank}')
+else:
+    print(f'内容未变化，未改写文件: {args.bank}')
+print(f'题目总数: {result.questions}（{elapsed * 1000:.0f} ms）')
+
+report = result.report
+for line in report.summary():
+    print(line)
+if args.json == '-':
+    print(report.to_json())
+elif args.json:
+    with open(args.json, 'w', encoding='utf-8') as f:
+        f.write(report.to_json() + '\n')
+    print(f'\n检查结果已写入: {args.json}')
+
+if metrics.enabled:
+    for line in metrics.summary():
+        print(line)
+    metrics.dump(metrics_path)
+    print(f'运行指标已追加到: {metrics_path}')
+
+if result.unreadable:
+    sys.exit(1)
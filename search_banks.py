@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+在所有题库中全文检索题目，例如：
+    python3 search_banks.py "regardless of"
+    python3 search_banks.py 定语从句 --field 考点
+索引保存在 build/search.sqlite，每次查询前只重新索引有改动的题库
+"""
+
+import argparse
+import os
+import time
+
+from banktools.config import BUILD_DIR, RESOURCES_DIR
+from banktools.search import FIELDS, SearchIndex
+
+parser = argparse.ArgumentParser(description='题库全文检索')
+parser.add_argument('query', help='查询词（多个词时要求全部出现）')
+parser.add_argument('--field', action='append', choices=list(FIELDS), help='只在指定字段中检索，可重复')
+parser.add_argument('--bank', help='只检索指定题库，如 part-110')
+parser.add_argument('--limit', type=int, default=10)
+parser.add_argument('--resources', default=RESOURCES_DIR, help='题库目录')
+parser.add_argument('--index', default=os.path.join(BUILD_DIR, 'search.sqlite'), help='索引文件')
+args = parser.parse_args()
+
+os.makedirs(os.path.dirname(os.path.abspath(args.index)), exist_ok=True)
+
+with SearchIndex(args.index) as index:
+    start = time.perf_counter()
+    index.update_resources(args.resources)
+    indexed = time.perf_counter() - start
+    if index.stats['added'] or index.stats['removed'] or index.stats['moved']:
+        print(f"索引已更新：新增 {index.stats['added']}，删除 {index.stats['removed']}，"
+              f"移动 {index.stats['moved']}，用时 {indexed * 1000:.0f} ms")
+
+    start = time.perf_counter()
+    hits = index.search(args.query, limit=args.limit, fields=args.field, bank=args.bank)
+    elapsed = time.perf_counter() - start
+
+for hit in hits:
+    print(f"{hit.bank} 第{hit.number}题（第{hit.line}行） {hit.score:.2f} [{'/'.join(hit.fields)}]")
+    print(f'    {hit.snippet}')
+print(f'共 {len(hits)} 条结果，用时 {elapsed * 1000:.1f} ms')
@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""测试共用的路径：仓库根目录加入 sys.path，题库取仓库自带的 resources/"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESOURCES = os.path.join(ROOT, 'resources')
+
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
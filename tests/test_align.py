@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+import os
+import random
+
+from banktools.align import align, keys
+from banktools.parser import parse_bank
+from conftest import RESOURCES
+
+QUESTIONS = list(parse_bank(os.path.join(RESOURCES, 'part-I.txt')))
+
+
+def _edit(question, prefix='Well, '):
+    stem = list(question.stem)
+    stem[0] = '--- ' + prefix + stem[0][4:] if stem[0].startswith('--- ') else prefix + stem[0]
+    return question._replace(stem=tuple(stem))
+
+
+def test_identical_banks_align_exactly():
+    result = align(QUESTIONS, QUESTIONS)
+    assert result.pairs == [(i, i) for i in range(len(QUESTIONS))]
+    assert not (result.edits or result.inserts or result.deletes or result.moved)
+
+
+def test_insert():
+    extra = QUESTIONS[0]._replace(stem=('--- Totally unrelated sentence about quantum physics.',),
+                                  options=(('A', 'x'), ('B', 'y'), ('C', 'z'), ('D', 'w')))
+    bank = QUESTIONS[:20] + [extra] + QUESTIONS[20:]
+    result = align(bank, QUESTIONS)
+    assert result.inserts == [20]
+    assert not (result.deletes or result.edits or result.moved)
+
+
+def test_delete():
+    bank = QUESTIONS[:7] + QUESTIONS[8:]
+    result = align(bank, QUESTIONS)
+    assert result.deletes == [7]
+    assert not (result.inserts or result.edits or result.moved)
+
+
+def test_edit():
+    bank = list(QUESTIONS)
+    bank[12] = _edit(bank[12])
+    bank[30] = bank[30]._replace(options=bank[30].options[:1] + (('B', 'changed'),) + bank[30].options[2:])
+    result = align(bank, QUESTIONS)
+    assert result.edits == [(12, 12), (30, 30)]
+    assert not (result.inserts or result.deletes or result.moved)
+
+
+def test_move():
+    bank = list(QUESTIONS)
+    bank.insert(40, bank.pop(5))
+    result = align(bank, QUESTIONS)
+    assert sorted(result.matched()) == sorted((i, QUESTIONS.index(q)) for i, q in enumerate(bank))
+    assert [bank[i] for i in result.moved] == [QUESTIONS[5]]
+    assert not (result.inserts or result.deletes or result.edits)
+
+
+def test_edit_next_to_delete_pairs_with_its_own_source():
+    # part-I 中有内容完全相同的题（如第 6、56 题），配到哪一道都算对，按内容比较
+    def same(j, k):
+        return keys(QUESTIONS[j]) == keys(QUESTIONS[k])
+
+    rng = random.Random(0)
+    for _ in range(200):
+        deleted, edited = rng.sample(range(len(QUESTIONS)), 2)
+        bank = [_edit(q) if i == edited else q for i, q in enumerate(QUESTIONS) if i != deleted]
+        position = edited - (deleted < edited)
+        result = align(bank, QUESTIONS)
+        assert len(result.deletes) == 1 and same(result.deletes[0], deleted)
+        assert len(result.edits) == 1
+        assert result.edits[0][0] == position and same(result.edits[0][1], edited)
+        assert not result.inserts
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+import os
+
+from banktools.bundle import BundleReader, bundle_banks
+from banktools.parser import bank_paths, parse_bank
+from banktools.store import question_payload
+from conftest import RESOURCES
+
+
+def _check(path, bank):
+    with BundleReader(path) as reader:
+        assert list(reader) == [question_payload(q, i) for i, q in enumerate(parse_bank(bank), 1)]
+
+
+def test_rebundling_a_subset_keeps_other_bundles_readable(tmp_path):
+    paths = bank_paths(RESOURCES)
+    part1 = os.path.join(RESOURCES, 'part-I.txt')
+    bundle_banks(paths, str(tmp_path))
+    before = sorted(name for name in os.listdir(tmp_path) if name.endswith('.zdict'))
+    assert len(before) == 1
+
+    bundle_banks([part1], str(tmp_path))
+    dictionaries = sorted(name for name in os.listdir(tmp_path) if name.endswith('.zdict'))
+    assert len(dictionaries) == 2 and before[0] in dictionaries
+    for bank in paths:
+        _check(os.path.join(tmp_path, os.path.splitext(os.path.basename(bank))[0] + '.ehxb'), bank)
+
+    # 全部重新打包后，只剩新字典
+    bundle_banks(paths, str(tmp_path))
+    assert len([name for name in os.listdir(tmp_path) if name.endswith('.zdict')]) == 1
+    for bank in paths:
+        _check(os.path.join(tmp_path, os.path.splitext(os.path.basename(bank))[0] + '.ehxb'), bank)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import importlib
+import sys
+
+from banktools.cache import BuildCache, module_hash
+
+
+def test_module_hash_covers_imported_submodules(tmp_path, monkeypatch):
+    package = tmp_path / 'fakepkg'
+    package.mkdir()
+    (package / '__init__.py').write_text('', encoding='utf-8')
+    (package / 'render.py').write_text('WIDTH = 1\n', encoding='utf-8')
+    (package / 'unused.py').write_text('', encoding='utf-8')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        importlib.import_module('fakepkg.render')
+        before = module_hash('fakepkg')
+        # 没导入的模块不影响指纹
+        (package / 'unused.py').write_text('X = 2\n', encoding='utf-8')
+        assert module_hash('fakepkg') == before
+        (package / 'render.py').write_text('WIDTH = 2\n', encoding='utf-8')
+        assert module_hash('fakepkg') != before
+    finally:
+        for name in [name for name in sys.modules if name.split('.')[0] == 'fakepkg']:
+            del sys.modules[name]
+
+
+def test_regenerate_dependencies_are_hashed():
+    import banktools.part1  # noqa: F401  regenerate_part1_complete.py 导入的模块
+    import banktools.lexicon  # noqa: F401
+
+    names = {name for name in sys.modules if name.startswith('banktools.')}
+    assert {'banktools.part1', 'banktools.fuzzy', 'banktools.render', 'banktools.rules',
+            'banktools.lexicon', 'banktools.records', 'banktools.sources'} <= names
+
+
+def test_block_kinds_are_separate(tmp_path):
+    path = str(tmp_path / 'cache.json')
+    cache = BuildCache(path, 'v1')
+    cache.put_block('k', ['第1题'])
+    cache.put_block('k', [['译文一', '译文二'], 'exact'], 'stages')
+    cache.save()
+
+    cache = BuildCache(path, 'v1')
+    assert cache.get_block('k', 'stages') == [['译文一', '译文二'], 'exact']
+    assert cache.get_block('missing', 'stages') is None
+    assert cache.get_block('k') == ['第1题']
+    assert (cache.hits, cache.misses) == ({'sources': 0, 'blocks': 1, 'stages': 1},
+                                          {'sources': 0, 'blocks': 0, 'stages': 1})
+    # 指纹变了全部作废
+    assert BuildCache(path, 'v2').get_block('k', 'stages') is None
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+
+from banktools import iter_banks
+from banktools.dedupe import find_duplicates
+from conftest import RESOURCES
+
+
+def test_ids_are_unique_and_independent_of_lines(tmp_path):
+    questions = list(iter_banks(RESOURCES))
+    _, mapping = find_duplicates(questions)
+    assert len(mapping) == len(questions)
+    assert not any('@' in qid for qid in mapping)
+
+    # 在题库开头加几行，题目 id 与映射不变
+    resources = tmp_path / 'resources'
+    shutil.copytree(RESOURCES, resources)
+    bank = resources / 'part3-2021-75.txt'
+    bank.write_text('\n\n' + bank.read_text(encoding='utf-8'), encoding='utf-8')
+    _, shifted = find_duplicates(iter_banks(str(resources)))
+    assert shifted == mapping
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import random
+
+from banktools.fuzzy import FuzzyIndex, ngrams
+
+_WORDS = ('the', 'would', 'you', 'like', 'to', 'have', 'some', 'more', 'tea', 'and', 'it', 'is',
+          'a', 'of', 'in', 'that', 'we', 'they', 'there', 'this', 'will', 'be', 'very', 'good')
+
+
+def _dice(a: str, b: str) -> float:
+    x, y = ngrams(a), ngrams(b)
+    return 2.0 * len(x & y) / (len(x) + len(y))
+
+
+def _index(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    keys = [' '.join(rng.choice(_WORDS) for _ in range(rng.randint(5, 9))) + f' {rng.choice(_WORDS)}{i}'
+            for i in range(count)]
+    index = FuzzyIndex()
+    for i, key in enumerate(keys):
+        index.add(key, i)
+    return index, keys, rng
+
+
+def test_common_grams_do_not_deflate_scores_at_scale():
+    index, keys, rng = _index(30000)
+    assert any(len(p) > index.max_postings for p in index._postings.values())
+    for _ in range(50):
+        target = rng.randrange(len(keys))
+        query = keys[target].replace(' ', ', ', 1) + ' please'
+        found = index.best(query)
+        assert found is not None
+        assert found.score == max(_dice(query, keys[found.value]), _dice(query, keys[target]))
+        assert found.score >= _dice(query, keys[target])
+
+
+def test_search_returns_exact_scores_and_true_best():
+    index, keys, rng = _index(3000, seed=1)
+    index.max_postings = 50
+    for _ in range(20):
+        query = keys[rng.randrange(len(keys))] + ' today'
+        found = index.search(query, limit=3, min_score=0.3)
+        assert found[0].score == max(_dice(query, k) for k in keys)
+        assert [m.score for m in found] == sorted((_dice(query, m.key) for m in found), reverse=True)
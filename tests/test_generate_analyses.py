@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import subprocess
+import sys
+
+from banktools.llm import AnalysisClient, ResultCache, request_body
+from banktools.parser import parse_bank
+from conftest import RESOURCES, ROOT
+
+
+def test_part3_keys_do_not_collide(tmp_path):
+    bank = os.path.join(RESOURCES, 'part3-2021-75.txt')
+    out = tmp_path / 'out.json'
+    env = dict(os.environ, EHEXAM_BUILD=str(tmp_path / 'build'))
+    subprocess.run([sys.executable, os.path.join(ROOT, 'generate_analyses.py'), bank, '--mock', '--out', str(out)],
+                   check=True, env=env, capture_output=True)
+    analyses = json.loads(out.read_text(encoding='utf-8'))
+    assert len(analyses) == len(list(parse_bank(bank))) == 73
+    # 缓存写在 EHEXAM_BUILD 下，且与真实运行的缓存分开
+    assert (tmp_path / 'build' / 'cache' / 'analyses-mock.sqlite').exists()
+    assert not (tmp_path / 'build' / 'cache' / 'analyses.sqlite').exists()
+
+
+def test_cache_is_scoped_by_endpoint(tmp_path):
+    cache = ResultCache(str(tmp_path / 'cache.sqlite'))
+    body = request_body('题目：hello')
+    mock = AnalysisClient('http://127.0.0.1:1/v1/chat/completions', cache=cache, cache_scope='mock')
+    real = AnalysisClient('https://api.deepseek.com/v1/chat/completions', cache=cache)
+    cache.put(mock.cache_key(body), 'mock content')
+    assert cache.get(mock.cache_key(body)) == 'mock content'
+    assert real.cache_key(body) != mock.cache_key(body)
+    assert cache.get(real.cache_key(body)) is None
+    cache.close()
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+from banktools.glossary import Glossary, compile_glossary, headword
+from banktools.parser import bank_paths, parse_bank
+from banktools.records import CoreWord
+from conftest import RESOURCES
+
+
+def _word(raw):
+    return CoreWord('', '', '', raw)
+
+
+def test_headword_without_phonetic_or_colon():
+    assert headword(_word('regardless of 不顾；不管（固定短语）。')) == ('regardless of', '', '不顾；不管（固定短语）。')
+    assert headword(_word('draw up 制定；起草。')) == ('draw up', '', '制定；起草。')
+    assert headword(_word('所有格规则：共同所有A and B’s；各自所有A’s and B’s。')) is None
+    assert headword(_word('so + 助动词 + 主语 表“……也一样”（倒装）。')) is None
+
+
+def test_part3_phrases_can_be_looked_up(tmp_path):
+    path = str(tmp_path / 'glossary.bin')
+    compile_glossary(bank_paths(RESOURCES), path)
+    with Glossary(path) as glossary:
+        for phrase, bank in (('regardless of', 'part3-2021-75'), ('lead to', 'part3-2021-75'),
+                             ('draw up', 'part-en-60'), ('in spite of', 'part3-2024-75')):
+            entry = glossary.get(phrase)
+            assert entry is not None, phrase
+            assert entry.explanation
+            assert any(ref.bank == bank for ref in entry.references)
+
+    # 只有中文的规则条目不收，其余英文词条都收
+    skipped = [w.raw for p in bank_paths(RESOURCES) for q in parse_bank(p) for w in q.core_words
+               if headword(w) is None]
+    assert skipped and all(not w[0].isascii() or w.startswith('so +') for w in skipped)
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+from banktools.lint import ERROR, LintResult, lint_banks
+from banktools.parser import bank_paths
+from conftest import RESOURCES, ROOT
+
+
+def errors(result):
+    return [(f.rule, f.number) for f in result.findings if f.severity == ERROR]
+
+
+def test_pool_cache_and_incremental(tmp_path):
+    resources = tmp_path / 'resources'
+    shutil.copytree(RESOURCES, resources)
+    paths = bank_paths(str(resources))
+    cache = str(tmp_path / 'lint.json')
+
+    first = lint_banks(paths, cache, jobs=2)  # 多个文件走进程池
+    by_name = {os.path.basename(r.path): r for r in first}
+    assert errors(by_name['part-110.txt']) == [('bad_options', 95)]
+    assert errors(by_name['part3-2021-75.txt']) == [('bad_options', 44), ('missing_answer', 49)]
+    assert not any(r.cached for r in first)
+    assert [r.path for r in first] == paths
+    # 进程池与单进程结果一致
+    assert [r.findings for r in lint_banks(paths, jobs=1)] == [r.findings for r in first]
+
+    second = lint_banks(paths, cache, jobs=2)
+    assert all(r.cached for r in second)
+    assert [r.findings for r in second] == [r.findings for r in first]
+
+    edited = resources / 'part-I.txt'
+    edited.write_text(edited.read_text(encoding='utf-8') + '\n', encoding='utf-8')
+    third = lint_banks(paths, cache, jobs=2)
+    assert [r.path for r in third if not r.cached] == [str(edited)]
+
+
+def test_json_report(tmp_path):
+    env = dict(os.environ, EHEXAM_RESOURCES=RESOURCES, EHEXAM_BUILD=str(tmp_path / 'build'))
+    run = subprocess.run([sys.executable, os.path.join(ROOT, 'lint_banks.py'), '--json', '-'],
+                         env=env, capture_output=True, text=True)
+    assert run.returncode == 1  # 有 error 级别的问题
+    report = json.loads(run.stdout)
+    assert report['errors'] == 3
+    files = {os.path.basename(f['path']): f for f in report['files']}
+    assert files['part-110.txt']['errors'] == 1
+    result = LintResult.from_dict(files['part3-2021-75.txt'])
+    assert errors(result) == [('bad_options', 44), ('missing_answer', 49)]
+    assert (tmp_path / 'build' / 'cache' / 'lint.json').exists()
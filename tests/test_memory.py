@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import subprocess
+import sys
+
+from banktools.memory import IndexBackend, StubBackend, TranslationMemory
+from banktools.parser import parse_bank
+from banktools.translation import DIALOGUE_TRANSLATIONS, TranslationIndex
+from conftest import RESOURCES, ROOT
+
+
+def part1_sentences():
+    texts = []
+    for q in parse_bank(os.path.join(RESOURCES, 'part-I.txt')):
+        texts.extend((q.dialogue[0], q.dialogue[-1], q.answer_text))
+    return texts
+
+
+def test_same_as_dictionary_cold_and_warm(tmp_path):
+    index = TranslationIndex.from_files(DIALOGUE_TRANSLATIONS)
+    # 只差标点或大小写的句子也要与直接查词典的结果一致
+    texts = part1_sentences()
+    texts += [text.upper() for text in texts] + [text.rstrip('.?!') + ' .' for text in texts]
+    expected = {text.strip(): index.translate(text) for text in texts}
+    path = str(tmp_path / 'memory.sqlite')
+    for _ in range(2):
+        with TranslationMemory(path, backend=IndexBackend(index)) as memory:
+            translated = memory.translate_many(texts)
+        assert {text: target or text for text, target in translated.items()} == expected
+
+
+def test_misses_are_remembered(tmp_path):
+    path = str(tmp_path / 'memory.sqlite')
+    index = TranslationIndex([('Hello.', '你好。')])
+    with TranslationMemory(path, backend=IndexBackend(index)) as memory:
+        assert memory.translate_many(['Hello.', 'Goodbye.']) == {'Hello.': '你好。', 'Goodbye.': None}
+        assert memory.stats == {'hits': 0, 'backend': 1, 'misses': 1}
+
+    class Counting(IndexBackend):
+        calls = 0
+
+        def translate_batch(self, texts):
+            Counting.calls += len(texts)
+            return super().translate_batch(texts)
+
+    with TranslationMemory(path, backend=Counting(index)) as memory:
+        assert memory.translate_many(['Hello.', 'Goodbye.']) == {'Hello.': '你好。', 'Goodbye.': None}
+    assert Counting.calls == 0
+
+
+def test_dictionary_change_invalidates(tmp_path):
+    path = str(tmp_path / 'memory.sqlite')
+    with TranslationMemory(path, backend=IndexBackend(TranslationIndex([('Hello.', '哈喽。')]))) as memory:
+        memory.translate_many(['Hello.', 'Goodbye.'])
+    fixed = TranslationIndex([('Hello.', '你好。'), ('Goodbye.', '再见。')])
+    with TranslationMemory(path, backend=IndexBackend(fixed)) as memory:
+        assert memory.translate_many(['Hello.', 'Goodbye.']) == {'Hello.': '你好。', 'Goodbye.': '再见。'}
+        assert memory.stats['backend'] == 2
+
+
+def test_manual_entries_survive_backend_change(tmp_path):
+    path = str(tmp_path / 'memory.sqlite')
+    backend = StubBackend()
+    with TranslationMemory(path, backend=backend) as memory:
+        memory.put_many([('Hello.', '您好。')])
+        assert memory.translate_many(['Hello.', 'Bye.']) == {'Hello.': '您好。', 'Bye.': '[译]Bye.'}
+    assert backend.calls == [1]
+
+
+def test_fix_all_translations_output(tmp_path):
+    resources = tmp_path / 'resources'
+    shutil.copytree(RESOURCES, resources)
+    bank = resources / 'part-I.txt'
+    env = dict(os.environ, EHEXAM_RESOURCES=str(resources), EHEXAM_BUILD=str(tmp_path / 'build'))
+    script = os.path.join(ROOT, 'fix_all_translations.py')
+    subprocess.run([sys.executable, script], check=True, env=env, capture_output=True)
+    cold = bank.read_bytes()
+    warm_run = subprocess.run([sys.executable, script], check=True, env=env, capture_output=True, text=True)
+    assert '新翻译 0 句' in warm_run.stdout
+    assert bank.read_bytes() == cold
+
+    # 译文逐句等于直接查词典（没有记忆库时的做法）的结果
+    index = TranslationIndex.from_files(DIALOGUE_TRANSLATIONS)
+    for q in parse_bank(str(bank)):
+        d2 = q.dialogue[-1].strip()
+        if d2 == '__________' or not d2:
+            d2 = q.answer_text
+        assert q.translation == (f'--- {index.translate(q.dialogue[0])}', f'--- {index.translate(d2)}')
+
+
+def test_manual_digest_ignores_backend_entries(tmp_path):
+    path = str(tmp_path / 'memory.sqlite')
+    with TranslationMemory(path, backend=StubBackend()) as memory:
+        empty = memory.manual_digest()
+        memory.translate_many(['Hello.'])
+        assert memory.manual_digest() == empty
+        memory.put_many([('Hello.', '你好！')])
+        manual = memory.manual_digest()
+        assert manual != empty
+        memory.put_many([('Hello.', '你好。')])
+        assert memory.manual_digest() != manual
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+import os
+import re
+
+import pytest
+
+from banktools.parser import LAYOUT_INLINE, LAYOUT_NUMBERED, detect_layout, iter_inline, iter_numbered, parse_bank
+from banktools.records import question_key
+from conftest import RESOURCES
+
+NUMBERED = '''第1题
+
+原题：--- Would you like another cup of tea?
+    --- __________
+选项：
+A) Yes, I do.
+B) No, thanks.
+C) Here you are.
+D) Help yourself.
+你的答案：B
+核对结果：正确
+译文：--- 你想再喝一杯茶吗？
+    --- 不了，谢谢。
+
+【考点·高效记忆】
+婉拒邀请
+【解析·秒选思路】
+礼貌拒绝用 No, thanks.
+
+核心词（音标+拆解记忆）
+
+• tea /tiː/：茶
+
+第2题
+
+原题：--- How are you?
+    --- __________
+选项：
+你的答案：A
+核对结果：正确
+译文：--- 你好吗？
+
+第3题
+
+原题：--- Thank you.
+    --- __________
+选项：
+A) You're welcome.
+B) Yes.
+C) No.
+D) OK.
+你的答案：A
+核对结果：正确
+译文：--- 谢谢。
+'''
+
+INLINE = '''2021模拟试题一（31-55题）
+
+31
+
+题目：___________ many years later did she learn the truth.
+A. Hardly
+B. Not only
+C. Not until
+D. Never
+
+答案：C. Not until
+译文：直到多年后她才得知真相。
+考点·高效记忆：倒装
+解析·秒选思路：Not until 放句首
+易错点提示：Hardly 需接 when
+核心词：truth /truːθ/ (n. 真相)
+
+2021模拟试题二（31-55题）
+
+31
+
+题目：The waitress was so __________.
+A. cruel
+B. raw
+C. rude
+D. remote
+
+答案：C. rude
+译文：服务员太粗鲁了。
+
+三套试卷答案汇总
+
+31
+
+题目：这一段不是题目
+'''
+
+
+def test_iter_numbered():
+    issues = []
+    questions = list(iter_numbered(NUMBERED.split('\n'), 'fixture.txt', issues))
+    assert [q.number for q in questions] == [1, 3]
+    first = questions[0]
+    assert first.dialogue == ('Would you like another cup of tea?', '__________')
+    assert first.options[1] == ('B', 'No, thanks.') and first.answer_text == 'No, thanks.'
+    assert first.translation == ('--- 你想再喝一杯茶吗？', '--- 不了，谢谢。')
+    assert first.key_point == ('婉拒邀请',) and first.analysis == ('礼貌拒绝用 No, thanks.',)
+    assert [w.word for w in first.core_words] == ['tea'] and first.line == 1
+
+
+def test_malformed_block_is_skipped_not_merged():
+    issues = []
+    questions = list(iter_numbered(NUMBERED.split('\n'), 'fixture.txt', issues))
+    assert [(i.line, i.number, i.code) for i in issues] == [(24, 2, 'bad_options')]
+    third = questions[1]
+    assert third.line == 33 and third.dialogue == ('Thank you.', '__________')
+    assert third.translation == ('--- 谢谢。',)
+
+
+def test_iter_inline_sections_and_summary():
+    issues = []
+    lines = INLINE.split('\n')
+    parser = iter_inline(lines, 'fixture.txt', issues)
+    questions = []
+    with pytest.raises(StopIteration) as stop:
+        while True:
+            questions.append(next(parser))
+    # 答案汇总之后不再解析，生成器返回 None
+    assert stop.value.value is None
+    assert issues == []
+    assert [(q.section, q.number) for q in questions] == [
+        ('2021模拟试题一（31-55题）', 31), ('2021模拟试题二（31-55题）', 31)]
+    first = questions[0]
+    assert first.answer == 'C' and first.delimiter == '.'
+    assert first.pitfall == ('Hardly 需接 when',) and first.core_words[0].word == 'truth'
+    assert questions[1].key_point == ()
+
+
+def test_inline_malformed_block():
+    text = INLINE.replace('B. raw\n', 'B raw\n')
+    issues = []
+    questions = list(iter_inline(text.split('\n'), 'fixture.txt', issues))
+    codes = [(i.line, i.number, i.code) for i in issues]
+    assert codes == [(24, 31, 'unrecognized_line'), (20, 31, 'bad_options')]
+    assert [q.section for q in questions] == ['2021模拟试题一（31-55题）']
+
+
+def test_detect_layout():
+    for text, layout in ((NUMBERED, LAYOUT_NUMBERED), (INLINE, LAYOUT_INLINE)):
+        detected, lines = detect_layout(iter(text.split('\n')))
+        assert detected == layout
+        # 返回的迭代器从头开始，不丢行
+        assert list(lines) == text.split('\n')
+
+
+@pytest.mark.parametrize('name', ['part3-2021-75.txt', 'part3-2024-75.txt'])
+def test_part3_section_number_round_trip(name):
+    questions = list(parse_bank(os.path.join(RESOURCES, name)))
+    keys = [question_key(q) for q in questions]
+    assert len(set(keys)) == len(keys)
+    assert len({q.section for q in questions}) == 3
+    for q in questions:
+        low, high = map(int, re.search(r'(\d+)-(\d+)', q.section).groups())
+        assert low <= q.number <= high
+        section, _, number = question_key(q).rpartition(':')
+        assert (section, int(number)) == (q.section, q.number)
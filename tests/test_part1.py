@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+from banktools.metrics import Metrics
+from banktools.part1 import DialogueTranslator, translate_items
+from banktools.pipeline import Pipeline, PipelineConfig
+
+
+def item(d1, d2, answer_text):
+    return {'num': '1', 'dialogue1': d1, 'dialogue2': d2, 'A': answer_text, 'B': 'b', 'C': 'c', 'D': 'd',
+            'answer': 'A'}
+
+
+def test_sentence_fallback(tmp_path):
+    translator = DialogueTranslator({('Hello.', 'Hi.'): ('你好。', '嗨。')})
+    items = [item('Hello.', 'Hi.', 'x'),
+             item('Would you like another cup of tea?', '__________', 'No, thanks.'),
+             item('Zyxw qrst vut?', '__________', 'Plmo.')]
+    metrics = Metrics('test')
+    results = translate_items(items, str(tmp_path / 'memory.sqlite'), translator, metrics)
+    assert results == [
+        (('你好。', '嗨。'), 'exact'),
+        (('你想再喝一杯茶吗？', '不了，谢谢。'), 'fallback'),
+        (('Zyxw qrst vut?', 'Plmo.'), 'fallback'),  # 都没有的句子保持原文
+    ]
+    assert metrics.counters['translation'] == {'exact': 1, 'fallback': 2}
+
+
+def test_pipeline_uses_shared_fallback(tmp_path):
+    items = [item('Would you like another cup of tea?', '__________', 'No, thanks.')]
+    config = PipelineConfig(sources=(), bank_path=str(tmp_path / 'part-I.txt'), build_dir=str(tmp_path))
+    expected = [translation for translation, _ in translate_items(items, config.memory_path)]
+    assert Pipeline(config).translate(items) == expected
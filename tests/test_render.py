@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+
+from banktools.parser import parse_bank
+from banktools.render import render_inline
+from conftest import RESOURCES
+
+
+@pytest.mark.parametrize('name', ['part3-2021-75.txt', 'part3-2024-75.txt', 'part-en-60.txt'])
+def test_render_inline_round_trips(name):
+    path = os.path.join(RESOURCES, name)
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    for question in parse_bank(path):
+        # 末尾的空行在段落最后一题后可能直接接下一段的标题
+        rendered = list(render_inline(question))[:-1]
+        assert lines[question.line - 1:question.line - 1 + len(rendered)] == rendered
+
+
+def test_delimiter_is_kept():
+    delimiters = {q.delimiter for q in parse_bank(os.path.join(RESOURCES, 'part3-2021-75.txt'))}
+    assert delimiters == {'.'}
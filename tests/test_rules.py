@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+
+from banktools.parser import parse_bank
+from banktools.rules import RuleEngine
+from conftest import RESOURCES
+
+DEFAULT = '日常交际用语：情景对话'
+
+
+def legacy_get_analysis(d1, d2, answer_text):
+    """规则数据化之前 regenerate_part1_complete.py 中的 if/elif 链（原样保留，作为对照）"""
+    d1_lower = d1.lower()
+    d2_lower = d2.lower()
+    answer_lower = answer_text.lower()
+
+    if 'would you like' in d1_lower or 'will you' in d1_lower:
+        if 'but' in d2_lower:
+            return {
+                'key_point': '日常交际用语：接受邀请但表示遗憾',
+                'analysis': f'看到"but I will have..."（但有个重要会议），表示无法参加但愿意去，用"{answer_text}"表示接受邀请，然后用but转折说明原因。'
+            }
+        elif 'thank' in answer_lower:
+            return {
+                'key_point': '日常交际用语：礼貌拒绝邀请',
+                'analysis': f'看到"Would you like..."（你想...）的邀请，礼貌拒绝用"{answer_text}"。'
+            }
+    elif 'do you think' in d1_lower:
+        return {
+            'key_point': '日常交际用语：表达观点和否定',
+            'analysis': f'看到"Do you think..."（你认为...）的否定回答，固定用"{answer_text}"（我不这么认为）。'
+        }
+    elif 'may i help' in d1_lower or 'can i help' in d1_lower or 'help you' in d1_lower:
+        return {
+            'key_point': '日常交际用语：商店服务用语',
+            'analysis': f'看到"how much is this..."（...多少钱），说明是购物场景，店员问"{answer_text}"（需要帮忙吗）。'
+        }
+    elif 'would you mind' in d1_lower:
+        return {
+            'key_point': '日常交际用语：同意请求并递送物品',
+            'analysis': f'看到"Would you mind if..."（你介意...）和"Of course not"（当然不），表示同意，递送物品用"{answer_text}"（给你）。'
+        }
+    elif 'thank' in d1_lower or 'thanks' in d1_lower:
+        return {
+            'key_point': '日常交际用语：回应感谢',
+            'analysis': f'看到感谢的话，回应用"{answer_text}"表示"不客气"。'
+        }
+    elif 'sorry' in d1_lower or 'apologize' in d1_lower or 'forgive' in d1_lower:
+        return {
+            'key_point': '日常交际用语：回应道歉',
+            'analysis': f'看到道歉的话，回应用"{answer_text}"表示"没关系"。'
+        }
+    elif 'speak' in d1_lower or 'language' in d1_lower:
+        return {
+            'key_point': '日常交际用语：询问语言能力',
+            'analysis': f'看到"A little"（一点），说明问的是能力程度，用"{answer_text}"询问语言能力。'
+        }
+    elif 'what' in d1_lower and 'like' in d1_lower:
+        return {
+            'key_point': '日常交际用语：询问评价和看法',
+            'analysis': f'看到"How do you like..."（你觉得...）询问评价，回答应该描述内容，选"{answer_text}"。'
+        }
+    else:
+        return {
+            'key_point': DEFAULT,
+            'analysis': f'根据对话语境，"{d1[:30]}..."和"{d2[:30]}..."的对应关系，选择"{answer_text}"最符合日常交际习惯。'
+        }
+
+
+# 旧链的分支（以考点区分）→ 规则名
+RULE_OF_KEY_POINT = {
+    '日常交际用语：接受邀请但表示遗憾': 'invitation_regret',
+    '日常交际用语：礼貌拒绝邀请': 'invitation_decline',
+    '日常交际用语：表达观点和否定': 'opinion',
+    '日常交际用语：商店服务用语': 'shop_service',
+    '日常交际用语：同意请求并递送物品': 'mind_request',
+    '日常交际用语：回应感谢': 'thanks_reply',
+    '日常交际用语：回应道歉': 'apology_reply',
+    '日常交际用语：询问语言能力': 'language_ability',
+    '日常交际用语：询问评价和看法': 'opinion_of_thing',
+    DEFAULT: 'default',
+}
+
+
+def expected(d1, d2, answer_text):
+    """旧链的结果；邀请句既不转折也不道谢时旧链返回 None（脚本随即出错），规则引擎改用通用模板"""
+    old = legacy_get_analysis(d1, d2, answer_text)
+    if old is None:
+        return 'invitation_other', {
+            'key_point': DEFAULT,
+            'analysis': f'根据对话语境，"{d1[:30]}..."和"{d2[:30]}..."的对应关系，选择"{answer_text}"最符合日常交际习惯。'
+        }
+    return RULE_OF_KEY_POINT[old['key_point']], old
+
+
+def part1_items():
+    return [(q.dialogue[0], q.dialogue[-1], q.answer_text)
+            for q in parse_bank(os.path.join(RESOURCES, 'part-I.txt'))]
+
+
+SYNTHETIC = [
+    ('Would you like to come to my party?', "I'd love to, but I'm busy.", "I'd love to"),
+    ('Will you have some more tea?', '__________', 'No, thanks.'),
+    ('Would you like to speak to the manager?', '__________', 'Yes, please.'),  # 旧链落空的情形
+    ('Will you tell me what you like?', '__________', 'Sure.'),                 # 同上，不能落到 opinion_of_thing
+    ('Do you think it will rain?', '__________', "I don't think so."),
+    ('May I help you?', '__________', 'How much is this?'),
+    ('Would you mind if I opened the window?', 'Of course not.', 'Here you are.'),
+    ('Thanks a lot.', '__________', "You're welcome."),
+    ("I'm sorry I'm late.", '__________', "That's all right."),
+    ('Can you speak French?', '__________', 'A little.'),
+    ("What's the film like?", '__________', 'It is exciting.'),
+    ('Hello, this is Tom.', '__________', 'Hi.'),
+]
+
+
+@pytest.mark.parametrize('items', [part1_items(), SYNTHETIC], ids=['part-I', 'synthetic'])
+def test_rules_match_legacy_chain(items):
+    engine = RuleEngine.from_file()
+    for (d1, d2, answer_text), got in zip(items, engine.classify_many(items)):
+        rule, old = expected(d1, d2, answer_text)
+        assert (got.rule, got.key_point, got.analysis) == (rule, old['key_point'], old['analysis']), d1
+
+
+def test_fall_through_case_uses_generic_template():
+    d1, d2, answer_text = SYNTHETIC[2]
+    assert legacy_get_analysis(d1, d2, answer_text) is None
+    got = RuleEngine.from_file().classify(d1, d2, answer_text)
+    assert got.rule == 'invitation_other' and got.key_point == DEFAULT
+    assert got.analysis.startswith(f'根据对话语境，"{d1[:30]}..."')
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import math
+
+import pytest
+
+from banktools.search import FIELDS, SearchIndex, tokenize
+
+BLOCK = '''第{number}题
+
+原题：--- {stem}
+    --- __________
+选项：
+A) {option}
+B) Yes.
+C) No.
+D) OK.
+你的答案：A
+核对结果：正确
+译文：--- {translation}
+
+【考点·高效记忆】
+{key_point}
+【解析·秒选思路】
+{analysis}
+'''
+
+QUESTIONS = [
+    # 原题里 coffee 出现两次
+    dict(stem='Coffee or coffee?', option='Tea.', translation='咖啡', key_point='选择', analysis='看选项'),
+    # 原题里 coffee 出现一次，长度与上一题相同
+    dict(stem='Coffee or water?', option='Tea.', translation='咖啡', key_point='选择', analysis='看选项'),
+    # coffee 只在解析里出现一次
+    dict(stem='Water or juice?', option='Tea.', translation='水', key_point='选择', analysis='coffee 不对'),
+    # 不含 coffee
+    dict(stem='Thank you.', option='Not at all.', translation='谢谢', key_point='回应感谢', analysis='不客气'),
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = tmp_path / 'bank.txt'
+    path.write_text('\n'.join(BLOCK.format(number=i, **q) for i, q in enumerate(QUESTIONS, 1)), encoding='utf-8')
+    with SearchIndex(str(tmp_path / 'search.sqlite')) as index:
+        index.update([str(path)])
+        yield index
+
+
+def test_tokenize():
+    assert list(tokenize("Don't PANIC 42")) == ["don't", 'panic', '42']
+    # 中文按相邻两字切分，单独的汉字保留
+    assert list(tokenize('回应感谢，水')) == ['回应', '应感', '感谢', '水']
+
+
+def test_bm25_ranking(index):
+    assert len(index) == 4
+    hits = index.search('coffee')
+    # 词频高的排前面，原题（权重 2.0）命中排在解析（权重 1.0）命中之前
+    assert [h.number for h in hits] == [1, 2, 3]
+    assert hits[0].score > hits[1].score > hits[2].score > 0
+    assert [h.fields for h in hits] == [('原题',), ('原题',), ('解析',)]
+    assert hits[2].snippet == 'coffee 不对'
+    assert all(h.bank == 'bank' for h in hits)
+
+
+def test_bm25_score_matches_formula(index):
+    hits = index.search('coffee', fields=['解析'])
+    assert [h.number for h in hits] == [3]
+    # 只有第3题的解析含 coffee：df=1，tf=1
+    lengths = [len(list(tokenize(q['analysis']))) for q in QUESTIONS]
+    idf = math.log(1 + (4 - 1 + 0.5) / (1 + 0.5))
+    norm = 1 - 0.75 + 0.75 * lengths[2] / (sum(lengths) / len(lengths))
+    assert hits[0].score == pytest.approx(FIELDS['解析'] * idf * 2.2 / (1 + 1.2 * norm))
+
+
+def test_all_terms_must_match(index):
+    # 各词可以命中不同字段
+    assert [h.number for h in index.search('coffee water')] == [2, 3]
+    assert [h.number for h in index.search('juice coffee')] == [3]
+    assert [h.number for h in index.search('感谢')] == [4]
+    assert index.search('coffee 感谢') == []
+    assert index.search('，。') == []
+    assert [h.number for h in index.search('coffee', limit=1)] == [1]
+
+
+def test_unchanged_bank_is_skipped(index, tmp_path):
+    index.update([str(tmp_path / 'bank.txt')])
+    assert index.stats['banks_skipped'] == 1 and index.stats['added'] == 4
+    row = index.conn.execute("SELECT text FROM fields WHERE field = '选项' LIMIT 1").fetchone()
+    assert row[0].startswith('A) Tea.\nB) Yes.')
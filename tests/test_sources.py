@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+from banktools.sources import extract_part1, iter_sections, source_question
+
+PAPER = '''# 2020年7月试卷
+
+**Part I Communicative English (10 points)**
+
+1. --- Would you like some tea?
+   --- ________.
+   A. Yes, please.  B. No, I don't.
+   C. Here you are.  D. Help yourself.
+   **答案：A**
+
+2. --- How are you?
+   --- ________.
+   A) Fine, thanks. B) I'm a student. C) Nice to meet you. D) Goodbye.
+
+3.---Thank you very much.
+---________.
+A. You're welcome B. Yes C. No D. OK
+答案: A
+
+**Part II Vocabulary and Structure (40 points)**
+
+11. --- This is not a Part I question.
+   --- ________.
+   A. a B. b C. c D. d
+   **答案：B**
+
+# 2021年1月试卷
+
+**Part I Communicative English (10 points)**
+
+1. --- I'm sorry I'm late.
+   --- ________.
+   A. That's all right. B. Yes. C. No. D. OK.
+   **答案：A**
+'''
+
+
+def write_paper(tmp_path, text=PAPER):
+    path = tmp_path / 'paper.md'
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_sections(tmp_path):
+    sections = list(iter_sections(write_paper(tmp_path)))
+    assert [(s.part, s.line) for s in sections] == [('I', 3), ('II', 20), ('I', 29)]
+    assert sections[0].title == 'Part I Communicative English (10 points)'
+    # 各节首尾相接，最后一节到文件末尾
+    assert [s.end for s in sections[:-1]] == [s.start for s in sections[1:]]
+    assert sections[-1].end == len(PAPER.encode('utf-8'))
+
+
+def test_extract_part1(tmp_path):
+    path = write_paper(tmp_path)
+    issues = []
+    items = extract_part1(path, issues)
+    # 只取 Part I；缺答案的第2题跳过并记入 issues，不吞掉后面的题
+    assert [item['num'] for item in items] == ['1', '3', '1']
+    assert items[0] == {
+        'num': '1',
+        'dialogue1': 'Would you like some tea?',
+        'dialogue2': '________.',
+        'A': 'Yes, please.',
+        'B': "No, I don't.",
+        'C': 'Here you are.',
+        'D': 'Help yourself.',  # 去掉 **答案 前的 **
+        'answer': 'A',
+    }
+    assert (items[1]['dialogue1'], items[1]['D'], items[1]['answer']) == ('Thank you very much.', 'OK', 'A')
+    assert items[2]['dialogue1'] == "I'm sorry I'm late."
+    assert [(i.source, i.line, i.number, i.code) for i in issues] == [(path, 11, 2, 'incomplete_question')]
+
+
+def test_extract_without_part1(tmp_path):
+    assert extract_part1(write_paper(tmp_path, PAPER[PAPER.index('**Part II'):PAPER.index('# 2021')])) == []
+    assert extract_part1(write_paper(tmp_path, '')) == []
+
+
+def test_source_question(tmp_path):
+    item = extract_part1(write_paper(tmp_path))[0]
+    question = source_question(item)
+    assert question.number == 1 and question.answer == 'A'
+    assert question.stem == ('--- Would you like some tea?', '--- ________.')
+    assert question.options[3] == ('D', 'Help yourself.')
+    assert source_question(item, 7).number == 7
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+
+from banktools.parser import bank_paths
+from banktools.store import QuestionStore, compile_banks, compile_resources
+from conftest import RESOURCES
+
+
+def test_payload_ids_are_unique_per_bank(tmp_path):
+    out = str(tmp_path / 'banks.sqlite')
+    counts = compile_resources(RESOURCES, out)
+    with QuestionStore(out) as store:
+        for bank, count in store.banks():
+            ids = [store.get(qid)['id'] for qid in store.ids(bank=bank)]
+            assert ids == list(range(1, count + 1))
+    # part3 题库分段，题号重复
+    assert counts['part3-2024-75'] == 75
+
+
+def test_failed_compile_leaves_no_temp_file(tmp_path):
+    out = str(tmp_path / 'banks.sqlite')
+    paths = bank_paths(RESOURCES) + [str(tmp_path / 'missing.txt')]
+    with pytest.raises(OSError):
+        compile_banks(paths, out)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from banktools.lexicon import WORD
+from banktools.parser import parse_bank
+from banktools.tokens import FIELDS, Lemmatizer, TokenTable, compile_tokens, question_texts
+
+BANK = '''第1题
+
+原题：--- 😀 Would you like some well-known teas?
+    --- __________
+选项：
+A) Yes, I'd love to.
+B) 𝒜 No, thanks.
+C) Here you are.
+D) Help yourself.
+你的答案：B
+核对结果：正确
+译文：--- 你想来点有名的茶🍵吗？
+    --- 不了，thanks。
+
+【考点·高效记忆】
+婉拒
+【解析·秒选思路】
+No, thanks.
+
+核心词（音标+拆解记忆）
+
+• tea /tiː/：茶
+
+第2题
+
+原题：--- Thank you.
+    --- __________
+选项：
+A) You're welcome.
+B) Yes.
+C) No.
+D) OK.
+你的答案：A
+核对结果：正确
+译文：--- 谢谢。
+'''
+
+
+@pytest.fixture
+def compiled(tmp_path):
+    bank = tmp_path / 'bank.txt'
+    bank.write_text(BANK, encoding='utf-8')
+    path = str(tmp_path / 'tokens.bin')
+    count = compile_tokens([str(bank)], path, Lemmatizer(basic_words={'tea', 'thank'}), 'f' * 40)
+    with TokenTable(path) as table:
+        yield list(parse_bank(str(bank))), table, count
+
+
+def utf16_slice(text, start, end):
+    return text.encode('utf-16-le')[2 * start:2 * end].decode('utf-16-le')
+
+
+def test_spans_match_text(compiled):
+    questions, table, count = compiled
+    assert len(table) == 2 and table.span_count == count and table.fingerprint == 'f' * 40
+    assert list(table.bank_range('bank')) == [0, 1] and table.question('bank', 2) == 1
+    for i, question in enumerate(questions):
+        for code, text in question_texts(question):
+            spans = table.spans(i, FIELDS[code])
+            # 按 UTF-16 偏移切回原文，正好是切出的各个单词
+            assert [utf16_slice(text, s.start, s.end) for s in spans] == WORD.findall(text)
+            assert all(s.field == FIELDS[code] for s in spans)
+
+
+def test_utf16_offsets_after_astral_characters(compiled):
+    _, table, _ = compiled
+    stem = table.spans(0, '原题')
+    # 😀 占两个 UTF-16 单元
+    assert (stem[0].start, stem[0].end, stem[0].lemma) == (7, 12, 'would')
+    assert [s.lemma for s in stem if s.core] == ['tea']
+    assert 'well-known' in [s.lemma for s in stem]
+    option = table.spans(0, '选项B')
+    assert (option[0].start, option[0].end) == (3, 5)  # 𝒜 不是单词，但占两个单元
+    translation = table.spans(0, '译文')
+    assert [s.lemma for s in translation] == ['thank']
+
+
+def test_token_at_matches_every_span(compiled):
+    questions, table, _ = compiled
+    for i, question in enumerate(questions):
+        for code, text in question_texts(question):
+            field = FIELDS[code]
+            spans = table.spans(i, field)
+            covered = set()
+            for span in spans:
+                for offset in range(span.start, span.end):
+                    assert table.token_at(i, field, offset) == span
+                    covered.add(offset)
+            length = len(text.encode('utf-16-le')) // 2
+            assert all(table.token_at(i, field, offset) is None
+                       for offset in range(length + 1) if offset not in covered)
+
+
+def test_highlights_and_occurrences(compiled):
+    _, table, _ = compiled
+    assert table.lemma_id('nope') is None and table.highlights(0, 'nope') == []
+    assert [s.field for s in table.highlights(0, 'thank')] == ['选项B', '译文']
+    assert [(q, s.field) for q, s in table.occurrences('thank')] == [(0, '选项B'), (0, '译文'), (1, '原题')]
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from banktools.records import Question
+from banktools.untranslated import FieldTable, classify, scan
+
+STEM = ('--- Would you like some more tea with us?', '--- __________')
+
+
+def question(number, translation, key_point=('婉拒邀请',), analysis=('礼貌拒绝用 No, thanks.',)):
+    return Question(number=number, stem=STEM, options=(('A', 'Yes.'), ('B', 'No, thanks.')), answer='B',
+                    translation=translation, key_point=key_point, analysis=analysis, core_words=(),
+                    line=number * 10)
+
+
+BANK = [
+    question(1, ('--- 你想和我们再喝点茶吗？', '--- 不了，谢谢。')),                        # 正常
+    question(2, ('---', '---')),                                                       # 空
+    question(3, ('--- Do you want more tea?', '--- No.')),                             # 没有中文
+    question(4, ('--- 你 would you like some more tea 吗？', '--- 不了。')),              # 照抄原题
+    # 残留英文
+    question(5, ('--- 我们明天打算去公园 going to the big park 玩，天气预报说明天是个大晴天，一定会很开心。',)),
+    question(6, ('--- 汤姆说 OK，我们就去咖啡馆吧。',), key_point=('Polite refusal',), analysis=()),
+    question(7, ('--- 汤姆 likes tea and coffee',)),                                  # 几乎全是英文
+]
+
+
+@pytest.fixture
+def suspects():
+    return scan(FieldTable([('bank', BANK)]))
+
+
+def by_number(suspects):
+    return {(s.number, s.field): s for s in suspects}
+
+
+def test_classify():
+    assert classify('Tom’s 茶, 12!\x00😀') == b"LLL'L C  99.|."
+
+
+def test_severity(suspects):
+    found = by_number(suspects)
+    assert found[2, '译文'].severity == 1.0 and found[2, '译文'].reason == '译文为空'
+    assert found[3, '译文'].severity == 1.0 and found[3, '译文'].reason == '译文没有中文'
+    copied = found[4, '译文']
+    assert copied.severity == 0.9 and copied.english == 'would you like some more tea'
+    mixed = found[5, '译文']
+    assert mixed.english == 'going to the big park'
+    # 英文占比 17/45 也超标，取两者中较重的：残留 5 个单词
+    assert mixed.latin / (mixed.cjk + mixed.latin) < mixed.severity == pytest.approx(0.4 + 0.04 * 5)
+    assert found[7, '译文'].severity == 0.85 and found[7, '译文'].reason == '译文中英文占 89%'
+    assert found[6, '考点'].severity == 0.7
+
+
+def test_clean_and_quoted_fields_not_reported(suspects):
+    found = by_number(suspects)
+    assert (1, '译文') not in found and (6, '译文') not in found
+    # 考点、解析引用英文不报，空的由 lint 报告
+    assert not any(field in ('考点', '解析') for number, field in found if number != 6)
+    assert (6, '解析') not in found
+
+
+def test_order_and_threshold(suspects):
+    assert [s.severity for s in suspects] == sorted((s.severity for s in suspects), reverse=True)
+    assert [s.line for s in suspects[:2]] == [20, 30]  # 同等严重时按行号
+    assert {(s.number, s.field) for s in scan(FieldTable([('bank', BANK)]), 0.85)} == {
+        (2, '译文'), (3, '译文'), (4, '译文')}  # 0.85 的不报
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+import os
+
+from banktools.parser import parse_bank
+from banktools.verify import BlockIndex, Finding, RecordIndex, run_checks
+from conftest import RESOURCES
+
+
+def test_finding_data_is_not_shared():
+    first, second = Finding('parse_issue', 1, 1, 'a'), Finding('parse_issue', 2, 2, 'b')
+    first.to_dict()['data']['x'] = 1
+    assert first.data is None and second.to_dict()['data'] == {}
+
+
+def test_block_index_matches_records():
+    path = os.path.join(RESOURCES, 'part3-2021-75.txt')
+    index = BlockIndex(path)
+    issues = []
+    records = RecordIndex(list(parse_bank(path, issues)), path, issues)
+    assert index.questions == records.questions
+    assert dict(index.by_number) == dict(records.by_number)
+    assert run_checks(index).to_dict() == run_checks(records).to_dict()
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+
+from banktools.watch import BankWatcher
+from conftest import RESOURCES
+
+
+def test_cache_stays_bounded_on_incremental_edits(tmp_path):
+    path = tmp_path / 'part-I.txt'
+    shutil.copy(os.path.join(RESOURCES, 'part-I.txt'), path)
+    watcher = BankWatcher(str(path))
+    assert watcher.refresh().full
+    original = path.read_text(encoding='utf-8')
+    blocks = len(watcher._blocks)
+    for i in range(200):
+        path.write_text(original.replace('译文：', f'译文：{i}', 1), encoding='utf-8')
+        os.utime(path, ns=(i, i))
+        update = watcher.refresh()
+        assert not update.full and update.changed_blocks == 1
+        assert len(watcher._cache) <= 2 * blocks + 16
+    fresh = BankWatcher(str(path))
+    fresh.refresh()
+    assert list(watcher.questions()) == list(fresh.questions())
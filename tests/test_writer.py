@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import os
+
+import pytest
+
+from banktools.writer import write_bank
+
+LINES = ['第1题', '', '原题：--- 你好', '选项：', 'A) 一', 'B) 二']
+
+
+def leftovers(directory):
+    return [name for name in os.listdir(directory) if name.endswith('.tmp')]
+
+
+def test_unchanged_write_is_skipped(tmp_path):
+    path = tmp_path / 'bank.txt'
+    first = write_bank(str(path), LINES)
+    assert first.changed and path.read_text(encoding='utf-8') == '\n'.join(LINES)
+    os.utime(path, ns=(1, 1))
+    again = write_bank(str(path), iter(LINES))
+    assert not again.changed and again.sha1 == first.sha1 and again.size == first.size
+    assert path.stat().st_mtime_ns == 1
+    assert leftovers(tmp_path) == []
+
+
+@pytest.mark.parametrize('lines', [
+    LINES[:3],                                 # 更短：新内容是原文件的前缀
+    LINES[:3] + ['原题：--- 改了'],             # 更短且有差异
+    LINES + ['C) 三', 'D) 四'],                # 更长
+    LINES[:4] + ['A) 改', 'B) 二'],           # 中间有差异
+    ['x' * 100000] + LINES[:5] + ['B) 改'],    # 相同前缀跨多个复制块
+])
+def test_rewrite_reuses_prefix(tmp_path, lines):
+    path = tmp_path / 'bank.txt'
+    write_bank(str(path), (['x' * 100000] if len(lines[0]) > 100 else []) + LINES)
+    result = write_bank(str(path), lines)
+    data = '\n'.join(lines).encode('utf-8')
+    assert result.changed and path.read_bytes() == data
+    assert result.sha1 == hashlib.sha1(data).hexdigest() and result.size == len(data)
+    assert leftovers(tmp_path) == []
+
+
+def test_failure_mid_stream_keeps_original(tmp_path):
+    path = tmp_path / 'bank.txt'
+    write_bank(str(path), LINES)
+    before = path.read_bytes()
+
+    def broken(diverge):
+        yield from LINES[:2]
+        if diverge:
+            yield '已经不同的一行'
+        raise RuntimeError('生成失败')
+
+    for diverge in (False, True):  # 出错时还没有 / 已经建了临时文件
+        with pytest.raises(RuntimeError):
+            write_bank(str(path), broken(diverge))
+        assert path.read_bytes() == before
+        assert leftovers(tmp_path) == []
+
+
+def test_permissions_are_preserved(tmp_path):
+    path = tmp_path / 'bank.txt'
+    write_bank(str(path), LINES)
+    assert path.stat().st_mode & 0o777 == 0o644
+    os.chmod(path, 0o600)
+    assert write_bank(str(path), LINES + ['新的一行']).changed
+    assert path.stat().st_mode & 0o777 == 0o600
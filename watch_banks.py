@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+监视 resources/ 下的题库，保存后立即给出结构检查与译文检查结果，并增量更新全文检索索引
+
+只有文本改动过的题会重新解析和检查，题库再大，每次保存后的反馈也在几十毫秒内。
+
+    python3 watch_banks.py                 # 一直监视，Ctrl-C 结束
+    python3 watch_banks.py --once          # 检查一遍就退出
+    python3 watch_banks.py --no-search     # 不更新检索索引
+"""
+
+import argparse
+import os
+import time
+
+from banktools.config import BUILD_DIR, RESOURCES_DIR
+from banktools.watch import Watcher
+
+parser = argparse.ArgumentParser(description='监视题库并增量检查')
+parser.add_argument('--resources', default=RESOURCES_DIR, help='题库目录')
+parser.add_argument('--interval', type=float, default=0.2, help='轮询间隔（秒）')
+parser.add_argument('--index', default=os.path.join(BUILD_DIR, 'search.sqlite'), help='全文检索索引')
+parser.add_argument('--no-search', action='store_true', help='不更新全文检索索引')
+parser.add_argument('--once', action='store_true', help='检查一遍就退出')
+parser.add_argument('--limit', type=int, default=20, help='每个文件最多列出的问题数')
+args = parser.parse_args()
+
+
+def report(updates):
+    stamp = time.strftime('%H:%M:%S')
+    for update in updates:
+        print(f'[{stamp}] {os.path.basename(update.path)}: {update.changed_blocks}/{update.blocks} 块有变化，'
+              f'重新解析 {len(update.changed)} 题，共 {update.questions} 题，'
+              f'{update.errors} 个错误，{update.warnings} 个警告（{update.seconds * 1000:.1f} ms）')
+        shown = 0
+        for finding in update.findings:
+            if shown >= args.limit:
+                break
+            where = f'第{finding.number}题 ' if finding.number else ''
+            print(f'  {finding.line}: [{finding.severity}] {finding.rule} {where}{finding.message}')
+            shown += 1
+        for finding in update.untranslated[:max(0, args.limit - shown)]:
+            print(f'  {finding.line}: [verify] untranslated 第{finding.number}题 {finding.message}')
+
+
+watcher = Watcher(args.resources, None if args.no_search else args.index)
+if args.once:
+    try:
+        report(watcher.poll())
+    finally:
+        watcher.close()
+else:
+    print(f'正在监视 {args.resources}（每 {args.interval:g} 秒检查一次，Ctrl-C 结束）')
+    watcher.run(args.interval, report)